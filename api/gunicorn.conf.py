@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration for the Monix API.
+
+Usage:
+    gunicorn -c api/gunicorn.conf.py api.server:app
+
+The API keeps live monitoring state (connections, alerts, event stream
+subscribers) in the process that runs the background collector, so it is
+served by ONE process with many threads rather than several processes that
+would each run their own collector and each hold different state.
+
+Request threads only wait on I/O: scans run in the separate bounded scan
+pool (MONIX_SCAN_WORKERS running + MONIX_SCAN_QUEUE waiting) and at most
+MONIX_STREAM_MAX live event streams are open at once, so as long as there
+are more threads than those together, cheap endpoints always find a free
+thread even while the pool and the streams are saturated.
+
+Configuration (environment variables):
+- MONIX_API_BIND: Address to listen on (default 0.0.0.0:3030)
+- MONIX_API_THREADS: Request threads (default 64)
+- MONIX_API_TIMEOUT: Seconds before a silent worker is restarted (default 120)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.monitoring.events import STREAM_MAX
+from core.scanners.pool import SCAN_QUEUE, SCAN_WORKERS
+
+bind = os.environ.get("MONIX_API_BIND", f"0.0.0.0:{os.environ.get('PORT', 3030)}")
+
+# One process: the collector and its state are per process
+workers = 1
+worker_class = "gthread"
+threads = max(int(os.environ.get("MONIX_API_THREADS", 64)), SCAN_WORKERS + SCAN_QUEUE + STREAM_MAX + 8)
+
+# Long scans and SSE streams hold a thread, not the worker's heartbeat
+timeout = int(os.environ.get("MONIX_API_TIMEOUT", 120))
+graceful_timeout = 10
+keepalive = 5
+
+accesslog = "-"
@@ -0,0 +1,137 @@
+"""
+Mixed-traffic load test for the Monix API.
+
+Runs a fixed number of concurrent clients against a running API for a set
+duration. Each request is either a cheap state read (health, dashboard,
+connections, alerts) or, with probability --scan-ratio, a web analysis
+that bypasses the result cache. Latency percentiles are reported per
+class, so the effect of long scans on cheap endpoints is visible.
+
+All clients share one address, so the per-client rate limits would answer
+most requests 429 and the percentiles would measure the limiter. Start the
+API with rate limiting disabled for the test.
+
+Usage:
+    MONIX_RATE_LIMIT=0 gunicorn -c api/gunicorn.conf.py api.server:app
+    python -m api.loadtest --base-url http://127.0.0.1:3030 --duration 30 \\
+        --concurrency 50 --scan-ratio 0.1 --scan-url https://example.com
+
+Testing instructions:
+    Compare p99 of the "cheap" class with --scan-ratio 0 and with
+    --scan-ratio 0.2; it should stay in the same range while scans are
+    rejected with 503 once the scan pool is saturated.
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import requests
+
+CHEAP_PATHS = ["/api/health", "/api/dashboard", "/api/connections?limit=100", "/api/alerts"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def run_load(
+    base_url: str,
+    duration: float,
+    concurrency: int,
+    scan_ratio: float,
+    scan_urls: List[str],
+    timeout: float
+) -> Dict[str, Dict]:
+    """
+    Generate load and collect per-class latencies and status codes.
+
+    Returns:
+        Dictionary mapping class ("cheap", "scan") to its latencies (ms)
+        and status code counts
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            scan = scan_urls and rng.random() < scan_ratio
+            kind = "scan" if scan else "cheap"
+            started = time.perf_counter()
+            try:
+                if scan:
+                    response = session.post(
+                        f"{base_url}/api/analyze-url",
+                        json={"url": rng.choice(scan_urls), "refresh": True},
+                        timeout=timeout
+                    )
+                else:
+                    response = session.get(f"{base_url}{rng.choice(CHEAP_PATHS)}", timeout=timeout)
+                status = str(response.status_code)
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies[kind].append(elapsed)
+                statuses[kind][status] += 1
+        session.close()
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {kind: {"latencies": latencies[kind], "statuses": statuses[kind]} for kind in latencies}
+
+
+def print_report(results: Dict[str, Dict], duration: float) -> None:
+    """Print a per-class latency table."""
+    print(f"{'class':<7}{'requests':>10}{'rps':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}  statuses")
+    for kind in ("cheap", "scan"):
+        if kind not in results:
+            continue
+        values = results[kind]["latencies"]
+        statuses = ", ".join(f"{code}: {count}" for code, count in results[kind]["statuses"].most_common())
+        print(
+            f"{kind:<7}{len(values):>10}{len(values) / duration:>9.1f}"
+            f"{percentile(values, 50):>10.1f}{percentile(values, 90):>10.1f}"
+            f"{percentile(values, 99):>10.1f}{max(values):>10.1f}  {statuses}"
+        )
+    if any(results[kind]["statuses"].get("429") for kind in results):
+        print("Rate limited (429) responses are included; run the API with MONIX_RATE_LIMIT=0")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test for the Monix API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:3030", help="API base URL")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--scan-ratio", type=float, default=0.1, help="Fraction of requests that are scans")
+    parser.add_argument("--scan-url", action="append", default=[], help="Target to scan (repeatable)")
+    parser.add_argument("--timeout", type=float, default=90.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    scan_urls = args.scan_url or ["https://example.com"]
+    print(f"Load test: {args.concurrency} clients for {args.duration:.0f}s against {args.base_url} "
+          f"({args.scan_ratio:.0%} scans)")
+    started = time.monotonic()
+    results = run_load(args.base_url.rstrip("/"), args.duration, args.concurrency,
+                       args.scan_ratio, scan_urls, args.timeout)
+    print_report(results, time.monotonic() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Per-client rate limiting for the Monix API.
+
+Every client (a configured API key sent as X-API-Key, otherwise the client
+address) gets two token buckets:
+- cheap: state reads (dashboard, connections, alerts, job status, ...)
+- expensive: endpoints that reach out to the network (web analysis, IP
+  lookups, scan jobs), which additionally may only run a few at a time
+  per client
+
+A request that finds its bucket empty, or the client already at its
+concurrency quota, is answered 429 with Retry-After. /api/health, /metrics
+and CORS preflights are never limited. Endpoints that do several analyses
+per request charge the extra ones with RateLimits.charge.
+
+Unknown API keys are ignored (the client is then keyed by address), so a
+client cannot get a fresh bucket by sending a new key with every request.
+Behind a reverse proxy, the address is the one the proxy appended to
+X-Forwarded-For (its last entry); earlier entries come from the client.
+
+Buckets live in process memory; the API runs as a single process (see
+api/gunicorn.conf.py), so every request of a client sees the same bucket.
+
+Configuration (environment variables):
+- MONIX_RATE_LIMIT: "0" disables rate limiting (default enabled)
+- MONIX_RATE_CHEAP_PER_MIN / MONIX_RATE_CHEAP_BURST: Cheap budget (default 600/min, burst 120)
+- MONIX_RATE_EXPENSIVE_PER_MIN / MONIX_RATE_EXPENSIVE_BURST: Expensive budget (default 10/min, burst 5)
+- MONIX_RATE_EXPENSIVE_CONCURRENT: Expensive requests in flight per client (default 2)
+- MONIX_RATE_STREAMS: Live event streams open per client (default 4)
+- MONIX_API_KEYS: Comma-separated API keys that identify clients (default none)
+- MONIX_API_TRUST_PROXY: "1" to take the client address from X-Forwarded-For
+
+Technical Rationale:
+    One analysis costs dozens of outbound requests and a share of the
+    ipinfo quota, while a dashboard poll costs microseconds, so a single
+    limit is either useless for one or crippling for the other. A token
+    bucket allows short bursts (a page load firing several requests)
+    while holding each client to its sustained rate, in O(1) per request.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import Flask, Request, Response, g, jsonify, request
+
+RATE_LIMIT_ENABLED = os.environ.get("MONIX_RATE_LIMIT", "1") != "0"
+TRUST_PROXY = os.environ.get("MONIX_API_TRUST_PROXY", "0") == "1"
+
+CHEAP = "cheap"
+EXPENSIVE = "expensive"
+
+BUDGETS = {
+    CHEAP: (
+        float(os.environ.get("MONIX_RATE_CHEAP_PER_MIN", 600)),
+        float(os.environ.get("MONIX_RATE_CHEAP_BURST", 120)),
+    ),
+    EXPENSIVE: (
+        float(os.environ.get("MONIX_RATE_EXPENSIVE_PER_MIN", 10)),
+        float(os.environ.get("MONIX_RATE_EXPENSIVE_BURST", 5)),
+    ),
+}
+EXPENSIVE_CONCURRENT = int(os.environ.get("MONIX_RATE_EXPENSIVE_CONCURRENT", 2))
+STREAMS_PER_CLIENT = int(os.environ.get("MONIX_RATE_STREAMS", 4))
+
+# Buckets kept before the least recently used are forgotten
+MAX_CLIENTS = 10000
+
+
+def _hash_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+# Hashes of the accepted API keys; keys are never held in memory in the clear
+API_KEY_HASHES = frozenset(
+    _hash_key(key.strip()) for key in os.environ.get("MONIX_API_KEYS", "").split(",") if key.strip()
+)
+
+EXEMPT_ENDPOINTS = {"health", "metrics_endpoint", "static"}
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by client, refilled continuously.
+
+    Thread-safe. Memory is bounded by max_clients; the least recently seen
+    client is dropped first (a forgotten client starts with a full bucket).
+    """
+
+    def __init__(self, per_minute: float, burst: float, max_clients: int = MAX_CLIENTS):
+        """
+        Args:
+            per_minute: Sustained requests per minute
+            burst: Bucket size (requests allowed at once after idling)
+            max_clients: Buckets kept in memory
+        """
+        self.rate = per_minute / 60.0
+        self.burst = max(1.0, burst)
+        self.max_clients = max_clients
+        self.limited = 0
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, cost: float = 1.0, now: Optional[float] = None) -> Tuple[bool, float, float]:
+        """
+        Take tokens from a client's bucket.
+
+        Args:
+            key: Client key
+            cost: Tokens the request costs
+            now: Current monotonic time (for tests)
+
+        Returns:
+            Tuple of (allowed, retry_after seconds, tokens remaining)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed = False
+                retry_after = (cost - tokens) / self.rate if self.rate > 0 else float("inf")
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after, tokens
+
+    def take(self, key: str, max_cost: int, now: Optional[float] = None) -> Tuple[int, float]:
+        """
+        Take as many whole tokens as a client has, up to max_cost.
+
+        Returns:
+            Tuple of (tokens taken, tokens remaining)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            taken = max(0, min(max_cost, int(tokens)))
+            tokens -= taken
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return taken, tokens
+
+    def clients(self) -> int:
+        """Clients currently tracked."""
+        with self._lock:
+            return len(self._buckets)
+
+
+class ConcurrencyQuota:
+    """
+    Per-client count of requests in flight.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.limited = 0
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enter(self, key: str) -> bool:
+        """Count a request in; False if the client is already at its limit."""
+        with self._lock:
+            active = self._active.get(key, 0)
+            if active >= self.limit:
+                self.limited += 1
+                return False
+            self._active[key] = active + 1
+            return True
+
+    def leave(self, key: str) -> None:
+        """Count a request out."""
+        with self._lock:
+            active = self._active.get(key, 0) - 1
+            if active > 0:
+                self._active[key] = active
+            else:
+                self._active.pop(key, None)
+
+
+def client_key(req: Request) -> str:
+    """
+    Identify the client of a request: its API key if it is one of
+    MONIX_API_KEYS, else its address.
+    """
+    api_key = req.headers.get("X-API-Key")
+    if api_key:
+        hashed = _hash_key(api_key)
+        if hashed in API_KEY_HASHES:
+            return "key:" + hashed[:16]
+    address = req.remote_addr or "unknown"
+    if TRUST_PROXY:
+        forwarded = req.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            # The trusted proxy appends the address it saw; anything before
+            # it was sent by the client and can be forged
+            address = forwarded.split(",")[-1].strip() or address
+    return "ip:" + address
+
+
+def _too_many(message: str, retry_after: float, limit: float) -> Response:
+    response = jsonify({
+        "status": "error",
+        "error": message
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    response.headers["X-RateLimit-Limit"] = str(int(limit))
+    response.headers["X-RateLimit-Remaining"] = "0"
+    return response
+
+
+class RateLimits:
+    """
+    Cheap and expensive budgets plus the expensive and stream concurrency quotas.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 expensive_concurrent: int = EXPENSIVE_CONCURRENT,
+                 streams_per_client: int = STREAMS_PER_CLIENT):
+        budgets = budgets or BUDGETS
+        self.buckets = {name: TokenBucketLimiter(rate, burst) for name, (rate, burst) in budgets.items()}
+        self.concurrency = ConcurrencyQuota(expensive_concurrent)
+        self.streams = ConcurrencyQuota(streams_per_client)
+
+    def check(self, key: str, cost_class: str) -> Optional[Response]:
+        """
+        Admit a request of a client, or build its 429 response.
+
+        An admitted expensive request holds a concurrency slot until
+        release() is called.
+        """
+        bucket = self.buckets[cost_class]
+        if cost_class == EXPENSIVE and not self.concurrency.enter(key):
+            return _too_many(
+                f"Too many concurrent requests (max {self.concurrency.limit} per client)", 1, bucket.burst
+            )
+        allowed, retry_after, remaining = bucket.acquire(key)
+        if not allowed:
+            if cost_class == EXPENSIVE:
+                self.concurrency.leave(key)
+            return _too_many(f"Rate limit exceeded for {cost_class} requests", retry_after, bucket.burst)
+        g.rate_limit = (bucket.burst, remaining)
+        return None
+
+    def charge(self, key: str, cost_class: str, cost: int) -> int:
+        """
+        Charge an admitted request for extra work (e.g. the further URLs of
+        a batch), as far as the client's bucket allows.
+
+        Args:
+            key: Client key
+            cost_class: CHEAP or EXPENSIVE
+            cost: Tokens wanted
+
+        Returns:
+            Tokens taken (0..cost); the caller does only that much extra work
+        """
+        if cost <= 0:
+            return 0
+        bucket = self.buckets[cost_class]
+        taken, remaining = bucket.take(key, cost)
+        g.rate_limit = (bucket.burst, remaining)
+        return taken
+
+    def release(self, key: str) -> None:
+        """Free an expensive request's concurrency slot."""
+        self.concurrency.leave(key)
+
+    def open_stream(self, key: str) -> Optional[Response]:
+        """
+        Count a long-lived stream of a client in, or build its 429 response.
+
+        An admitted stream holds its slot until close_stream() is called.
+        """
+        if not self.streams.enter(key):
+            return _too_many(
+                f"Too many open streams (max {self.streams.limit} per client)", 1, self.streams.limit
+            )
+        return None
+
+    def close_stream(self, key: str) -> None:
+        """Free a stream's slot."""
+        self.streams.leave(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Limiter statistics."""
+        return {
+            "clients": self.buckets[CHEAP].clients(),
+            "limited_cheap": self.buckets[CHEAP].limited,
+            "limited_expensive": self.buckets[EXPENSIVE].limited,
+            "limited_concurrency": self.concurrency.limited,
+            "limited_streams": self.streams.limited
+        }
+
+
+def install(app: Flask, expensive_endpoints: Iterable[str], limits: Optional[RateLimits] = None) -> Optional[RateLimits]:
+    """
+    Rate-limit every API endpoint of an app.
+
+    Args:
+        app: Flask app
+        expensive_endpoints: Endpoint (view function) names charged to the
+            expensive budget; all others are cheap
+        limits: Limits to use (default: BUDGETS and EXPENSIVE_CONCURRENT)
+
+    Returns:
+        The installed RateLimits, or None if MONIX_RATE_LIMIT=0
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+    limits = limits or RateLimits()
+    expensive = set(expensive_endpoints)
+
+    @app.before_request
+    def _rate_limit() -> Optional[Response]:
+        if request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS or request.endpoint is None:
+            return None
+        key = client_key(request)
+        cost_class = EXPENSIVE if request.endpoint in expensive else CHEAP
+        response = limits.check(key, cost_class)
+        if response is None and cost_class == EXPENSIVE:
+            g.rate_limit_slot = key
+        return response
+
+    @app.after_request
+    def _rate_limit_headers(response: Response) -> Response:
+        limit = g.get("rate_limit")
+        if limit is not None:
+            response.headers["X-RateLimit-Limit"] = str(int(limit[0]))
+            response.headers["X-RateLimit-Remaining"] = str(int(limit[1]))
+        key = g.pop("rate_limit_slot", None)
+        if key is not None:
+            # Held until the body is sent, so a streamed analysis keeps its slot
+            response.call_on_close(lambda: limits.release(key))
+        return response
+
+    @app.teardown_request
+    def _release_slot(exc: Optional[BaseException]) -> None:
+        # Only reached with the slot still held if no response was produced
+        key = g.pop("rate_limit_slot", None)
+        if key is not None:
+            limits.release(key)
+
+    return limits
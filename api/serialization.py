@@ -0,0 +1,199 @@
+"""
+Response serialization for the Monix API.
+
+This module provides:
+- A JSON provider for Flask that uses orjson when it is installed and the
+  stdlib encoder otherwise; both emit NamedTuples (e.g. SuspiciousIP) as
+  objects, sets as arrays and datetimes as ISO 8601 strings
+- Weak ETags with 304 Not Modified for GET responses
+- gzip / brotli compression of responses above a size threshold
+
+Configuration (environment variables):
+- MONIX_API_JSON: "auto" (default), "orjson" or "json"
+- MONIX_API_COMPRESS_MIN_BYTES: Smallest body compressed (default 1024)
+- MONIX_API_COMPRESS_LEVEL: gzip level 1-9 (default 6)
+
+orjson and brotli are optional dependencies.
+
+Technical Rationale:
+    Dashboards poll the API every few seconds and connection lists run
+    to megabytes. orjson encodes several times faster than the stdlib
+    encoder, JSON compresses roughly tenfold, and an ETag lets a poller
+    that already has the current data skip the body entirely.
+"""
+
+import gzip
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Optional
+
+from flask import Flask, Request, Response, request
+from flask.json.provider import JSONProvider
+
+# orjson - optional dependency
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# brotli - optional dependency
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+JSON_BACKEND = os.environ.get("MONIX_API_JSON", "auto").lower()
+COMPRESS_MIN_BYTES = int(os.environ.get("MONIX_API_COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL = int(os.environ.get("MONIX_API_COMPRESS_LEVEL", 6))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Convert a value the JSON encoders do not handle natively.
+
+    Raises:
+        TypeError: If the value has no JSON representation
+    """
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return obj._asdict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _plain(obj: Any) -> Any:
+    """Rewrite NamedTuples as dictionaries (the stdlib encoder would emit arrays)."""
+    if isinstance(obj, dict):
+        return {key: _plain(value) for key, value in obj.items()}
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return {key: _plain(value) for key, value in obj._asdict().items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(value) for value in obj]
+    return obj
+
+
+def _use_orjson() -> bool:
+    if JSON_BACKEND == "orjson" and not ORJSON_AVAILABLE:
+        raise RuntimeError("MONIX_API_JSON=orjson but orjson is not installed. Install with: pip install orjson")
+    return ORJSON_AVAILABLE and JSON_BACKEND in ("auto", "orjson")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize a value to UTF-8 JSON with the configured backend."""
+    if _use_orjson():
+        return orjson.dumps(obj, default=to_jsonable, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_plain(obj), default=to_jsonable, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a value to a JSON string with the configured backend."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+class MonixJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by dumps_bytes (used by jsonify).
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if _use_orjson():
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype="application/json")
+
+
+def _accepted_encoding(req: Request) -> Optional[str]:
+    accepted = req.accept_encodings
+    if BROTLI_AVAILABLE and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response, req: Request) -> Response:
+    """
+    Compress a buffered response body in place when worthwhile.
+
+    Streamed responses, small bodies, non-text types and responses that
+    already carry a Content-Encoding are left alone.
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    encoding = _accepted_encoding(req)
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=4)
+    elif encoding == "gzip":
+        compressed = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def conditional_response(response: Response, req: Request) -> Response:
+    """
+    Add a weak ETag to a buffered GET response and answer 304 if it matches.
+    """
+    if (
+        req.method not in ("GET", "HEAD")
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+    ):
+        return response
+    if "ETag" not in response.headers:
+        response.add_etag(weak=True)
+    return response.make_conditional(req)
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Get a 304 response if the request already has the given (weak) ETag.
+
+    Lets an endpoint skip building its body when the data behind it has
+    not changed since the client's last request.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def install(app: Flask) -> None:
+    """Use the Monix JSON provider, ETags and compression for an app."""
+    app.json = MonixJSONProvider(app)
+
+    @app.after_request
+    def _finish_response(response: Response) -> Response:
+        response = conditional_response(response, request)
+        return compress_response(response, request)
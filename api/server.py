@@ -8,11 +8,12 @@ security logic remains in core modules, this is purely an API layer.
 
 import os
 import sys
-from flask import Flask, request, jsonify
+import time
+import zlib
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from urllib.parse import urlparse
-import socket
-import requests
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,21 +23,40 @@ from core.analyzers.traffic import (
     is_malicious_bot,
     HIGH_RISK_ENDPOINTS,
     MALICIOUS_BOT_SIGNATURES,
-    classify_threat_level,
-    get_traffic_summary,
-    DEFAULT_LOG_PATH
+    classify_threat_level
 )
-from utils.geo import geo_lookup, reverse_dns, get_ip_info
+from utils.geo import geo_lookup, reverse_dns, get_ip_info, ipinfo_lookup
+from utils.resolver import get_resolver
 from core.analyzers.threat import detect_threats
 from core.scanners.security import run_security_checks
-from core.scanners.web import analyze_web_security
-from core.collectors.connection import collect_connections
+from core.scanners.web import analyze_web_security, normalize_url
+from core.scanners.batch import run_batch, dedupe_targets, to_ndjson, DEFAULT_BATCH_WORKERS, MAX_BATCH_URLS
+from core.scanners.cache import get_web_cache
+from core.scanners.tls import get_tls_probe
+from core.scanners.pool import get_scan_pool, ScanPoolFull, PRIORITY_LOW
+from core.scanners.jobs import get_scan_jobs, parse_priority, ScanQueueFull, STATUS_QUEUED, STATUS_RUNNING
 from core.monitoring.state import state
-from core.collectors.system import get_system_stats, get_top_processes
-from core.monitoring.engine import start_monitor
+from core.monitoring.index import DEFAULT_PAGE_SIZE
+from core.monitoring.events import RESYNC, TooManySubscribers
+from core.monitoring.metrics import metrics, cache_collector, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from core.collectors.system import get_system_stats, get_system_history, get_top_processes
+from core.monitoring.engine import start_monitor, registry as detector_registry
+from api.serialization import dumps, install as install_serialization, not_modified
+from api.ratelimit import install as install_rate_limits, client_key, EXPENSIVE
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Next.js frontend
+install_serialization(app)  # orjson, ETag/304 and gzip/brotli
+
+# Endpoints that cause outbound network work get the small per-client budget
+EXPENSIVE_ENDPOINTS = (
+    "analyze_url_endpoint",
+    "analyze_url_stream_endpoint",
+    "analyze_urls_endpoint",
+    "create_scan_endpoint",
+    "analyze_ip_endpoint",
+)
+rate_limits = install_rate_limits(app, EXPENSIVE_ENDPOINTS)  # 429 with Retry-After
 
 # Start background monitoring when API server starts
 # This ensures state is continuously updated
@@ -45,6 +65,89 @@ try:
 except Exception:
     pass  # Monitor may already be running
 
+# Caches and pools keep their own counters; /metrics reads them at scrape time
+metrics.register_collector("caches", cache_collector({
+    "resolver": lambda: get_resolver().stats(),
+    "tls": lambda: get_tls_probe().stats(),
+    "web": lambda: get_web_cache().stats(),
+}))
+
+
+def _api_metrics():
+    pool = get_scan_pool().stats()
+    jobs = get_scan_jobs().stats()
+    families = [
+        ("monix_scan_pool_workers", "gauge", "Scan pool worker threads", [({}, pool["workers"])]),
+        ("monix_scan_pool_running", "gauge", "Scans running", [({}, pool["running"])]),
+        ("monix_scan_pool_queued", "gauge", "Scans waiting for a worker", [({}, pool["queued"])]),
+        ("monix_scan_pool_completed_total", "counter", "Scans finished", [({}, pool["completed"])]),
+        ("monix_scan_pool_rejected_total", "counter", "Scans refused because the pool was full",
+         [({}, pool["rejected"])]),
+        ("monix_scan_jobs", "gauge", "Scan jobs by status",
+         [({"status": name}, count) for name, count in jobs.items() if name != "deduplicated"]),
+        ("monix_scan_jobs_deduplicated_total", "counter", "Scan job submissions merged into a running job",
+         [({}, jobs["deduplicated"])]),
+        ("monix_stream_subscribers", "gauge", "Connected /api/stream clients",
+         [({}, state.events.subscriber_count())]),
+    ]
+    if rate_limits:
+        limited = rate_limits.stats()
+        families.append(("monix_rate_limited_total", "counter", "Requests answered 429, by budget", [
+            ({"budget": "cheap"}, limited["limited_cheap"]),
+            ({"budget": "expensive"}, limited["limited_expensive"]),
+            ({"budget": "concurrency"}, limited["limited_concurrency"]),
+            ({"budget": "streams"}, limited["limited_streams"]),
+        ]))
+    return families
+
+
+metrics.register_collector("api", _api_metrics)
+
+# Resume scan jobs queued before the last restart
+try:
+    get_scan_jobs()
+except Exception:
+    pass  # Jobs are retried on the first POST /api/scans
+
+
+# Connections included in /api/dashboard unless ?limit= says otherwise
+DASHBOARD_CONNECTIONS = 100
+
+# Seconds between SSE keepalive comments on an idle /api/stream
+LIVE_KEEPALIVE = 15
+
+# Seconds a request waits for its scan (queueing included) before giving up
+SCAN_WAIT_TIMEOUT = 60
+
+# Retry-After sent with 503 when the scan pool is full
+BUSY_RETRY_AFTER = 5
+
+# Retry-After suggested to clients polling an unfinished scan job
+JOB_POLL_AFTER = 2
+
+# Allowed range of each client-supplied /api/analyze-urls option
+BATCH_OPTION_LIMITS = {
+    "workers": (int, 1, DEFAULT_BATCH_WORKERS),
+    "per_host": (int, 1, 4),
+    "host_delay": (float, 0.0, 10.0),
+}
+
+
+def _age(updated_at):
+    """Seconds since a state update time, or None if it never happened."""
+    return round(time.time() - updated_at, 3) if updated_at is not None else None
+
+
+def _busy(message: str):
+    """503 response with Retry-After, for a full scan pool or stream limit."""
+    response = jsonify({
+        "status": "error",
+        "error": message
+    })
+    response.status_code = 503
+    response.headers["Retry-After"] = str(BUSY_RETRY_AFTER)
+    return response
+
 
 def analyze_url(url: str) -> dict:
     """
@@ -76,26 +179,21 @@ def analyze_url(url: str) -> dict:
         coordinates = None
         
         if domain:
-            try:
-                ip_address = socket.gethostbyname(domain)
+            ip_address = get_resolver().resolve_address(domain)
+            if ip_address:
                 ip_info = get_ip_info(ip_address)
                 geo_info = ip_info.get("geo", "")
                 hostname = ip_info.get("hostname", "")
                 
                 # Get coordinates from ipinfo.io
                 try:
-                    geo_response = requests.get(
-                        f"https://ipinfo.io/{ip_address}/json",
-                        timeout=2
-                    ).json()
+                    geo_response = ipinfo_lookup(ip_address, timeout=2)
                     loc_str = geo_response.get("loc", "")
                     if loc_str:
                         lat, lon = map(float, loc_str.split(","))
                         coordinates = {"latitude": lat, "longitude": lon}
                 except:
                     pass
-            except (socket.gaierror, socket.herror):
-                pass
         
         # Calculate threat score
         threat_score = 0
@@ -146,8 +244,25 @@ def analyze_url(url: str) -> dict:
 
 @app.route("/api/health", methods=["GET"])
 def health():
-    """Health check endpoint."""
-    return jsonify({"status": "ok", "service": "monix-api"})
+    """Health check endpoint (includes scan pool load and rate limiting counts)."""
+    return jsonify({
+        "status": "ok",
+        "service": "monix-api",
+        "scan_pool": get_scan_pool().stats(),
+        "rate_limits": rate_limits.stats() if rate_limits else None
+    })
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """
+    Prometheus metrics (text exposition format).
+    
+    Engine and detector metrics are maintained as the collector runs;
+    caches, scan pool, scan jobs and rate limiting are read from their
+    own counters, so a scrape does no collection work.
+    """
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
 
 
 @app.route("/api/analyze-url", methods=["POST"])
@@ -155,9 +270,15 @@ def analyze_url_endpoint():
     """
     Perform comprehensive web security analysis.
     
+    Results are served from the per-section result cache when fresh;
+    stale sections are returned immediately and refreshed in the background.
+    Anything else runs in the bounded scan pool; when its backlog is full
+    the request is refused with 503 and Retry-After.
+    
     Request body:
         {
-            "url": "https://example.com"
+            "url": "https://example.com",
+            "refresh": false    (optional, bypass the cache)
         }
     
     Returns:
@@ -172,12 +293,23 @@ def analyze_url_endpoint():
         }), 400
     
     url = data["url"]
+    refresh = bool(data.get("refresh", False))
     
     try:
-        # Perform comprehensive web security analysis
-        result = analyze_web_security(url)
+        cache = get_web_cache()
+        # Cache hits are answered here; only real scans wait for a scan worker
+        result = None if refresh else cache.analyze(url, cached_only=True)
+        if result is None:
+            result = get_scan_pool().run(cache.analyze, url, refresh=refresh, timeout=SCAN_WAIT_TIMEOUT)
         return jsonify(result)
         
+    except ScanPoolFull as e:
+        return _busy(str(e))
+    except FutureTimeoutError:
+        return jsonify({
+            "status": "error",
+            "error": "Analysis did not finish in time"
+        }), 504
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -185,6 +317,224 @@ def analyze_url_endpoint():
         }), 500
 
 
+@app.route("/api/analyze-url/stream", methods=["GET", "POST"])
+def analyze_url_stream_endpoint():
+    """
+    Perform web security analysis, streaming each section as it completes.
+    
+    Parameters (query string for GET / EventSource, JSON body for POST):
+        url: URL to analyze
+        refresh: Bypass the result cache (optional)
+        format: "sse" (default) or "ndjson"
+    
+    Events:
+        queued:    {"waited": seconds} while the analysis waits for a scan worker
+        keepalive: {} while no section has finished for a few seconds
+        section:   {"section": name, "data": {...}, "ms": elapsed}
+        result:    {"data": {...}} the complete analysis with the threat score, last
+        error:     {"error": message} if the analysis failed or timed out
+    
+    Returns:
+        text/event-stream or application/x-ndjson response
+    """
+    params = (request.get_json(silent=True) or {}) if request.method == "POST" else request.args
+    url = params.get("url")
+    
+    if not url:
+        return jsonify({
+            "status": "error",
+            "error": "Missing 'url'"
+        }), 400
+    
+    refresh = str(params.get("refresh", "")).lower() in ("1", "true", "yes")
+    sse = params.get("format", "sse") != "ndjson"
+    pool = get_scan_pool()
+    stats = pool.stats()
+    if stats["queued"] >= pool.max_pending and stats["running"] >= pool.workers:
+        return _busy("Scan pool is full; try again later")
+    
+    def encode(event):
+        if sse:
+            name = event.pop("event")
+            return f"event: {name}\ndata: {dumps(event)}\n\n"
+        return dumps(event) + "\n"
+    
+    def generate():
+        try:
+            for event in get_web_cache().iter_analyze(url, refresh=refresh, start=pool.submit):
+                yield encode(event)
+        except Exception as e:
+            yield encode({"event": "error", "error": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/api/analyze-urls", methods=["POST"])
+def analyze_urls_endpoint():
+    """
+    Analyze many URLs, streaming each result as NDJSON when it completes.
+    
+    Request body:
+        {
+            "urls": ["https://example.com", "example.org"],
+            "skip": ["https://example.com/"],   (optional, URLs already done)
+            "workers": 8,                        (optional, 1-8)
+            "per_host": 1,                       (optional, 1-4)
+            "host_delay": 1.0                    (optional, 0-10 seconds)
+        }
+    
+    To resume an interrupted batch, send the URLs of the results already
+    received in "skip".
+    
+    Each URL costs one token of the client's expensive rate-limit budget.
+    URLs beyond the remaining budget are not analyzed; their number is in
+    the X-Batch-Deferred header, and they can be sent again later with the
+    completed ones in "skip".
+    
+    Returns:
+        application/x-ndjson stream, one analyze_web_security result per
+        line with "target" set to the URL as given
+    """
+    data = request.get_json(silent=True)
+    
+    if not data or not isinstance(data.get("urls"), list):
+        return jsonify({
+            "status": "error",
+            "error": "Missing 'urls' list in request body"
+        }), 400
+    
+    urls = dedupe_targets(str(url) for url in data["urls"] if str(url).strip())
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({
+            "status": "error",
+            "error": f"Too many URLs (max {MAX_BATCH_URLS})"
+        }), 400
+    
+    skip = {normalize_url(str(url)) for url in data.get("skip", [])}
+    options = {}
+    for name, (cast, low, high) in BATCH_OPTION_LIMITS.items():
+        if name not in data:
+            continue
+        try:
+            value = cast(data[name])
+        except (TypeError, ValueError):
+            value = None
+        if value is None or not low <= value <= high:
+            return jsonify({
+                "status": "error",
+                "error": f"'{name}' must be between {low} and {high}"
+            }), 400
+        options[name] = value
+    
+    # Batch analyses yield to interactive ones in the scan pool: they run at
+    # low priority, wait for room instead of failing, and one batch keeps
+    # at most a quarter of the backlog busy
+    pool = get_scan_pool()
+    options["workers"] = min(options.get("workers", DEFAULT_BATCH_WORKERS), max(1, pool.max_pending // 4))
+    options["analyze"] = lambda url: pool.run(analyze_web_security, url, priority=PRIORITY_LOW, block=True)
+    
+    # Every URL costs an expensive token: admission paid for the first, the
+    # rest are charged now and URLs beyond the client's budget are deferred
+    urls = [url for url in urls if normalize_url(url) not in skip]
+    deferred = 0
+    if rate_limits and urls:
+        accepted = 1 + rate_limits.charge(client_key(request), EXPENSIVE, len(urls) - 1)
+        urls, deferred = urls[:accepted], len(urls) - accepted
+    
+    def generate():
+        for result in run_batch(urls, **options):
+            yield to_ndjson(result)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"X-Batch-Deferred": str(deferred)}
+    )
+
+
+@app.route("/api/scans", methods=["POST"])
+def create_scan_endpoint():
+    """
+    Queue a web security analysis and return its job at once.
+    
+    The scan runs in the background scan pool; poll GET /api/scans/<id>
+    for its status and result. A URL that is already queued or running
+    returns the existing job.
+    
+    Request body:
+        {
+            "url": "https://example.com",
+            "priority": "normal",   (optional, high / normal / low or 0-9)
+            "refresh": false        (optional, bypass the result cache)
+        }
+    
+    Returns:
+        202 with the job and a Location header pointing at it
+    """
+    data = request.get_json(silent=True)
+    
+    if not data or not str(data.get("url", "")).strip():
+        return jsonify({
+            "status": "error",
+            "error": "Missing 'url' in request body"
+        }), 400
+    
+    try:
+        priority = parse_priority(data.get("priority"))
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "error": str(e)
+        }), 400
+    
+    try:
+        job, created = get_scan_jobs().submit(
+            str(data["url"]), priority=priority, refresh=bool(data.get("refresh", False))
+        )
+    except ScanQueueFull as e:
+        return _busy(str(e))
+    
+    response = jsonify({
+        "status": "ok",
+        "created": created,
+        "job": job
+    })
+    response.status_code = 202
+    response.headers["Location"] = f"/api/scans/{job['id']}"
+    return response
+
+
+@app.route("/api/scans/<job_id>", methods=["GET"])
+def get_scan_endpoint(job_id):
+    """
+    Get the status of a scan job, with its result once finished.
+    
+    Job status is queued, running, done or failed; results are kept for
+    MONIX_SCAN_JOB_TTL seconds after the scan finishes.
+    
+    Returns:
+        JSON response with the job, or 404 if it is unknown or expired
+    """
+    job = get_scan_jobs().get(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "error": "Scan job not found or expired"
+        }), 404
+    
+    response = jsonify({
+        "status": "ok",
+        "job": job
+    })
+    if job["status"] in (STATUS_QUEUED, STATUS_RUNNING):
+        response.headers["Retry-After"] = str(JOB_POLL_AFTER)
+    return response
+
+
 @app.route("/api/analyze-ip", methods=["POST"])
 def analyze_ip_endpoint():
     """
@@ -237,16 +587,58 @@ def connections_endpoint():
     """
     Get current network connections.
     
+    Served from the background monitor's latest collection, filtered and
+    paginated with the indexes it maintains.
+    
+    Query params:
+        state: Comma-separated TCP states (e.g. ESTABLISHED,TIME_WAIT)
+        port: Comma-separated local ports
+        cidr: Comma-separated remote networks (e.g. 10.0.0.0/8)
+        process: PID or process name substring
+        sort: Field to sort by, "-" prefix for descending (e.g. -remote_port)
+        limit: Page size (default: 500, max: 5000)
+        cursor: next_cursor from the previous page
+        fields: Comma-separated fields to include (e.g. remote_ip,state)
+    
     Returns:
-        JSON response with list of active connections
+        JSON response with one page of connections, the number matching
+        the filters, the cursor of the next page and the aggregates
     """
     try:
-        connections = collect_connections()
-        return jsonify({
+        index, summary, updated_at = state.connections_view()
+        # Same snapshot and same query: the client already has this page
+        etag = f"c{updated_at}-{zlib.crc32(request.query_string):08x}"
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        page = index.query(
+            state=request.args.get("state"),
+            port=request.args.get("port"),
+            cidr=request.args.get("cidr"),
+            process=request.args.get("process"),
+            sort=request.args.get("sort"),
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", DEFAULT_PAGE_SIZE, type=int),
+            fields=request.args.get("fields")
+        )
+        response = jsonify({
             "status": "success",
-            "connections": connections,
-            "count": len(connections)
+            "connections": page["connections"],
+            "count": len(page["connections"]),
+            "total": page["total"],
+            "next_cursor": page["next_cursor"],
+            "connection_stats": summary,
+            "updated_at": updated_at,
+            "age": _age(updated_at)
         })
+        response.set_etag(etag, weak=True)
+        return response
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -281,11 +673,20 @@ def system_stats_endpoint():
     """
     Get current system statistics.
     
+    Served from the background sampler, so the request does not wait for
+    a CPU measurement.
+    
+    Query params:
+        history: Also return up to this many recent samples, oldest first
+    
     Returns:
-        JSON response with system resource usage statistics
+        JSON response with system resource usage statistics and rates
     """
     try:
         stats = get_system_stats()
+        history = request.args.get("history", 0, type=int)
+        if history > 0:
+            stats["history"] = get_system_history(history)
         return jsonify({
             "status": "success",
             **stats
@@ -300,17 +701,25 @@ def system_stats_endpoint():
 @app.route("/api/processes", methods=["GET"])
 def processes_endpoint():
     """
-    Get top processes by CPU usage.
+    Get top processes by CPU usage (or memory, I/O, connections).
     
     Query params:
         limit: Maximum number of processes to return (default: 10)
+        sort: cpu (default), memory, io or connections
     
     Returns:
         JSON response with top processes
     """
     try:
         limit = request.args.get("limit", 10, type=int)
-        processes = get_top_processes(limit=limit)
+        sort = request.args.get("sort", "cpu")
+        try:
+            processes = get_top_processes(limit=limit, sort=sort)
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "error": str(e)
+            }), 400
         return jsonify({
             "status": "success",
             "processes": processes,
@@ -323,60 +732,51 @@ def processes_endpoint():
         }), 500
 
 
+@app.route("/api/detectors", methods=["GET"])
+def detectors_endpoint():
+    """
+    Get registered detectors and their accumulated cost.
+    
+    Returns:
+        JSON response with per-detector runs, items, CPU time and
+        net allocated memory blocks, most expensive first
+    """
+    return jsonify({
+        "status": "success",
+        "detectors": detector_registry.costs()
+    })
+
+
 @app.route("/api/dashboard", methods=["GET"])
 def dashboard_endpoint():
     """
     Get comprehensive dashboard data.
     
+    Connections, alerts and traffic figures come from the aggregates the
+    background monitor maintains, so the cost does not grow with the
+    number of sockets or log lines.
+    
+    Query params:
+        limit: Maximum number of connections included (default: 100)
+    
     Returns:
         JSON response with all dashboard data including:
-        - connections
+        - connections (first ``limit``) and connection_stats
+          (total, by_state, top_remote_ips)
         - alerts
         - system_stats
-        - traffic_summary
+        - traffic_summary (totals and top suspicious IPs)
+        - updated_at / age: when the monitor last refreshed connections
     """
     try:
-        # Get connections
-        connections = collect_connections()
-        
-        # Get alerts
-        _, alerts = state.snapshot()
-        
-        # Get system stats
-        system_stats = get_system_stats()
-        
-        # Get traffic summary
-        try:
-            traffic_summary = get_traffic_summary(DEFAULT_LOG_PATH, window_minutes=10)
-        except Exception:
-            traffic_summary = {
-                "total_requests": 0,
-                "unique_ips": 0,
-                "total_404s": 0,
-                "high_risk_hits": 0,
-                "suspicious_ips": [],
-                "log_exists": False
-            }
+        limit = request.args.get("limit", DASHBOARD_CONNECTIONS, type=int)
+        dashboard = state.dashboard(limit=limit)
         
         return jsonify({
             "status": "success",
-            "connections": connections,
-            "alerts": alerts,
-            "system_stats": system_stats,
-            "traffic_summary": {
-                "total_requests": traffic_summary.get("total_requests", 0),
-                "unique_ips": traffic_summary.get("unique_ips", 0),
-                "total_404s": traffic_summary.get("total_404s", 0),
-                "high_risk_hits": traffic_summary.get("high_risk_hits", 0),
-                "suspicious_ips": [
-                    {
-                        "ip": ip.ip,
-                        "threat_score": ip.threat_score,
-                        "total_hits": ip.total_hits
-                    }
-                    for ip in traffic_summary.get("suspicious_ips", [])[:10]
-                ]
-            }
+            **dashboard,
+            "age": _age(dashboard["updated_at"]),
+            "system_stats": get_system_stats()
         })
     except Exception as e:
         return jsonify({
@@ -385,6 +785,88 @@ def dashboard_endpoint():
         }), 500
 
 
+@app.route("/api/stream", methods=["GET"])
+def live_stream_endpoint():
+    """
+    Stream live monitoring changes as Server-Sent Events.
+    
+    The stream starts with a ``snapshot`` event unless the client resumes
+    (Last-Event-ID header, or ``since`` query param) from a version still
+    held in the event backlog, in which case the missed events are replayed.
+    A client that cannot keep up receives a fresh ``snapshot`` instead of
+    the events it missed. An id from another process (before a restart)
+    always gets a snapshot.
+    
+    Every open stream holds a request thread, so at most MONIX_STREAM_MAX
+    streams are open at once (503 with Retry-After beyond that) and at
+    most MONIX_RATE_STREAMS per client (429).
+    
+    Events (the SSE id is "<epoch>-<version>"):
+        snapshot:    {"version", "connections", "connection_stats", "alerts",
+                      "traffic_summary", "updated_at"}
+        connections: {"opened": [...], "changed": [...], "closed": [[local_ip,
+                      local_port, remote_ip, remote_port], ...], "connection_stats"}
+        alert:       {"alert": message}
+        traffic:     {totals..., "suspicious_ips": [...changed], "cleared_ips": [...]}
+    
+    Returns:
+        text/event-stream response
+    """
+    events = state.events
+    since = events.parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("since"))
+    
+    # Each stream holds a request thread for as long as it is open
+    key = client_key(request)
+    if rate_limits:
+        refused = rate_limits.open_stream(key)
+        if refused is not None:
+            return refused
+    try:
+        subscription, needs_snapshot = events.subscribe(since)
+    except TooManySubscribers:
+        if rate_limits:
+            rate_limits.close_stream(key)
+        return _busy("Too many live streams; try again later")
+    
+    def close():
+        subscription.close()
+        if rate_limits:
+            rate_limits.close_stream(key)
+    
+    def snapshot():
+        data = state.live_snapshot()
+        return data["version"], f"id: {events.event_id(data['version'])}\nevent: snapshot\ndata: {dumps(data)}\n\n"
+    
+    def generate():
+        try:
+            # Events up to the snapshot's version are already part of it
+            seen = since or 0
+            if needs_snapshot:
+                seen, message = snapshot()
+                yield message
+            while True:
+                item = subscription.get(timeout=LIVE_KEEPALIVE)
+                if item is None:
+                    yield ": keepalive\n\n"
+                elif item is RESYNC:
+                    seen, message = snapshot()
+                    yield message
+                elif item.version > seen:
+                    seen = item.version
+                    yield f"id: {events.event_id(item.version)}\nevent: {item.kind}\ndata: {dumps(item.data)}\n\n"
+        finally:
+            subscription.close()
+    
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Also reached when the client leaves before the generator starts
+    response.call_on_close(close)
+    return response
+
+
 if __name__ == "__main__":
     # Run on port 3030 by default (5000 often used by AirPlay on macOS)
     port = int(os.environ.get("PORT", 3030))
@@ -6,5 +6,7 @@ from cli.commands import alerts
 from cli.commands import scan
 from cli.commands import traffic
 from cli.commands import web
+from cli.commands import replay
+from cli.commands import portscan
 
-__all__ = ['monitor', 'status', 'watch', 'connections', 'alerts', 'scan', 'traffic', 'web']
+__all__ = ['monitor', 'status', 'watch', 'connections', 'alerts', 'scan', 'traffic', 'web', 'replay', 'portscan']
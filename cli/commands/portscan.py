@@ -0,0 +1,103 @@
+"""
+CLI command module for scanning the TCP ports of a host.
+
+This module provides the 'portscan' command, which probes the given ports
+concurrently with the asynchronous scanner and reports open ports (with
+banners when requested).
+
+Testing instructions:
+    monix portscan 127.0.0.1
+    monix portscan 127.0.0.1 --ports 1-1024 --concurrency 500
+    monix portscan ::1 --ports 22,80,443 --banners
+    monix portscan example.com --ipv6 --json
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.scanners.ports import (
+    scan_ports,
+    parse_ports,
+    DEFAULT_CONCURRENCY,
+    MAX_TIMEOUT,
+    MIN_TIMEOUT,
+)
+from utils.logger import log_info, log_warn, log_error, log_success, Colors as C
+
+
+def run(
+    host: str,
+    ports: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    min_timeout: float = MIN_TIMEOUT,
+    max_timeout: float = MAX_TIMEOUT,
+    banners: bool = False,
+    ipv6: bool = False,
+    output_json: bool = False
+) -> None:
+    """
+    Run the portscan command.
+
+    Args:
+        host: Hostname, IPv4 or IPv6 address to scan
+        ports: Port specification, e.g. "22,80,8000-8100" (default: common ports)
+        concurrency: Maximum number of probes in flight
+        min_timeout: Lower bound of the adaptive connect timeout (seconds)
+        max_timeout: Upper bound of the adaptive connect timeout (seconds)
+        banners: Grab service banners from open ports
+        ipv6: Resolve and scan the host over IPv6
+        output_json: Output results in JSON format
+    """
+    try:
+        port_list = parse_ports(ports) if ports else None
+    except ValueError as e:
+        log_error(f"Invalid --ports: {e}")
+        return
+
+    if not output_json:
+        print()
+        log_info(f"Scanning {host} ({len(port_list) if port_list else 'default'} ports)...")
+
+    result = scan_ports(
+        host,
+        port_list,
+        concurrency=concurrency,
+        min_timeout=min_timeout,
+        max_timeout=max_timeout,
+        banners=banners,
+        family=socket.AF_INET6 if ipv6 else socket.AF_UNSPEC
+    )
+
+    if output_json:
+        print(json.dumps(result, indent=2))
+        return
+
+    if result["error"]:
+        log_error(f"Scan failed: {result['error']}")
+        return
+
+    rtt = f"{result['rtt_ms']} ms" if result["rtt_ms"] is not None else "---"
+    print(f"{C.DIM}{'─' * 70}{C.RESET}")
+    print(f"  {C.DIM}Address:{C.RESET}   {C.WHITE}{result['address']}{C.RESET}")
+    print(f"  {C.DIM}RTT:{C.RESET}       {C.WHITE}{rtt}{C.RESET} {C.DIM}(timeout {result['timeout_ms']} ms){C.RESET}")
+    print(f"  {C.DIM}Open:{C.RESET}      {C.GREEN}{len(result['open_ports'])}{C.RESET}  "
+          f"{C.DIM}Closed:{C.RESET} {len(result['closed_ports'])}  "
+          f"{C.DIM}Filtered:{C.RESET} {C.YELLOW}{len(result['filtered_ports'])}{C.RESET}")
+    print(f"{C.DIM}{'─' * 70}{C.RESET}")
+
+    for port in result["open_ports"]:
+        banner = result["banners"].get(port, "")
+        banner = banner.splitlines()[0][:50] if banner else ""
+        print(f"  {C.GREEN}{port:>5}/tcp{C.RESET}  {C.WHITE}open{C.RESET}  {C.DIM}{banner}{C.RESET}")
+
+    if result["open_ports"]:
+        print(f"{C.DIM}{'─' * 70}{C.RESET}")
+        log_warn(f"{len(result['open_ports'])} open port(s) in {result['elapsed_ms']:.0f} ms")
+    else:
+        log_success(f"No open ports found in {result['elapsed_ms']:.0f} ms")
+    print()
@@ -23,26 +23,103 @@ from threading import Thread
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from utils.logger import Colors as C, log_info, log_error, log_success
-from core.scanners.web import analyze_web_security
+from utils.logger import Colors as C, log_info, log_warn, log_error, log_success
+from core.scanners.web import iter_web_analysis, normalize_url
+from core.scanners.batch import (
+    run_batch,
+    read_targets,
+    completed_targets,
+    DEFAULT_BATCH_WORKERS,
+    DEFAULT_PER_HOST,
+    DEFAULT_HOST_DELAY
+)
+
+SECTION_LABELS = {
+    "ip_address": "Address",
+    "ssl_certificate": "SSL",
+    "dns_records": "DNS",
+    "http_headers": "Headers",
+    "security_headers_analysis": "Hardening",
+    "security_txt": "security.txt",
+    "server_location": "Geo",
+    "port_scan": "Ports",
+    "technologies": "Tech",
+    "cookies": "Cookies",
+    "redirects": "Redirects",
+    "metadata": "Metadata",
+}
+
+
+def _section_detail(name: str, data: dict) -> str:
+    """One-line summary of a finished analysis section."""
+    if name == "ip_address":
+        return data.get("ip") or "---"
+    if name == "ssl_certificate":
+        session = f"{data.get('protocol')}, " if data.get("protocol") else ""
+        return f"{session}valid until {data.get('expires', '---')}" if data.get("valid") else "invalid"
+    if name == "dns_records":
+        return f"{len(data.get('a', []))} A, {len(data.get('mx', []))} MX, {len(data.get('ns', []))} NS"
+    if name == "http_headers":
+        present = sum(1 for value in data.get("security_headers", {}).values() if value)
+        return f"{present}/{len(data.get('security_headers', {}))} security headers"
+    if name == "security_headers_analysis":
+        return f"{data.get('percentage', 0)}% secured"
+    if name == "security_txt":
+        return "present" if data.get("present") else "not found"
+    if name == "server_location":
+        return ", ".join(part for part in (data.get("city"), data.get("country"), data.get("org")) if part) or "---"
+    if name == "port_scan":
+        return f"open: {', '.join(str(p) for p in data.get('open_ports', [])) or 'none'}"
+    if name == "technologies":
+        return ", ".join(t for t in [data.get("server"), data.get("cms"), data.get("cdn")] + data.get("languages", []) if t) or "---"
+    if name == "cookies":
+        return f"{len(data.get('cookies', []))} cookie(s)"
+    if name == "redirects":
+        return f"{len(data.get('chain', []))} hop(s) -> {data.get('final_url', '---')}"
+    if name == "metadata":
+        return (data.get("title") or "---").strip()[:50]
+    return ""
+
 
 def run_analysis(url: str):
     """
     Perform and display web security analysis in the terminal (compact version).
+    
+    Sections are printed as they complete; the summary with the threat
+    score follows once every check has finished or timed out.
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     print()
     log_info(f"Analyzing target: {url}")
     
+    result = None
     try:
-        # Simple progress indicator
-        print(f"  {C.DIM}Executing scan...{C.RESET}", end="\r")
-        result = analyze_web_security(url)
-        print(" " * 30, end="\r") # Clear the line
+        for event in iter_web_analysis(url):
+            if event["event"] == "result":
+                result = event["data"]
+                break
+            if event["event"] != "section":
+                continue  # keepalive
+            name, data = event["section"], event["data"]
+            if data.get("timed_out"):
+                status = f"{C.YELLOW}TIMEOUT{C.RESET}"
+                detail = data.get("error", "")
+            elif data.get("error"):
+                status = f"{C.RED}ERROR  {C.RESET}"
+                detail = data["error"]
+            else:
+                status = f"{C.GREEN}OK     {C.RESET}"
+                detail = _section_detail(name, data)
+            print(f"  {C.DIM}{SECTION_LABELS.get(name, name):<13}{C.RESET}{status} {C.DIM}{event['ms']:>7.0f} ms{C.RESET}  {str(detail)[:60]}")
+        print()
     except Exception as e:
         log_error(f"CRITICAL_FAILURE: {str(e)}")
         return
+    
+    if result is None:
+        log_error("ANALYSIS_FAILED: no result")
+        return
 
     if result.get("status") == "error":
         log_error(f"ANALYSIS_FAILED: {result.get('error')}")
@@ -61,8 +138,10 @@ def run_analysis(url: str):
     else:
         threat_display = f"{C.WHITE}{threat_level}{C.RESET}"
 
-    ssl_valid = result.get("ssl_certificate", {}).get("valid")
-    ssl_status = f"{C.GREEN}VALID{C.RESET}" if ssl_valid else f"{C.RED}INVALID/NONE{C.RESET}"
+    ssl_info = result.get("ssl_certificate", {})
+    ssl_status = f"{C.GREEN}VALID{C.RESET}" if ssl_info.get("valid") else f"{C.RED}INVALID/NONE{C.RESET}"
+    if ssl_info.get("protocol"):
+        ssl_status += f" {C.DIM}({ssl_info['protocol']}, {ssl_info.get('days_remaining')} days left){C.RESET}"
 
     print(f"{C.DIM}[{timestamp}]{C.RESET} {C.BOLD}Web Analysis Result{C.RESET}")
     print(f"{C.DIM}{'─' * 60}{C.RESET}")
@@ -100,6 +179,10 @@ def run_analysis(url: str):
     a_records = dns.get('a', [])
     print(f"  {C.BOLD}DNS Records:{C.RESET}  {C.DIM}{', '.join(a_records[:3]) if a_records else '---'}{C.RESET}")
 
+    # Checks cut off by their timeout or the analysis deadline
+    if result.get("incomplete"):
+        print(f"  {C.BOLD}Incomplete:{C.RESET}   {C.YELLOW}{', '.join(result['incomplete'])}{C.RESET} {C.DIM}({result.get('elapsed_ms', 0):.0f} ms){C.RESET}")
+
     # Threats
     if result.get("threats"):
         print()
@@ -110,6 +193,60 @@ def run_analysis(url: str):
     print(f"{C.DIM}{'─' * 60}{C.RESET}")
     print()
 
+def run_batch_analysis(
+    path: str,
+    output: str = None,
+    workers: int = DEFAULT_BATCH_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    host_delay: float = DEFAULT_HOST_DELAY
+):
+    """
+    Analyze every URL listed in a file and write results as NDJSON.
+    
+    With an output file, results are appended as they complete and URLs
+    already analyzed successfully in that file are skipped, so an
+    interrupted run continues where it stopped. Without one, NDJSON is
+    written to stdout.
+    """
+    if not os.path.exists(path):
+        log_error(f"URL list not found: {path}")
+        return
+    
+    targets = read_targets(path)
+    if not output:
+        for _ in run_batch(targets, sys.stdout, workers=workers, per_host=per_host, host_delay=host_delay):
+            pass
+        return
+    
+    done = completed_targets(output)
+    remaining = len(targets) - sum(1 for t in targets if normalize_url(t) in done)
+    print()
+    log_info(f"Batch: {len(targets)} URLs, {len(targets) - remaining} already done, {remaining} to analyze")
+    
+    failed = 0
+    count = 0
+    try:
+        with open(output, "a", encoding="utf-8") as out:
+            for result in run_batch(targets, out, skip=done, workers=workers, per_host=per_host, host_delay=host_delay):
+                count += 1
+                if result.get("status") == "success":
+                    score = result.get("threat_score", 0)
+                    color = C.RED if score >= 50 else C.YELLOW if score >= 30 else C.GREEN
+                    print(f"  {C.DIM}[{count}/{remaining}]{C.RESET} {result['target']:<50} {color}{result.get('threat_level', '---')}{C.RESET} {C.DIM}({score}){C.RESET}")
+                else:
+                    failed += 1
+                    print(f"  {C.DIM}[{count}/{remaining}]{C.RESET} {result['target']:<50} {C.RED}ERROR{C.RESET} {C.DIM}{result.get('error', '')}{C.RESET}")
+    except KeyboardInterrupt:
+        print()
+        log_warn(f"Interrupted after {count} URL(s); rerun the same command to resume")
+        return
+    
+    if failed:
+        log_warn(f"Batch complete: {count - failed} succeeded, {failed} failed (rerun to retry failures) -> {output}")
+    else:
+        log_success(f"Batch complete: {count} URL(s) analyzed -> {output}")
+    print()
+
 def get_local_ip() -> str:
     """Get the local IP address of the machine."""
     try:
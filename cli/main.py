@@ -2,7 +2,7 @@
 
 import click
 from cli import __version__
-from cli.commands import monitor, status, watch, connections, alerts, scan, traffic, web
+from cli.commands import monitor, status, watch, connections, alerts, scan, traffic, web, replay, portscan
 
 @click.group(invoke_without_command=True)
 @click.option('--version', '-v', is_flag=True, help='Show version information')
@@ -91,10 +91,60 @@ def traffic_cmd(log, window, limit, output_json):
     traffic.run(log_path=log, window=window, limit=limit, output_json=output_json)
 
 @cli.command('web')
-@click.argument('url', required=True)
-def web_cmd(url):
+@click.argument('url', required=False)
+@click.option('--batch', 'batch_file', type=click.Path(), help='Analyze every URL in this file (one per line)')
+@click.option('--output', '-o', type=click.Path(), help='Append batch results as NDJSON here (resumable)')
+@click.option('--workers', default=web.DEFAULT_BATCH_WORKERS, help='URLs analyzed at once in batch mode')
+@click.option('--per-host', default=web.DEFAULT_PER_HOST, help='Concurrent analyses per host in batch mode')
+@click.option('--host-delay', default=web.DEFAULT_HOST_DELAY, help='Seconds between analyses of one host')
+def web_cmd(url, batch_file, output, workers, per_host, host_delay):
     """Analyze a URL for security threats (CLI only)."""
-    web.run_analysis(url)
+    if batch_file:
+        web.run_batch_analysis(batch_file, output=output, workers=workers, per_host=per_host, host_delay=host_delay)
+    elif url:
+        web.run_analysis(url)
+    else:
+        raise click.UsageError("Provide a URL or --batch FILE")
+
+@cli.command('replay')
+@click.argument('capture_file', required=False)
+@click.option('--scenario', type=click.Choice(sorted(replay.SCENARIOS)), help='Replay a built-in synthetic scenario')
+@click.option('--record', is_flag=True, help='Record live snapshots to CAPTURE_FILE')
+@click.option('--ticks', default=30, help='Number of snapshots to record')
+@click.option('--interval', default=1.0, help='Seconds between recorded snapshots')
+@click.option('--json', 'output_json', is_flag=True, help='Output in JSON format')
+def replay_cmd(capture_file, scenario, record, ticks, interval, output_json):
+    """Record or replay connection captures through the detection engine."""
+    replay.run(
+        path=capture_file,
+        scenario=scenario,
+        record=record,
+        ticks=ticks,
+        interval=interval,
+        output_json=output_json
+    )
+
+@cli.command('portscan')
+@click.argument('host', required=True)
+@click.option('--ports', '-p', help='Ports to scan, e.g. 22,80,8000-8100 (default: common ports)')
+@click.option('--concurrency', '-c', default=portscan.DEFAULT_CONCURRENCY, help='Maximum probes in flight')
+@click.option('--min-timeout', default=portscan.MIN_TIMEOUT, help='Lower bound of the adaptive timeout (s)')
+@click.option('--max-timeout', default=portscan.MAX_TIMEOUT, help='Upper bound of the adaptive timeout (s)')
+@click.option('--banners', is_flag=True, help='Grab service banners from open ports')
+@click.option('--ipv6', '-6', is_flag=True, help='Scan the host over IPv6')
+@click.option('--json', 'output_json', is_flag=True, help='Output in JSON format')
+def portscan_cmd(host, ports, concurrency, min_timeout, max_timeout, banners, ipv6, output_json):
+    """Scan TCP ports of a host concurrently."""
+    portscan.run(
+        host,
+        ports=ports,
+        concurrency=concurrency,
+        min_timeout=min_timeout,
+        max_timeout=max_timeout,
+        banners=banners,
+        ipv6=ipv6,
+        output_json=output_json
+    )
 
 def monix_web_main():
     """Standalone entry point for monix-web <url> - CLI URL analysis only."""
@@ -4,9 +4,49 @@ Analysis and threat detection modules for Monix.
 This package contains modules responsible for analyzing collected data:
 - threat: Connection analysis and threat detection (SYN floods, port scans, etc.)
 - traffic: Web traffic log analysis and suspicious pattern detection
+- portscan: Memory-bounded sliding-window port-scan tracker
+- detection: Unified delta-driven detection engine (counts, arrival rates, port scans)
+- registry: Detector plugin interface, fused single-pass runner and cost accounting
+- prefix: Patricia-trie subnet aggregation and CIDR allow/deny lookup
+- replay: Capture recording and replay harness for the detection engine
 """
 
-from core.analyzers.threat import analyze_connections, detect_threats
+from core.analyzers.threat import analyze_connections, detect_threats, ConnectionThreatDetector
+from core.analyzers.registry import (
+    Detector,
+    DetectorRegistry,
+    DetectorCost,
+    run_detector,
+    INPUT_CONNECTIONS,
+    INPUT_DELTAS,
+    INPUT_LOG_ENTRIES,
+    INPUT_SYSTEM_STATS
+)
+from core.analyzers.portscan import (
+    PortScanTracker,
+    PORT_SCAN_WINDOW,
+    PORT_SCAN_THRESHOLD,
+    MAX_TRACKED_IPS
+)
+from core.analyzers.detection import (
+    Alert,
+    ConnectionDelta,
+    DetectionEngine,
+    SocketTable,
+    connection_key,
+    SYN_FLOOD_THRESHOLD,
+    HIGH_CONN_THRESHOLD,
+    NEW_CONN_RATE_THRESHOLD,
+    SYN_RATE_THRESHOLD,
+    SUBNET_SYN_FLOOD_THRESHOLD,
+    SUBNET_CONN_RATE_THRESHOLD
+)
+from core.analyzers.prefix import (
+    PrefixTree,
+    CidrSet,
+    SubnetAggregator,
+    SubnetCounters
+)
 from core.analyzers.traffic import (
     LogEntry,
     SuspiciousIP,
@@ -16,6 +56,7 @@ from core.analyzers.traffic import (
     is_malicious_bot,
     analyze_traffic,
     get_traffic_summary,
+    TrafficDetector,
     classify_threat_level,
     DEFAULT_LOG_PATH,
     HIGH_RISK_ENDPOINTS,
@@ -25,6 +66,34 @@ from core.analyzers.traffic import (
 __all__ = [
     'analyze_connections',
     'detect_threats',
+    'ConnectionThreatDetector',
+    'Detector',
+    'DetectorRegistry',
+    'DetectorCost',
+    'run_detector',
+    'INPUT_CONNECTIONS',
+    'INPUT_DELTAS',
+    'INPUT_LOG_ENTRIES',
+    'INPUT_SYSTEM_STATS',
+    'PortScanTracker',
+    'PORT_SCAN_WINDOW',
+    'PORT_SCAN_THRESHOLD',
+    'MAX_TRACKED_IPS',
+    'Alert',
+    'ConnectionDelta',
+    'DetectionEngine',
+    'SocketTable',
+    'connection_key',
+    'SYN_FLOOD_THRESHOLD',
+    'HIGH_CONN_THRESHOLD',
+    'NEW_CONN_RATE_THRESHOLD',
+    'SYN_RATE_THRESHOLD',
+    'SUBNET_SYN_FLOOD_THRESHOLD',
+    'SUBNET_CONN_RATE_THRESHOLD',
+    'PrefixTree',
+    'CidrSet',
+    'SubnetAggregator',
+    'SubnetCounters',
     'LogEntry',
     'SuspiciousIP',
     'parse_log_line',
@@ -33,6 +102,7 @@ __all__ = [
     'is_malicious_bot',
     'analyze_traffic',
     'get_traffic_summary',
+    'TrafficDetector',
     'classify_threat_level',
     'DEFAULT_LOG_PATH',
     'HIGH_RISK_ENDPOINTS',
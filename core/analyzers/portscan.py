@@ -0,0 +1,132 @@
+"""
+Memory-bounded port-scan tracker for Monix.
+
+This module provides a time-indexed record of which local ports each remote
+IP has touched recently, used to detect horizontal port scans.
+
+Technical Rationale:
+    The monitoring engine runs every second for the lifetime of the host. A
+    naive per-IP port map never forgets an address, so on an internet-facing
+    server both memory and the per-tick scan check grow with every IP ever
+    seen. Observations arrive in non-decreasing time order, so a FIFO expiry
+    queue with lazy deletion drops stale (ip, port) entries in amortized O(1).
+    The number of tracked IPs is capped with least-recently-seen eviction, and
+    only IPs observed during the current tick are re-checked for scans.
+"""
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+PORT_SCAN_WINDOW = 10
+PORT_SCAN_THRESHOLD = 5
+MAX_TRACKED_IPS = 10000
+
+
+class PortScanTracker:
+    """
+    Sliding-window tracker of distinct local ports touched per remote IP.
+
+    Entries older than ``window`` seconds are expired from a FIFO queue. A
+    re-observed (ip, port) pair pushes a fresh queue entry; the superseded one
+    is skipped when it reaches the head because its timestamp no longer
+    matches the live record.
+    """
+
+    def __init__(
+        self,
+        window: float = PORT_SCAN_WINDOW,
+        threshold: int = PORT_SCAN_THRESHOLD,
+        max_ips: int = MAX_TRACKED_IPS
+    ):
+        self.window = window
+        self.threshold = threshold
+        self.max_ips = max_ips
+        # ip -> {port: last_seen}, ordered from least to most recently seen
+        self._ports: "OrderedDict[str, Dict[int, float]]" = OrderedDict()
+        self._expiry: Deque[Tuple[float, str, int]] = deque()
+        self._dirty: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._ports)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self._ports
+
+    def record(self, ip: str, port: int, now: float) -> None:
+        """
+        Record that ``ip`` touched local ``port`` at time ``now``.
+
+        Args:
+            ip: Remote IP address
+            port: Local port number
+            now: Observation timestamp (must not decrease between calls)
+        """
+        ports = self._ports.get(ip)
+        if ports is None:
+            if len(self._ports) >= self.max_ips:
+                evicted, _ = self._ports.popitem(last=False)
+                self._dirty.discard(evicted)
+            ports = {}
+            self._ports[ip] = ports
+        else:
+            self._ports.move_to_end(ip)
+
+        if ports.get(port) != now:
+            ports[port] = now
+            self._expiry.append((now, ip, port))
+        self._dirty.add(ip)
+
+    def expire(self, now: float) -> None:
+        """
+        Drop every (ip, port) entry last seen more than ``window`` seconds ago.
+
+        Args:
+            now: Current timestamp
+        """
+        cutoff = now - self.window
+        expiry = self._expiry
+        while expiry and expiry[0][0] < cutoff:
+            ts, ip, port = expiry.popleft()
+            ports = self._ports.get(ip)
+            if ports is None or ports.get(port) != ts:
+                continue  # Superseded by a later observation or IP evicted
+            del ports[port]
+            if not ports:
+                del self._ports[ip]
+                self._dirty.discard(ip)
+
+    def recent_ports(self, ip: str) -> List[int]:
+        """
+        Get the ports touched by ``ip`` within the window.
+
+        Args:
+            ip: Remote IP address
+
+        Returns:
+            Sorted list of port numbers (empty if the IP is not tracked)
+        """
+        return sorted(self._ports.get(ip, ()))
+
+    def scanners(self, now: Optional[float] = None) -> List[Tuple[str, List[int]]]:
+        """
+        Return IPs that crossed the scan threshold since the previous call.
+
+        Only IPs observed since the last call are examined, so the cost is
+        proportional to active IPs rather than every IP ever tracked.
+
+        Args:
+            now: If given, expire stale entries before checking
+
+        Returns:
+            List of (ip, sorted ports) tuples for IPs at or above the threshold
+        """
+        if now is not None:
+            self.expire(now)
+
+        found = []
+        for ip in self._dirty:
+            ports = self._ports.get(ip)
+            if ports is not None and len(ports) >= self.threshold:
+                found.append((ip, sorted(ports)))
+        self._dirty.clear()
+        return found
@@ -1,4 +1,7 @@
-from collections import defaultdict, Counter
+from collections import Counter
+
+from core.analyzers.detection import DetectionEngine
+from core.analyzers.registry import Detector, INPUT_DELTAS, run_detector
 
 def analyze_connections(connections):
     stats = {
@@ -47,40 +50,42 @@ def analyze_connections(connections):
     
     return stats
 
+THREAT_ICONS = {
+    "SYN_FLOOD": "🚨",
+    "SYN_RATE": "🚨",
+    "HIGH_CONN": "⚠️",
+    "CONN_RATE": "⚠️",
+    "PORT_SCAN": "🔍",
+    "SUBNET_SYN_FLOOD": "🚨",
+    "SUBNET_CONN_RATE": "⚠️",
+}
+
+class ConnectionThreatDetector(Detector):
+    """Feeds socket deltas to the detection engine and returns its alerts."""
+
+    name = "connection_threats"
+    inputs = frozenset([INPUT_DELTAS])
+
+    def __init__(self, engine=None):
+        self.engine = engine or DetectionEngine()
+
+    def begin(self, now):
+        self.now = now
+        self.alerts = []
+
+    def on_delta(self, delta):
+        self.alerts = self.engine.apply_delta(delta, self.now)
+
+    def finish(self):
+        return self.alerts
+
 def detect_threats(connections):
-    threats = []
-    
-    syn_count = defaultdict(int)
-    conn_count = defaultdict(int)
-    port_activity = defaultdict(set)
-    
-    for conn in connections:
-        state = conn.get("state", "")
-        remote_ip = conn.get("remote_ip", "")
-        local_port = conn.get("local_port", 0)
-        
-        if remote_ip in ["127.0.0.1", "0.0.0.0", "::1", "::"]:
-            continue
-        
-        if state == "SYN_RECV":
-            syn_count[remote_ip] += 1
-        
-        if state == "ESTABLISHED":
-            conn_count[remote_ip] += 1
-        
-        port_activity[remote_ip].add(local_port)
-    
-    for ip, count in syn_count.items():
-        if count >= 50:
-            threats.append(f"🚨 SYN_FLOOD from {ip} (half-open connections: {count})")
-    
-    for ip, count in conn_count.items():
-        if count >= 30:
-            threats.append(f"⚠️ HIGH_CONN from {ip} (total connections: {count})")
-    
-    for ip, ports in port_activity.items():
-        if len(ports) >= 5:
-            ports_list = sorted(list(ports))[:10]
-            threats.append(f"🔍 PORT_SCAN from {ip} (ports: {ports_list})")
+    """
+    Detect threats in a single connection snapshot.
     
-    return threats
+    Uses the same detection engine and thresholds as the background monitor.
+    Arrival rates need successive snapshots, so only count and port-scan
+    rules can fire here.
+    """
+    alerts = run_detector(ConnectionThreatDetector(), connections=connections)
+    return [f"{THREAT_ICONS.get(alert.kind, '')} {alert.message}" for alert in alerts]
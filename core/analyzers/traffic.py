@@ -21,6 +21,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, NamedTuple
 
+from core.analyzers.registry import Detector, INPUT_LOG_ENTRIES, run_detector
+
 
 class LogEntry(NamedTuple):
     """Parsed Nginx access log entry."""
@@ -272,6 +274,134 @@ class SuspiciousIP(NamedTuple):
     threat_score: int
 
 
+class TrafficDetector(Detector):
+    """
+    Single-pass web traffic detector over parsed log entries.
+    
+    Accumulates per-IP hit counts, 404s, high-risk endpoint hits and bot
+    user-agents, plus the window-wide summary statistics, so the log
+    entries are only walked once.
+    """
+    
+    name = "traffic"
+    inputs = frozenset([INPUT_LOG_ENTRIES])
+    
+    def __init__(
+        self,
+        high_rate_threshold: int = 30,
+        window_minutes: int = 10,
+        log_path: Optional[str] = None
+    ):
+        self.high_rate_threshold = high_rate_threshold
+        self.window_minutes = window_minutes
+        self.log_path = log_path
+        self._bot_cache: Dict[str, bool] = {}
+    
+    def begin(self, now: float) -> None:
+        self.ip_data: Dict[str, Dict] = defaultdict(lambda: {
+            "hits": 0,
+            "status_404": 0,
+            "malicious_bot": False,
+            "suspicious_urls": set()
+        })
+        self.total_requests = 0
+        self.total_404s = 0
+        self.high_risk_hits = 0
+        self.malicious_bot_requests = 0
+    
+    def on_log_entry(self, entry: LogEntry) -> None:
+        data = self.ip_data[entry.ip]
+        data["hits"] += 1
+        self.total_requests += 1
+        
+        if entry.status == 404:
+            data["status_404"] += 1
+            self.total_404s += 1
+        
+        if is_suspicious_url(entry.url):
+            data["suspicious_urls"].add(entry.url)
+            self.high_risk_hits += 1
+        
+        # User-agents repeat heavily, so signature matching is cached
+        malicious = self._bot_cache.get(entry.user_agent)
+        if malicious is None:
+            if len(self._bot_cache) >= 10000:
+                self._bot_cache.clear()
+            malicious = self._bot_cache[entry.user_agent] = is_malicious_bot(entry.user_agent)
+        if malicious:
+            data["malicious_bot"] = True
+            self.malicious_bot_requests += 1
+    
+    def finish(self) -> Dict:
+        suspicious_ips: List[SuspiciousIP] = []
+        for ip, data in self.ip_data.items():
+            suspicious = _score_ip(ip, data, self.high_rate_threshold)
+            if suspicious:
+                suspicious_ips.append(suspicious)
+        
+        summary = {
+            "window_minutes": self.window_minutes,
+            "total_requests": self.total_requests,
+            "unique_ips": len(self.ip_data),
+            "total_404s": self.total_404s,
+            "high_risk_hits": self.high_risk_hits,
+            "malicious_bot_requests": self.malicious_bot_requests,
+            # Sort by threat score (descending)
+            "suspicious_ips": sorted(suspicious_ips, key=lambda x: x.threat_score, reverse=True),
+        }
+        if self.log_path is not None:
+            summary["log_path"] = self.log_path
+            summary["log_exists"] = os.path.exists(self.log_path)
+        return summary
+
+
+def _score_ip(ip: str, data: Dict, high_rate_threshold: int) -> Optional[SuspiciousIP]:
+    """
+    Score the accumulated activity of one IP.
+    
+    Returns:
+        SuspiciousIP if the IP meets suspicious criteria, None otherwise
+    """
+    malicious_bot = data["malicious_bot"]
+    
+    # Check for high request rate
+    high_rate = data["hits"] >= high_rate_threshold
+    
+    # Calculate threat score
+    threat_score = 0
+    
+    # High request rate
+    if high_rate:
+        threat_score += 20
+    
+    # Repeated 404s (reconnaissance indicator)
+    if data["status_404"] >= 5:
+        threat_score += 15 + min(data["status_404"], 20)
+    
+    # Access to high-risk endpoints
+    suspicious_url_count = len(data["suspicious_urls"])
+    if suspicious_url_count > 0:
+        threat_score += 25 + (suspicious_url_count * 5)
+    
+    # Malicious bot detected
+    if malicious_bot:
+        threat_score += 30
+    
+    # Only include IPs that meet suspicious criteria
+    if threat_score == 0 and not high_rate:
+        return None
+    
+    return SuspiciousIP(
+        ip=ip,
+        total_hits=data["hits"],
+        suspicious_urls=sorted(data["suspicious_urls"]),
+        status_404_count=data["status_404"],
+        malicious_bot=malicious_bot,
+        high_rate=high_rate,
+        threat_score=threat_score
+    )
+
+
 def analyze_traffic(
     entries: List[LogEntry],
     high_rate_threshold: int = 30,
@@ -294,71 +424,8 @@ def analyze_traffic(
     Returns:
         List of SuspiciousIP objects sorted by threat score (descending)
     """
-    # Group entries by IP
-    ip_data: Dict[str, Dict] = defaultdict(lambda: {
-        "hits": 0,
-        "urls": [],
-        "status_404": 0,
-        "user_agents": set(),
-        "suspicious_urls": set()
-    })
-    
-    for entry in entries:
-        data = ip_data[entry.ip]
-        data["hits"] += 1
-        data["urls"].append(entry.url)
-        data["user_agents"].add(entry.user_agent)
-        
-        if entry.status == 404:
-            data["status_404"] += 1
-        
-        if is_suspicious_url(entry.url):
-            data["suspicious_urls"].add(entry.url)
-    
-    # Analyze each IP
-    suspicious_ips: List[SuspiciousIP] = []
-    
-    for ip, data in ip_data.items():
-        # Check for malicious bot
-        malicious_bot = any(is_malicious_bot(ua) for ua in data["user_agents"])
-        
-        # Check for high request rate
-        high_rate = data["hits"] >= high_rate_threshold
-        
-        # Calculate threat score
-        threat_score = 0
-        
-        # High request rate
-        if high_rate:
-            threat_score += 20
-        
-        # Repeated 404s (reconnaissance indicator)
-        if data["status_404"] >= 5:
-            threat_score += 15 + min(data["status_404"], 20)
-        
-        # Access to high-risk endpoints
-        suspicious_url_count = len(data["suspicious_urls"])
-        if suspicious_url_count > 0:
-            threat_score += 25 + (suspicious_url_count * 5)
-        
-        # Malicious bot detected
-        if malicious_bot:
-            threat_score += 30
-        
-        # Only include IPs that meet suspicious criteria
-        if threat_score > 0 or high_rate:
-            suspicious_ips.append(SuspiciousIP(
-                ip=ip,
-                total_hits=data["hits"],
-                suspicious_urls=sorted(data["suspicious_urls"]),
-                status_404_count=data["status_404"],
-                malicious_bot=malicious_bot,
-                high_rate=high_rate,
-                threat_score=threat_score
-            ))
-    
-    # Sort by threat score (descending)
-    return sorted(suspicious_ips, key=lambda x: x.threat_score, reverse=True)
+    detector = TrafficDetector(high_rate_threshold, window_minutes)
+    return run_detector(detector, log_entries=entries)["suspicious_ips"]
 
 
 def get_traffic_summary(
@@ -378,32 +445,8 @@ def get_traffic_summary(
         Dictionary containing traffic analysis results
     """
     entries = read_recent_logs(log_path, window_minutes)
-    suspicious_ips = analyze_traffic(entries, high_rate_threshold, window_minutes)
-    
-    # Calculate summary statistics
-    total_requests = len(entries)
-    unique_ips = len(set(e.ip for e in entries))
-    total_404s = sum(1 for e in entries if e.status == 404)
-    
-    # Count high-risk endpoint hits
-    high_risk_hits = sum(1 for e in entries if is_suspicious_url(e.url))
-    
-    # Count malicious bot requests
-    malicious_bot_requests = sum(
-        1 for e in entries if is_malicious_bot(e.user_agent)
-    )
-    
-    return {
-        "window_minutes": window_minutes,
-        "total_requests": total_requests,
-        "unique_ips": unique_ips,
-        "total_404s": total_404s,
-        "high_risk_hits": high_risk_hits,
-        "malicious_bot_requests": malicious_bot_requests,
-        "suspicious_ips": suspicious_ips,
-        "log_path": log_path,
-        "log_exists": os.path.exists(log_path)
-    }
+    detector = TrafficDetector(high_rate_threshold, window_minutes, log_path)
+    return run_detector(detector, log_entries=entries)
 
 
 def classify_threat_level(threat_score: int) -> Tuple[str, str]:
@@ -9,7 +9,12 @@ This package contains modules responsible for gathering system and network data:
 from core.collectors.connection import collect_connections
 from core.collectors.system import (
     get_system_stats,
+    get_system_history,
+    get_system_sampler,
+    SystemSampler,
     get_top_processes,
+    get_process_table,
+    ProcessTable,
     get_disk_io,
     format_uptime,
     format_bytes
@@ -18,7 +23,12 @@ from core.collectors.system import (
 __all__ = [
     'collect_connections',
     'get_system_stats',
+    'get_system_history',
+    'get_system_sampler',
+    'SystemSampler',
     'get_top_processes',
+    'get_process_table',
+    'ProcessTable',
     'get_disk_io',
     'format_uptime',
     'format_bytes'
@@ -6,7 +6,38 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from utils.geo import geo_lookup, reverse_dns
 from utils.network import TCP_STATES, hex_ip, hex_port
-from utils.processes import get_process_map
+from utils.processes import get_process_map, process_name
+
+def read_socket_table():
+    """
+    Read raw TCP sockets from /proc without process, geo or DNS enrichment.
+    
+    Returns:
+        List of connection dictionaries with local/remote address and state
+    """
+    connections = []
+    for proc_file in ["/proc/net/tcp", "/proc/net/tcp6"]:
+        if not os.path.exists(proc_file):
+            continue
+        
+        try:
+            with open(proc_file, "r") as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        
+        for line in lines:
+            p = line.split()
+            lip, lport = p[1].split(":")
+            rip, rport = p[2].split(":")
+            connections.append({
+                "local_ip": hex_ip(lip),
+                "local_port": hex_port(lport),
+                "remote_ip": hex_ip(rip),
+                "remote_port": hex_port(rport),
+                "state": TCP_STATES.get(p[3], "UNKNOWN"),
+            })
+    return connections
 
 def collect_connections():
     connections = []
@@ -72,11 +103,7 @@ def collect_connections():
                 }
                 
                 if c.pid:
-                    try:
-                        p = psutil.Process(c.pid)
-                        conn["pname"] = p.name()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
+                    conn["pname"] = process_name(c.pid) or ""
                 
                 if conn["remote_ip"] not in ["127.0.0.1", "0.0.0.0", "::1", "::", ""]:
                     conn["geo"] = geo_lookup(conn["remote_ip"])
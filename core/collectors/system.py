@@ -8,119 +8,549 @@ This module provides functionality to monitor system resources including:
 - Network I/O statistics
 - Process counts and system uptime
 
+Statistics are sampled by a background thread at a fixed cadence
+(MONIX_SYSTEM_SAMPLE_INTERVAL, default 1 s) into a ring buffer of the last
+MONIX_SYSTEM_SAMPLE_HISTORY samples (default 300). CPU usage per core and
+network / disk rates are derived from the difference between consecutive
+samples, and readers get the latest result without sampling.
+
 Technical Rationale:
     System resource monitoring is essential for detecting performance anomalies
     that may indicate security incidents (e.g., CPU spikes from cryptominers,
     memory exhaustion from DoS attacks, unusual disk activity from data exfiltration).
     This enables proactive detection of compromised systems.
+    Sampling in the background instead of per request removes the 100 ms
+    blocking CPU measurement from every API call, and keeping successive
+    samples is what turns cumulative counters into rates.
 """
 
+import heapq
 import os
 import sys
 import time
 import psutil
-from typing import Dict, Any, Optional
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from utils.procfs import get_proc_reader, resolve_backend, selected_backend
+
+
+# Seconds between system samples
+SAMPLE_INTERVAL = float(os.environ.get("MONIX_SYSTEM_SAMPLE_INTERVAL", 1.0))
+
+# Samples kept in the ring buffer (5 minutes at the default interval)
+SAMPLE_HISTORY = int(os.environ.get("MONIX_SYSTEM_SAMPLE_HISTORY", 300))
+
+# Gap between the two samples taken at start-up, so rates exist from the first call
+PRIMING_INTERVAL = 0.1
+
+
+class RawSample(NamedTuple):
+    """Counters read in one sampling pass."""
+    monotonic: float
+    cpu_times: List[Any]
+    net_io: Any
+    disk_io: Any
+
+
+def _cpu_busy_percent(before: Any, after: Any) -> float:
+    """CPU busy percentage between two cpu_times readings (same formula as psutil)."""
+    def split(times):
+        total = sum(times)
+        # guest time is already included in user time on Linux
+        total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+        idle = times.idle + getattr(times, "iowait", 0.0)
+        return total, idle
+
+    total_before, idle_before = split(before)
+    total_after, idle_after = split(after)
+    total = total_after - total_before
+    if total <= 0:
+        return 0.0
+    busy = total - (idle_after - idle_before)
+    return round(min(100.0, max(0.0, busy / total * 100)), 2)
+
+
+def _rate(before: Any, after: Any, field: str, elapsed: float) -> float:
+    """Per-second rate of a cumulative counter (0 after a counter reset)."""
+    if before is None or after is None or elapsed <= 0:
+        return 0.0
+    delta = getattr(after, field) - getattr(before, field)
+    return round(max(0, delta) / elapsed, 2)
+
+
+def _read_counters() -> RawSample:
+    return RawSample(
+        monotonic=time.monotonic(),
+        cpu_times=psutil.cpu_times(percpu=True),
+        net_io=psutil.net_io_counters(),
+        disk_io=psutil.disk_io_counters()
+    )
+
+
+def _build_stats(previous: RawSample, current: RawSample) -> Dict[str, Any]:
+    """Derive the stats dictionary from two consecutive samples."""
+    elapsed = current.monotonic - previous.monotonic
+    per_core = [
+        _cpu_busy_percent(before, after)
+        for before, after in zip(previous.cpu_times, current.cpu_times)
+    ]
+    cpu_percent = round(sum(per_core) / len(per_core), 2) if per_core else 0.0
+
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    net_io = current.net_io
+
+    try:
+        load_avg = os.getloadavg()
+    except (OSError, AttributeError):
+        # Windows or systems without loadavg
+        load_avg = [0.0, 0.0, 0.0]
+
+    return {
+        "cpu_percent": cpu_percent,
+        "cpu_per_core": per_core,
+        "memory_percent": round(memory.percent, 2),
+        "disk_percent": round(disk.percent, 2),
+        "network_sent": net_io.bytes_sent if net_io else 0,
+        "network_recv": net_io.bytes_recv if net_io else 0,
+        "network_rates": {
+            "bytes_sent_per_sec": _rate(previous.net_io, net_io, "bytes_sent", elapsed),
+            "bytes_recv_per_sec": _rate(previous.net_io, net_io, "bytes_recv", elapsed),
+            "packets_sent_per_sec": _rate(previous.net_io, net_io, "packets_sent", elapsed),
+            "packets_recv_per_sec": _rate(previous.net_io, net_io, "packets_recv", elapsed),
+        },
+        "disk_rates": {
+            "read_iops": _rate(previous.disk_io, current.disk_io, "read_count", elapsed),
+            "write_iops": _rate(previous.disk_io, current.disk_io, "write_count", elapsed),
+            "read_bytes_per_sec": _rate(previous.disk_io, current.disk_io, "read_bytes", elapsed),
+            "write_bytes_per_sec": _rate(previous.disk_io, current.disk_io, "write_bytes", elapsed),
+        },
+        "uptime": int(time.time() - psutil.boot_time()),
+        "load_avg": [round(load, 2) for load in load_avg],
+        "process_count": len(psutil.pids()),
+        "sample_interval": round(elapsed, 3),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def _error_stats(error: str) -> Dict[str, Any]:
+    """Minimal stats returned when sampling fails."""
+    return {
+        "cpu_percent": 0.0,
+        "memory_percent": 0.0,
+        "disk_percent": 0.0,
+        "network_sent": 0,
+        "network_recv": 0,
+        "uptime": 0,
+        "load_avg": [0.0, 0.0, 0.0],
+        "process_count": 0,
+        "error": error,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+class SystemSampler:
+    """
+    Background sampler of system statistics.
+    
+    A daemon thread reads the system counters every ``interval`` seconds
+    and derives usage and rates from the difference to the previous
+    reading. The last ``history`` results are kept in a ring buffer; readers
+    get the latest one without doing any sampling themselves.
+    """
+    
+    def __init__(self, interval: float = SAMPLE_INTERVAL, history: int = SAMPLE_HISTORY):
+        """
+        Args:
+            interval: Seconds between samples
+            history: Results kept in the ring buffer
+        """
+        self.interval = max(0.1, interval)
+        self._history: "deque[Dict[str, Any]]" = deque(maxlen=max(1, history))
+        self._previous: Optional[RawSample] = None
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+    
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one sample now and append its stats to the ring buffer.
+        
+        Returns:
+            The new stats dictionary
+        """
+        try:
+            current = _read_counters()
+            previous = self._previous
+            if previous is None:
+                # Rates need two readings; prime with a short gap once
+                time.sleep(PRIMING_INTERVAL)
+                previous, current = current, _read_counters()
+            stats = _build_stats(previous, current)
+            self._previous = current
+        except Exception as e:
+            stats = _error_stats(str(e))
+        with self._lock:
+            self._history.append(stats)
+        return stats
+    
+    def start(self) -> "SystemSampler":
+        """Start the sampling thread (once); the first sample is taken before returning."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="monix-system-sampler", daemon=True)
+        if not self._history:
+            self.sample()
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+    
+    def _run(self) -> None:
+        # Fixed cadence: sleep until the next slot, not a full interval after sampling
+        next_at = time.monotonic() + self.interval
+        while not self._stop.wait(max(0.0, next_at - time.monotonic())):
+            self.sample()
+            next_at += self.interval
+            if next_at < time.monotonic():
+                next_at = time.monotonic() + self.interval  # Fell behind; skip missed slots
+    
+    def latest(self) -> Dict[str, Any]:
+        """
+        Get the most recent stats, starting the sampler if needed.
+        
+        Returns:
+            Stats dictionary with ``sample_age`` (seconds since it was taken)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        with self._lock:
+            stats = dict(self._history[-1])
+        previous = self._previous
+        if previous is not None:
+            stats["sample_age"] = round(time.monotonic() - previous.monotonic, 3)
+        return stats
+    
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get buffered stats, oldest first.
+        
+        Args:
+            limit: Most recent entries to return (default: all)
+        """
+        with self._lock:
+            samples = list(self._history)
+        return samples[-limit:] if limit else samples
+
+
+_sampler: Optional[SystemSampler] = None
+_sampler_lock = Lock()
+
+
+def get_system_sampler() -> SystemSampler:
+    """Get the shared system sampler, creating it on first use."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = SystemSampler()
+    return _sampler
+
+
+def set_system_sampler(sampler: Optional[SystemSampler]) -> Optional[SystemSampler]:
+    """
+    Replace the shared system sampler.
+    
+    Returns:
+        The previously installed sampler
+    """
+    global _sampler
+    with _sampler_lock:
+        previous = _sampler
+        _sampler = sampler
+    return previous
+
 
 def get_system_stats() -> Dict[str, Any]:
     """
-    Collect comprehensive system statistics.
+    Get the latest system statistics from the background sampler.
+    
+    The first call starts the sampler (about 100 ms to take the first
+    sample); later calls return immediately.
     
     Returns:
         Dictionary containing:
-        - cpu_percent: Current CPU usage percentage
+        - cpu_percent: CPU usage percentage over the last sample interval
+        - cpu_per_core: Usage percentage of each core
         - memory_percent: Current memory usage percentage
         - disk_percent: Current disk usage percentage (root partition)
         - network_sent: Bytes sent since boot
         - network_recv: Bytes received since boot
+        - network_rates: Bytes and packets sent/received per second
+        - disk_rates: Read/write operations and bytes per second
         - uptime: System uptime in seconds
         - load_avg: System load averages (1min, 5min, 15min)
         - process_count: Total number of running processes
+        - sample_interval: Seconds between the two samples the rates come from
+        - sample_age: Seconds since the sample was taken
     """
-    try:
-        # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+    return get_system_sampler().latest()
+
+
+def get_system_history(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Get recent system statistics from the sampler's ring buffer, oldest first.
+    
+    Args:
+        limit: Most recent entries to return (default: all buffered)
+    """
+    sampler = get_system_sampler()
+    sampler.latest()  # Make sure it is running
+    return sampler.history(limit)
+
+
+# Seconds within which repeated top-process calls reuse the last pass
+PROCESS_REFRESH_INTERVAL = 1.0
+
+# Sort keys accepted by get_top_processes
+PROCESS_SORT_KEYS = ("cpu", "memory", "io", "connections")
+
+
+class ProcessReading(NamedTuple):
+    """One process as read by a process backend."""
+    pid: int
+    start_time: float
+    name: str
+    cpu_time: float
+    rss: int
+    io: Optional[Tuple[int, int]]
+
+
+class ProcessSample:
+    """Last reading of one process incarnation (pid + create_time)."""
+    
+    __slots__ = ("pid", "name", "cpu_time", "io_read", "io_write", "row")
+    
+    def __init__(self, pid: int, name: str):
+        self.pid = pid
+        self.name = name
+        self.cpu_time = 0.0
+        self.io_read: Optional[int] = None
+        self.io_write: Optional[int] = None
+        self.row: Dict[str, Any] = {}
+
+
+class ProcessTable:
+    """
+    Incremental per-process CPU, memory and I/O usage.
+    
+    Each pass reads every process once (its /proc stat file with the procfs
+    backend, one psutil ``oneshot`` otherwise) and derives CPU and I/O rates from the previous pass, so all processes
+    share a single measurement interval instead of each being sampled for
+    its own 100 ms. Samples are keyed by pid and create time, so a reused
+    pid starts fresh instead of inheriting another process's counters.
+    Passes closer together than ``min_interval`` reuse the last result.
+    """
+    
+    def __init__(self, min_interval: float = PROCESS_REFRESH_INTERVAL, backend: Optional[str] = None):
+        """
+        Args:
+            min_interval: Seconds within which calls reuse the last pass
+            backend: "auto", "procfs" or "psutil" (default: MONIX_PROCESS_BACKEND, see utils.procfs)
         
-        # Memory usage
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
+        Raises:
+            ValueError: If backend is unknown or unavailable
+        """
+        self.min_interval = min_interval
+        self.backend = resolve_backend(backend) if backend else selected_backend()
+        self._samples: Dict[Tuple[int, float], ProcessSample] = {}
+        self._last_pass: Optional[float] = None
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = Lock()
+    
+    def _read_psutil(self) -> Iterator[ProcessReading]:
+        # process_iter keeps Process handles between calls and drops reused pids
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    cpu = proc.cpu_times()
+                    try:
+                        io = proc.io_counters()
+                        io_counts = (io.read_bytes, io.write_bytes)
+                    except (psutil.AccessDenied, AttributeError):
+                        io_counts = None
+                    yield ProcessReading(
+                        proc.pid, proc.create_time(), proc.name(),
+                        cpu.user + cpu.system, proc.memory_info().rss, io_counts
+                    )
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+    
+    def _read_procfs(self) -> Iterator[ProcessReading]:
+        reader = get_proc_reader()
+        for stat in reader.scan():
+            yield ProcessReading(stat.pid, stat.start_time, stat.name, stat.cpu_time, stat.rss, reader.io(stat.pid))
+    
+    def _pass(self) -> None:
+        now = time.monotonic()
+        wall = time.time()
+        elapsed = now - self._last_pass if self._last_pass is not None else None
+        total_memory = psutil.virtual_memory().total or 1
+        samples: Dict[Tuple[int, float], ProcessSample] = {}
+        rows = []
+        readings = self._read_procfs() if self.backend == "procfs" else self._read_psutil()
         
-        # Disk usage (root partition)
-        disk = psutil.disk_usage('/')
-        disk_percent = disk.percent
+        for pid, start_time, name, cpu_time, rss, io_counts in readings:
+            key = (pid, start_time)
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = ProcessSample(pid, name)
+            io_read, io_write = io_counts if io_counts is not None else (None, None)
+            
+            known = key in self._samples
+            if known and elapsed:
+                interval = elapsed
+            else:
+                # New since the last pass: all its CPU time falls after its start
+                interval = max(wall - key[1], 1e-3) if elapsed else None
+            
+            cpu_percent = 0.0
+            io_read_rate = io_write_rate = None
+            if interval:
+                cpu_percent = max(0.0, cpu_time - (sample.cpu_time if known else 0.0)) / interval * 100
+                if io_read is not None and (not known or sample.io_read is not None):
+                    previous_read = sample.io_read if known else 0
+                    previous_write = sample.io_write if known else 0
+                    io_read_rate = max(0, io_read - previous_read) / interval
+                    io_write_rate = max(0, io_write - previous_write) / interval
+            
+            sample.cpu_time = cpu_time
+            sample.io_read, sample.io_write = io_read, io_write
+            sample.row = {
+                "pid": sample.pid,
+                "name": sample.name,
+                "cpu_percent": round(cpu_percent, 2),
+                "memory_percent": round(rss / total_memory * 100, 2),
+                "rss": rss,
+                "io_read_per_sec": round(io_read_rate, 1) if io_read_rate is not None else None,
+                "io_write_per_sec": round(io_write_rate, 1) if io_write_rate is not None else None,
+            }
+            samples[key] = sample
+            rows.append(sample.row)
         
-        # Network I/O
-        net_io = psutil.net_io_counters()
-        network_sent = net_io.bytes_sent
-        network_recv = net_io.bytes_recv
+        self._samples = samples
+        self._rows = rows
+        self._last_pass = now
+    
+    def refresh(self) -> List[Dict[str, Any]]:
+        """
+        Get current per-process rows, reading processes if the last pass is old.
         
-        # System uptime
-        boot_time = psutil.boot_time()
-        uptime = time.time() - boot_time
+        The very first pass is followed by a second one 100 ms later so CPU
+        usage has an interval to be measured over.
+        """
+        with self._lock:
+            if self._last_pass is None:
+                self._pass()
+                time.sleep(PRIMING_INTERVAL)
+                self._pass()
+            elif time.monotonic() - self._last_pass >= self.min_interval:
+                self._pass()
+            return self._rows
+    
+    def top(self, limit: int = 10, sort: str = "cpu") -> List[Dict[str, Any]]:
+        """
+        Get the top processes by a resource.
         
-        # Load averages (Unix-like systems)
-        try:
-            load_avg = os.getloadavg()
-        except (OSError, AttributeError):
-            # Windows or systems without loadavg
-            load_avg = [0.0, 0.0, 0.0]
+        Args:
+            limit: Maximum number of processes to return
+            sort: cpu, memory, io (bytes read + written per second) or
+                connections (open TCP/UDP sockets)
         
-        # Process count
-        process_count = len(psutil.pids())
+        Returns:
+            List of process dictionaries (pid, name, cpu_percent,
+            memory_percent, rss, io_read_per_sec, io_write_per_sec, and
+            connections when sorting by connections)
         
-        return {
-            "cpu_percent": round(cpu_percent, 2),
-            "memory_percent": round(memory_percent, 2),
-            "disk_percent": round(disk_percent, 2),
-            "network_sent": network_sent,
-            "network_recv": network_recv,
-            "uptime": int(uptime),
-            "load_avg": [round(load, 2) for load in load_avg],
-            "process_count": process_count,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except Exception as e:
-        # Return minimal stats on error
-        return {
-            "cpu_percent": 0.0,
-            "memory_percent": 0.0,
-            "disk_percent": 0.0,
-            "network_sent": 0,
-            "network_recv": 0,
-            "uptime": 0,
-            "load_avg": [0.0, 0.0, 0.0],
-            "process_count": 0,
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-
-def get_top_processes(limit: int = 10) -> list:
-    """
-    Get top processes by CPU usage.
+        Raises:
+            ValueError: If sort is unknown
+        """
+        if sort not in PROCESS_SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort} (use {', '.join(PROCESS_SORT_KEYS)})")
+        rows = self.refresh()
+        
+        if sort == "connections":
+            counts = _connection_counts()
+            rows = [{**row, "connections": counts.get(row["pid"], 0)} for row in rows]
+            key = lambda row: row["connections"]
+        elif sort == "memory":
+            key = lambda row: row["rss"]
+        elif sort == "io":
+            key = lambda row: (row["io_read_per_sec"] or 0) + (row["io_write_per_sec"] or 0)
+        else:
+            key = lambda row: row["cpu_percent"]
+        
+        # Top-K without sorting the whole table
+        return [dict(row) for row in heapq.nlargest(max(0, limit), rows, key=key)]
+
+
+def _connection_counts() -> Dict[int, int]:
+    """Open inet sockets per pid, from one system-wide socket listing."""
+    counts: Dict[int, int] = {}
+    try:
+        for conn in psutil.net_connections(kind="inet"):
+            if conn.pid:
+                counts[conn.pid] = counts.get(conn.pid, 0) + 1
+    except (psutil.AccessDenied, OSError):
+        pass
+    return counts
+
+
+_process_table: Optional[ProcessTable] = None
+_process_table_lock = Lock()
+
+
+def get_process_table() -> ProcessTable:
+    """Get the shared process table, creating it on first use."""
+    global _process_table
+    if _process_table is None:
+        with _process_table_lock:
+            if _process_table is None:
+                _process_table = ProcessTable()
+    return _process_table
+
+
+def get_top_processes(limit: int = 10, sort: str = "cpu") -> list:
+    """
+    Get top processes by CPU usage (or memory, I/O, connections).
+    
+    CPU and I/O rates are measured between consecutive calls (at least
+    PROCESS_REFRESH_INTERVAL apart) rather than by sampling each process.
     
     Args:
         limit: Maximum number of processes to return
+        sort: cpu, memory, io or connections
         
     Returns:
         List of process dictionaries with pid, name, cpu_percent, memory_percent
-    """
-    processes = []
+        (plus rss, io_read_per_sec, io_write_per_sec)
     
+    Raises:
+        ValueError: If sort is unknown
+    """
+    if sort not in PROCESS_SORT_KEYS:
+        raise ValueError(f"Unknown sort: {sort} (use {', '.join(PROCESS_SORT_KEYS)})")
     try:
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                proc.info['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                processes.append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
-        # Sort by CPU usage
-        processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-        return processes[:limit]
+        return get_process_table().top(limit, sort)
     except Exception:
         return []
 
@@ -4,9 +4,18 @@ Monitoring and state management modules for Monix.
 This package contains modules responsible for monitoring orchestration and state:
 - engine: Main monitoring engine that coordinates collection and analysis
 - state: Thread-safe global state manager for real-time data
+- index: Indexed filtering and pagination of the connection snapshot
+- events: Versioned live event bus for connection, alert and traffic changes
+- metrics: Prometheus metrics maintained by the engine, and a standalone exporter
 """
 
 from core.monitoring.engine import start_monitor
 from core.monitoring.state import state, GlobalState
+from core.monitoring.index import ConnectionIndex
+from core.monitoring.events import EventBus, Event
+from core.monitoring.metrics import metrics, MetricsRegistry, start_exporter
 
-__all__ = ['start_monitor', 'state', 'GlobalState']
+__all__ = [
+    'start_monitor', 'state', 'GlobalState', 'ConnectionIndex', 'EventBus', 'Event',
+    'metrics', 'MetricsRegistry', 'start_exporter'
+]
@@ -1,53 +1,75 @@
 import os
 import sys
 import time
-from collections import defaultdict
-from threading import Thread
+from threading import Lock, Thread
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.monitoring.state import state
-from core.analyzers.traffic import get_traffic_summary, DEFAULT_LOG_PATH
+from core.monitoring.metrics import (
+    collector_last_tick,
+    collector_tick_seconds,
+    detector_collector,
+    metrics,
+    start_exporter,
+)
+from core.analyzers.detection import DetectionEngine
+from core.analyzers.prefix import parse_network
+from core.analyzers.registry import DetectorRegistry
+from core.analyzers.threat import ConnectionThreatDetector
+from core.analyzers.traffic import TrafficDetector, read_recent_logs, DEFAULT_LOG_PATH
 from utils.network import TCP_STATES, hex_ip, hex_port
 from utils.geo import geo_lookup, reverse_dns
 from utils.processes import get_process_map
+from utils.logger import log_warn
 
-PORT_SCAN_WINDOW = 10
-PORT_SCAN_THRESHOLD = 5
-port_activity = defaultdict(lambda: defaultdict(float))
+# Set to "0" to disable the background collector in this process
+MONITOR_ENV = "MONIX_MONITOR"
 
-def detect_attacks(conns):
-    syn_count = defaultdict(int)
-    conn_count = defaultdict(int)
-    now = time.time()
+# Seconds between re-reading the web server log for traffic analysis
+TRAFFIC_INTERVAL = 5
 
-    for c in conns:
-        if c["state"] == "SYN_RECV":
-            syn_count[c["remote_ip"]] += 1
-        
-        if c["state"] == "ESTABLISHED":
-            conn_count[c["remote_ip"]] += 1
+# Comma-separated CIDRs (e.g. our own load balancers) excluded from detection
+TRUSTED_NETWORKS_ENV = "MONIX_TRUSTED_NETWORKS"
 
-        ip = c["remote_ip"]
-        port = c["local_port"]
-        if ip not in ["127.0.0.1", "0.0.0.0", "::1", "::"]:
-            port_activity[ip][port] = now
+def trusted_networks_from_env():
+    """Valid CIDRs of MONIX_TRUSTED_NETWORKS; malformed entries are logged and skipped."""
+    networks = []
+    for entry in os.environ.get(TRUSTED_NETWORKS_ENV, "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            parse_network(entry)
+        except ValueError:
+            log_warn(f"Ignoring invalid {TRUSTED_NETWORKS_ENV} entry: {entry}")
+            continue
+        networks.append(entry)
+    return networks
 
-    for ip, count in syn_count.items():
-        if count >= 100:
-            state.add_alert(f"SYN_FLOOD from {ip} (half-open={count})", key=f"syn_{ip}")
-    
-    for ip, count in conn_count.items():
-        if count >= 50:
-            state.add_alert(f"HIGH_CONN from {ip} (total={count})", key=f"high_conn_{ip}")
+detection_engine = DetectionEngine(trusted_networks=trusted_networks_from_env())
+
+# All detectors are fed from one pass per tick; see registry.costs() for per-rule cost
+registry = DetectorRegistry()
+registry.register(ConnectionThreatDetector(detection_engine))
+registry.register(TrafficDetector(window_minutes=10, log_path=DEFAULT_LOG_PATH))
+metrics.register_collector("detectors", detector_collector(registry))
+
+def run_detectors(conns, log_entries=None):
+    results = registry.run(connections=conns, log_entries=log_entries)
+    for alert in results.get(ConnectionThreatDetector.name, []):
+        state.add_alert(alert.message, key=alert.key, kind=alert.kind)
+    if TrafficDetector.name in results:
+        state.update_traffic(results[TrafficDetector.name])
+    return results
 
-    for ip, ports in port_activity.items():
-        recent = [p for p, ts in ports.items() if now - ts <= PORT_SCAN_WINDOW]
-        if len(recent) >= PORT_SCAN_THRESHOLD:
-            state.add_alert(f"PORT_SCAN from {ip} (ports: {recent})", key=f"scan_{ip}")
+def detect_attacks(conns):
+    run_detectors(conns)
 
 def collector_loop():
+    last_traffic_read = float("-inf")
     while True:
+        tick_started = time.perf_counter()
         conns = []
         process_map = get_process_map()
         
@@ -81,18 +103,45 @@ def collector_loop():
                 conns.append(conn)
 
         state.update_connections(conns)
-        detect_attacks(conns)
         
         # Update traffic analysis every 5 seconds to reduce I/O
-        if int(time.time()) % 5 == 0:
+        log_entries = None
+        if time.monotonic() - last_traffic_read >= TRAFFIC_INTERVAL:
+            last_traffic_read = time.monotonic()
             try:
-                traffic_summary = get_traffic_summary(DEFAULT_LOG_PATH, window_minutes=10)
-                state.update_traffic(traffic_summary)
+                log_entries = read_recent_logs(DEFAULT_LOG_PATH, window_minutes=10)
             except Exception:
                 pass  # Log file may not be accessible
         
+        run_detectors(conns, log_entries)
+        collector_tick_seconds.observe(time.perf_counter() - tick_started)
+        collector_last_tick.set(time.time())
+        
         time.sleep(1)
 
+_monitor_thread = None
+_monitor_lock = Lock()
+
 def start_monitor():
-    t = Thread(target=collector_loop, daemon=True)
-    t.start()
+    """
+    Start the background collector once per process.
+    
+    Further calls return the running thread. Set MONIX_MONITOR=0 to keep a
+    process (e.g. an extra API worker) from collecting at all. With
+    MONIX_METRICS_PORT set, the standalone metrics exporter starts too.
+    
+    Returns:
+        The collector thread, or None if disabled
+    """
+    global _monitor_thread
+    if os.environ.get(MONITOR_ENV, "1") == "0":
+        return None
+    with _monitor_lock:
+        if _monitor_thread is None or not _monitor_thread.is_alive():
+            _monitor_thread = Thread(target=collector_loop, name="monix-monitor", daemon=True)
+            _monitor_thread.start()
+    try:
+        start_exporter()
+    except OSError:
+        pass  # Port taken; metrics stay available on the API's /metrics
+    return _monitor_thread
@@ -0,0 +1,245 @@
+"""
+Live event bus for Monix.
+
+The monitoring state publishes what changed on every update as versioned
+events:
+- connections: sockets opened, closed or changed state since the last tick
+- alert: a new security alert
+- traffic: changed traffic totals and suspicious-IP scores
+
+Subscribers (e.g. the API's event stream) each get a bounded queue. A
+subscriber that falls behind is not allowed to hold events back or grow
+without limit: its queue is dropped and it is told to resync from a fresh
+snapshot. Recent events are kept so a client reconnecting with the last
+version it saw can catch up without a snapshot. Versions restart with the
+process, so each bus has an ``epoch``; a client must present it along with
+its version (see event_id / parse_event_id) to be caught up.
+
+Configuration (environment variables):
+- MONIX_EVENT_BACKLOG: Recent events kept for reconnecting clients (default 1000)
+- MONIX_EVENT_QUEUE: Events buffered per subscriber before it must resync (default 256)
+- MONIX_STREAM_MAX: Subscribers allowed at once (default 32)
+
+Technical Rationale:
+    Polling the dashboard rebuilds and re-sends every connection each
+    time, although from one second to the next only a handful change.
+    Publishing the difference once per tick costs the collector one set
+    comparison and lets any number of clients follow along with traffic
+    proportional to the churn, while bounded queues keep one stalled
+    client from costing memory or delaying everyone else.
+"""
+
+import os
+import queue
+import threading
+import uuid
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+EVENT_BACKLOG = int(os.environ.get("MONIX_EVENT_BACKLOG", 1000))
+SUBSCRIBER_QUEUE = int(os.environ.get("MONIX_EVENT_QUEUE", 256))
+STREAM_MAX = int(os.environ.get("MONIX_STREAM_MAX", 32))
+
+EVENT_CONNECTIONS = "connections"
+EVENT_ALERT = "alert"
+EVENT_TRAFFIC = "traffic"
+
+# Queue marker telling a subscriber to resync from a snapshot
+RESYNC = object()
+
+
+class TooManySubscribers(Exception):
+    """Raised when the bus already has its maximum number of subscribers."""
+    pass
+
+
+class Event(NamedTuple):
+    """One published change."""
+    version: int
+    kind: str
+    data: Dict[str, Any]
+
+
+def connection_key(conn: Dict) -> Tuple:
+    """Identity of a socket across collections."""
+    return (conn["local_ip"], conn["local_port"], conn["remote_ip"], conn["remote_port"])
+
+
+def diff_connections(previous: List[Dict], current: List[Dict]) -> Optional[Dict[str, List]]:
+    """
+    Compare two connection snapshots.
+
+    Args:
+        previous: Connections of the last collection
+        current: Connections of this collection
+
+    Returns:
+        Dictionary with ``opened`` and ``changed`` connections and the keys
+        of ``closed`` ones, or None if nothing changed
+    """
+    before = {connection_key(c): c for c in previous}
+    opened, changed = [], []
+    seen = set()
+    for conn in current:
+        key = connection_key(conn)
+        seen.add(key)
+        old = before.get(key)
+        if old is None:
+            opened.append(conn)
+        elif old["state"] != conn["state"]:
+            changed.append(conn)
+    closed = [list(key) for key in before if key not in seen]
+    if not (opened or changed or closed):
+        return None
+    return {"opened": opened, "changed": changed, "closed": closed}
+
+
+def diff_traffic(previous: Dict[str, Any], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compare two traffic overviews (see state.summarize_traffic).
+
+    Returns:
+        Dictionary with the current totals, suspicious IPs whose score is
+        new or changed and IPs no longer suspicious, or None if nothing changed
+    """
+    totals = {k: v for k, v in current.items() if k != "suspicious_ips"}
+    old_scores = {ip.ip: ip.threat_score for ip in previous.get("suspicious_ips", [])}
+    new_ips = current.get("suspicious_ips", [])
+    scores = [ip for ip in new_ips if old_scores.get(ip.ip) != ip.threat_score]
+    cleared = [ip for ip in old_scores if ip not in {new.ip for new in new_ips}]
+    if not scores and not cleared and totals == {k: v for k, v in previous.items() if k != "suspicious_ips"}:
+        return None
+    return {**totals, "suspicious_ips": scores, "cleared_ips": cleared}
+
+
+class Subscription:
+    """
+    A subscriber's view of the bus.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int):
+        self._bus = bus
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _offer(self, item) -> None:
+        """Queue an item without blocking; on overflow, replace the backlog with RESYNC."""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(RESYNC)
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Wait for the next item.
+
+        Returns:
+            An Event, RESYNC, or None if nothing arrived within the timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """
+    Versioned publish/subscribe bus with a replay backlog.
+
+    Thread-safe. Versions increase by one per event.
+    """
+
+    def __init__(self, backlog: int = EVENT_BACKLOG, queue_size: int = SUBSCRIBER_QUEUE,
+                 max_subscribers: int = STREAM_MAX):
+        """
+        Args:
+            backlog: Recent events kept for catching up
+            queue_size: Events buffered per subscriber before it must resync
+            max_subscribers: Subscribers allowed at once
+        """
+        self.version = 0
+        # Distinguishes this bus's versions from those of an earlier process
+        self.epoch = uuid.uuid4().hex[:8]
+        self.queue_size = queue_size
+        self.max_subscribers = max(1, max_subscribers)
+        self._backlog: "deque[Event]" = deque(maxlen=backlog)
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, data: Dict[str, Any]) -> Event:
+        """Publish an event to every subscriber."""
+        with self._lock:
+            self.version += 1
+            event = Event(self.version, kind, data)
+            self._backlog.append(event)
+            for subscriber in self._subscribers:
+                subscriber._offer(event)
+        return event
+
+    def subscribe(self, since: Optional[int] = None) -> Tuple[Subscription, bool]:
+        """
+        Register a subscriber.
+
+        Args:
+            since: Last version the client has seen (e.g. SSE Last-Event-ID)
+
+        Returns:
+            Tuple of (subscription, needs_snapshot). With ``since`` still
+            covered by the backlog, the missed events are queued and no
+            snapshot is needed.
+
+        Raises:
+            TooManySubscribers: If max_subscribers are already subscribed
+        """
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers(f"{len(self._subscribers)} subscribers already connected")
+            needs_snapshot = True
+            if since is not None and since <= self.version:
+                oldest = self._backlog[0].version if self._backlog else self.version + 1
+                if since >= oldest - 1:
+                    missed = [event for event in self._backlog if event.version > since]
+                    if len(missed) <= self.queue_size:
+                        for event in missed:
+                            subscription._offer(event)
+                        needs_snapshot = False
+            self._subscribers.append(subscription)
+        return subscription, needs_snapshot
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def event_id(self, version: int) -> str:
+        """SSE id of a version: "<epoch>-<version>"."""
+        return f"{self.epoch}-{version}"
+
+    def parse_event_id(self, value: Optional[str]) -> Optional[int]:
+        """
+        Version of an SSE id issued by this bus.
+
+        Returns:
+            The version, or None if the id is malformed or from another
+            epoch (e.g. before a restart), so the client gets a snapshot
+        """
+        epoch, _, version = (value or "").partition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        return int(version)
+
+    def subscriber_count(self) -> int:
+        """Number of active subscribers."""
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,349 @@
+"""
+Prometheus metrics for Monix.
+
+Metrics are plain counters, gauges and histograms that the engine and state
+update as they work (one dictionary update per change), so rendering them
+for a scrape only formats numbers that already exist. Components that keep
+their own statistics (caches, pools) are read at scrape time through
+registered collector functions, which only copy a few counters.
+
+Metrics maintained here:
+- monix_connections{state}: Connections per TCP state in the last snapshot
+- monix_alerts_total{kind}: Alerts raised, by detector alert kind
+- monix_alerts_suppressed_total: Duplicate alerts dropped by rate limiting
+- monix_traffic_window{stat}: Totals of the current traffic analysis window
+- monix_collector_tick_seconds: Histogram of collector tick durations
+- monix_detector_*: Per-detector runs, items and CPU time
+
+The text exposition format (version 0.0.4) is rendered directly, so no
+client library is needed. The standalone exporter (start_exporter) serves
+the same text on its own port for processes without the API, e.g.
+``monix --watch``.
+
+Configuration (environment variables):
+- MONIX_METRICS_PORT: Port of the standalone exporter (started by start_monitor)
+- MONIX_METRICS_ADDR: Address it listens on (default 0.0.0.0)
+
+Technical Rationale:
+    Scraping /api/system-stats and converting the JSON made every scrape
+    rebuild the full system snapshot, and lost everything between two
+    scrapes (short alert bursts, slow ticks). Counters and histograms
+    updated at the source keep that history for the price of an addition,
+    and Prometheus derives rates and percentiles from them.
+"""
+
+import bisect
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS_PORT_ENV = "MONIX_METRICS_PORT"
+METRICS_ADDR_ENV = "MONIX_METRICS_ADDR"
+
+# Collector ticks range from milliseconds (idle host) to seconds (reverse DNS misses)
+TICK_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in values:
+            lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def replace(self, values: Dict[str, float]) -> None:
+        """
+        Set all values of a single-label gauge at once.
+
+        Label values missing from ``values`` are dropped, so e.g. a TCP
+        state that no longer occurs disappears instead of keeping its
+        last count.
+        """
+        with self._lock:
+            self._values = {(str(label),): value for label, value in values.items()}
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = TICK_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> ([count per bucket, non-cumulative], sum, count)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        # First bucket whose upper bound is >= value; the last slot is +Inf
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Set of metrics and scrape-time collectors, rendered together.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = TICK_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Register a function called at scrape time.
+
+        Args:
+            name: Collector name; registering the same name again replaces it
+            collector: Function returning (name, type, help, samples) families,
+                where samples are (labels dict, value) pairs
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue  # One broken collector must not fail the scrape
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    names = sorted(labels)
+                    lines.append(f"{name}{_labels(names, [labels[n] for n in names])} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+connections_by_state = metrics.gauge(
+    "monix_connections", "Connections per TCP state in the last snapshot", ["state"]
+)
+alerts_total = metrics.counter("monix_alerts_total", "Alerts raised, by kind", ["kind"])
+alerts_suppressed_total = metrics.counter(
+    "monix_alerts_suppressed_total", "Repeated alerts dropped by per-key rate limiting"
+)
+traffic_window = metrics.gauge(
+    "monix_traffic_window", "Totals of the current web traffic analysis window", ["stat"]
+)
+collector_tick_seconds = metrics.histogram(
+    "monix_collector_tick_seconds", "Duration of one collector tick (collection and detection)"
+)
+collector_last_tick = metrics.gauge(
+    "monix_collector_last_tick_timestamp_seconds", "Unix time the last collector tick finished"
+)
+
+
+def detector_collector(registry) -> Callable[[], Iterable[Family]]:
+    """
+    Build a collector exposing a DetectorRegistry's accumulated costs.
+
+    Args:
+        registry: core.analyzers.registry.DetectorRegistry
+    """
+    def collect() -> Iterable[Family]:
+        costs = registry.costs()
+        return [
+            ("monix_detector_runs_total", "counter", "Detector runs",
+             [({"detector": name}, cost["runs"]) for name, cost in costs.items()]),
+            ("monix_detector_items_total", "counter", "Items (connections, log entries) fed to each detector",
+             [({"detector": name}, cost["items"]) for name, cost in costs.items()]),
+            ("monix_detector_cpu_seconds_total", "counter", "CPU time spent in each detector",
+             [({"detector": name}, cost["cpu_ms"] / 1000) for name, cost in costs.items()]),
+            ("monix_detector_last_cpu_seconds", "gauge", "CPU time of each detector's last run",
+             [({"detector": name}, cost["last_cpu_ms"] / 1000) for name, cost in costs.items()]),
+        ]
+    return collect
+
+
+def cache_collector(caches: Dict[str, Callable[[], Dict[str, int]]]) -> Callable[[], Iterable[Family]]:
+    """
+    Build a collector exposing hit/miss statistics of caches.
+
+    Args:
+        caches: Mapping of cache name to its stats() function; "hits",
+            "misses" and (if present) "stale_hits" and "entries" are used
+    """
+    def collect() -> Iterable[Family]:
+        stats = {}
+        for name, get_stats in caches.items():
+            try:
+                stats[name] = get_stats()
+            except Exception:
+                continue
+        families = [
+            ("monix_cache_hits_total", "counter", "Cache hits",
+             [({"cache": name}, s.get("hits", 0) + s.get("stale_hits", 0)) for name, s in stats.items()]),
+            ("monix_cache_misses_total", "counter", "Cache misses",
+             [({"cache": name}, s.get("misses", 0)) for name, s in stats.items()]),
+        ]
+        entries = [({"cache": name}, s["entries"]) for name, s in stats.items() if "entries" in s]
+        if entries:
+            families.append(("monix_cache_entries", "gauge", "Entries held by each cache", entries))
+        return families
+    return collect
+
+
+class _ExporterHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the console
+
+
+_exporter: Optional[ThreadingHTTPServer] = None
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(port: Optional[int] = None, addr: Optional[str] = None,
+                   registry: MetricsRegistry = metrics) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics on a dedicated port in a background thread (once per process).
+
+    Args:
+        port: Port to listen on (default: MONIX_METRICS_PORT)
+        addr: Address to listen on (default: MONIX_METRICS_ADDR or 0.0.0.0)
+        registry: Metrics to serve
+
+    Returns:
+        The running server, or None if no port is configured
+    """
+    global _exporter
+    if port is None:
+        configured = os.environ.get(METRICS_PORT_ENV)
+        if not configured:
+            return None
+        port = int(configured)
+    addr = addr or os.environ.get(METRICS_ADDR_ENV, "0.0.0.0")
+
+    with _exporter_lock:
+        if _exporter is None:
+            handler = type("ExporterHandler", (_ExporterHandler,), {"registry": registry})
+            _exporter = ThreadingHTTPServer((addr, port), handler)
+            _exporter.daemon_threads = True
+            threading.Thread(target=_exporter.serve_forever, name="monix-metrics", daemon=True).start()
+    return _exporter
@@ -1,6 +1,69 @@
+import time
+from collections import Counter
 from threading import Lock
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.monitoring.events import (
+    EventBus,
+    EVENT_ALERT,
+    EVENT_CONNECTIONS,
+    EVENT_TRAFFIC,
+    diff_connections,
+    diff_traffic,
+)
+from core.monitoring.index import ConnectionIndex
+from core.monitoring.metrics import (
+    alerts_suppressed_total,
+    alerts_total,
+    connections_by_state,
+    traffic_window,
+)
+
+# Number of entries kept in the top-N aggregates
+TOP_N = 10
+
+# Remote addresses of listening / unconnected sockets, left out of top IPs
+UNSPECIFIED_IPS = frozenset(["0.0.0.0", "::"])
+
+
+def summarize_connections(conns: List[Dict]) -> Dict[str, Any]:
+    """
+    Aggregate a connection list: total, count per TCP state and top remote IPs.
+    
+    Args:
+        conns: Connection dictionaries
+        
+    Returns:
+        Dictionary with ``total``, ``by_state`` and ``top_remote_ips``
+    """
+    by_state = Counter(c["state"] for c in conns)
+    remote = Counter(c["remote_ip"] for c in conns if c["remote_ip"] not in UNSPECIFIED_IPS)
+    return {
+        "total": len(conns),
+        "by_state": dict(by_state.most_common()),
+        "top_remote_ips": [{"ip": ip, "count": count} for ip, count in remote.most_common(TOP_N)],
+    }
+
+
+def summarize_traffic(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a traffic analysis summary to its totals and top suspicious IPs.
+    
+    Args:
+        summary: Traffic analysis results from core.analyzers.traffic
+        
+    Returns:
+        Dictionary with the totals and up to TOP_N SuspiciousIP entries
+        (serialized as objects by the API's JSON provider)
+    """
+    return {
+        "total_requests": summary.get("total_requests", 0),
+        "unique_ips": summary.get("unique_ips", 0),
+        "total_404s": summary.get("total_404s", 0),
+        "high_risk_hits": summary.get("high_risk_hits", 0),
+        "suspicious_ips": summary.get("suspicious_ips", [])[:TOP_N]
+    }
 
 
 class GlobalState:
@@ -9,6 +72,12 @@ class GlobalState:
     
     Stores real-time data including network connections, security alerts,
     and traffic analysis results for dashboard display and monitoring.
+    
+    Aggregates (connection counts per state, top remote IPs, top suspicious
+    IPs) are computed once per update by the writer, so readers such as the
+    API get them without walking the connection list. What changed is
+    published on ``events``; events are published under the state lock, so
+    a snapshot taken with ``live_snapshot`` matches the bus version exactly.
     """
     
     def __init__(self):
@@ -16,20 +85,37 @@ class GlobalState:
         self.alerts: List[str] = []
         self.last_alert_time: Dict[str, datetime] = {}
         self.traffic_summary: Dict[str, Any] = {}
+        self.connection_index = ConnectionIndex([])
+        self.connection_summary: Dict[str, Any] = summarize_connections([])
+        self.traffic_overview: Dict[str, Any] = summarize_traffic({})
+        self.connections_updated_at: Optional[float] = None
+        self.traffic_updated_at: Optional[float] = None
+        self.events = EventBus()
         self.lock = Lock()
 
     def update_connections(self, conns: List[Dict]) -> None:
-        """Update the current connections list."""
+        """Update the current connections list, its aggregates and indexes."""
+        summary = summarize_connections(conns)
+        index = ConnectionIndex(conns)
+        # Only the collector writes connections, so the previous list is stable here
+        delta = diff_connections(self.connections, conns)
         with self.lock:
             self.connections = conns
+            self.connection_index = index
+            self.connection_summary = summary
+            self.connections_updated_at = time.time()
+            if delta is not None:
+                self.events.publish(EVENT_CONNECTIONS, {**delta, "connection_stats": summary})
+        connections_by_state.replace(summary["by_state"])
 
-    def add_alert(self, alert: str, key: str = None) -> None:
+    def add_alert(self, alert: str, key: str = None, kind: str = "other") -> None:
         """
         Add a security alert with rate limiting.
         
         Args:
             alert: Alert message
             key: Optional key for rate limiting duplicate alerts
+            kind: Alert kind counted in the alert metrics (e.g. SYN_FLOOD)
         """
         now = datetime.now()
         timestamp = now.strftime("%H:%M:%S")
@@ -38,11 +124,14 @@ class GlobalState:
             if key:
                 last_time = self.last_alert_time.get(key)
                 if last_time and (now - last_time).total_seconds() < 60:
+                    alerts_suppressed_total.inc()
                     return
                 self.last_alert_time[key] = now
 
             self.alerts.insert(0, f"{timestamp} — {alert}")
             self.alerts = self.alerts[:20]
+            self.events.publish(EVENT_ALERT, {"alert": self.alerts[0]})
+        alerts_total.inc(kind=kind)
 
     def update_traffic(self, summary: Dict[str, Any]) -> None:
         """
@@ -51,8 +140,17 @@ class GlobalState:
         Args:
             summary: Traffic analysis results from core.analyzers.traffic
         """
+        overview = summarize_traffic(summary)
         with self.lock:
+            delta = diff_traffic(self.traffic_overview, overview)
             self.traffic_summary = summary
+            self.traffic_overview = overview
+            self.traffic_updated_at = time.time()
+            if delta is not None:
+                self.events.publish(EVENT_TRAFFIC, delta)
+        for stat in ("total_requests", "unique_ips", "total_404s", "high_risk_hits"):
+            traffic_window.set(overview[stat], stat=stat)
+        traffic_window.set(len(summary.get("suspicious_ips", [])), stat="suspicious_ips")
 
     def get_traffic(self) -> Dict[str, Any]:
         """Get the current traffic analysis summary."""
@@ -64,6 +162,55 @@ class GlobalState:
         with self.lock:
             return list(self.connections), list(self.alerts)
 
+    def connections_view(self) -> Tuple[ConnectionIndex, Dict[str, Any], Optional[float]]:
+        """
+        Get the index of the current connections with their aggregates and update time.
+        
+        The index is the one installed by the last update (never mutated
+        afterwards), so no copy is made.
+        """
+        with self.lock:
+            return self.connection_index, self.connection_summary, self.connections_updated_at
+
+    def dashboard(self, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get the precomputed dashboard view.
+        
+        Args:
+            limit: Maximum number of connections included
+            
+        Returns:
+            Dictionary with connections (first ``limit``), connection_stats,
+            alerts, traffic_summary and the update times (epoch seconds)
+        """
+        with self.lock:
+            return {
+                "connections": self.connections[:max(0, limit)],
+                "connection_stats": self.connection_summary,
+                "alerts": list(self.alerts),
+                "traffic_summary": self.traffic_overview,
+                "updated_at": self.connections_updated_at,
+                "traffic_updated_at": self.traffic_updated_at,
+            }
+
+    def live_snapshot(self) -> Dict[str, Any]:
+        """
+        Get everything a live client needs to start following ``events``.
+        
+        Returns:
+            Dictionary with ``version`` (the last event already reflected),
+            connections, connection_stats, alerts and traffic_summary
+        """
+        with self.lock:
+            return {
+                "version": self.events.version,
+                "connections": self.connections,
+                "connection_stats": self.connection_summary,
+                "alerts": list(self.alerts),
+                "traffic_summary": self.traffic_overview,
+                "updated_at": self.connections_updated_at,
+            }
+
     def full_snapshot(self) -> Tuple[List[Dict], List[str], Dict[str, Any]]:
         """Get a full snapshot including traffic data."""
         with self.lock:
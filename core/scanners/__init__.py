@@ -4,9 +4,15 @@ Security scanning modules for Monix.
 This package contains modules responsible for security scanning:
 - security: System security checks (SSH ports, dangerous ports, etc.)
 - web: Web security analysis (SSL, DNS, headers, port scanning, etc.)
+- ports: Asynchronous TCP port scanner with adaptive timeouts
+- batch: Batch web analysis with a bounded pool and NDJSON output
+- cache: Persistent per-section web result cache with stale-while-revalidate
+- pool: Bounded priority pool that runs scans off the request threads
+- jobs: Persistent scan job queue with deduplication and result TTL
 """
 
-from core.scanners.security import run_security_checks
+from core.scanners.security import run_security_checks, SecurityChecksDetector
+from core.scanners.ports import scan_ports_async, parse_ports, DEFAULT_PORTS
 from core.scanners.web import (
     check_ssl_certificate,
     check_dns_records,
@@ -19,11 +25,25 @@ from core.scanners.web import (
     check_cookies,
     check_redirects,
     check_page_metadata,
-    analyze_web_security
+    analyze_web_security,
+    normalize_url,
+    run_web_checks,
+    iter_web_analysis,
+    build_web_result,
+    PageFetch
 )
+from core.scanners.tls import TlsProbe, probe_tls, get_tls_probe, set_tls_probe
+from core.scanners.batch import BatchScanner, run_batch, read_targets, completed_targets
+from core.scanners.cache import WebResultCache, get_web_cache, set_web_cache
+from core.scanners.pool import ScanPool, ScanPoolFull, get_scan_pool, set_scan_pool
+from core.scanners.jobs import ScanJobQueue, ScanQueueFull, get_scan_jobs, set_scan_jobs
 
 __all__ = [
     'run_security_checks',
+    'SecurityChecksDetector',
+    'scan_ports_async',
+    'parse_ports',
+    'DEFAULT_PORTS',
     'check_ssl_certificate',
     'check_dns_records',
     'check_http_headers',
@@ -35,5 +55,29 @@ __all__ = [
     'check_cookies',
     'check_redirects',
     'check_page_metadata',
-    'analyze_web_security'
+    'analyze_web_security',
+    'normalize_url',
+    'run_web_checks',
+    'iter_web_analysis',
+    'build_web_result',
+    'PageFetch',
+    'TlsProbe',
+    'probe_tls',
+    'get_tls_probe',
+    'set_tls_probe',
+    'BatchScanner',
+    'run_batch',
+    'read_targets',
+    'completed_targets',
+    'WebResultCache',
+    'get_web_cache',
+    'set_web_cache',
+    'ScanPool',
+    'ScanPoolFull',
+    'get_scan_pool',
+    'set_scan_pool',
+    'ScanJobQueue',
+    'ScanQueueFull',
+    'get_scan_jobs',
+    'set_scan_jobs'
 ]
@@ -0,0 +1,424 @@
+"""
+Persistent result cache for web security analyses.
+
+Results are stored per URL (normalized) and per section in a small SQLite
+database, each section with its own lifetime:
+- Slow-changing data (certificate, DNS, address, location): hours
+- Page-derived data (headers, technologies, cookies, redirects, metadata): minutes
+- Failed checks: one minute
+
+Lookups follow stale-while-revalidate: fresh sections are served as-is,
+sections past their TTL but inside the stale window are served at once while
+a background refresh runs, and only missing or long-expired sections are
+analyzed before answering. Page sections are revalidated with a conditional
+request (If-None-Match / If-Modified-Since), so an unchanged page costs one
+304 response.
+
+Configuration (environment variables):
+- MONIX_WEB_CACHE_PATH: SQLite file (default ~/.cache/monix/web-results.sqlite3)
+
+Technical Rationale:
+    Dashboards re-request the same domains constantly, and a full analysis
+    is many network round-trips. Certificates and DNS change rarely while
+    headers can change on any deploy, so one TTL for the whole result is
+    either too stale or too expensive; per-section lifetimes let each part
+    be refreshed on its own schedule. Serving stale data while refreshing
+    in the background keeps repeated requests instant.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from core.scanners.web import (
+    PAGE_CHECKS,
+    SECTION_DEFAULTS,
+    WEB_SECTIONS,
+    build_web_result,
+    iter_web_analysis,
+    normalize_url,
+    run_web_checks,
+)
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "MONIX_WEB_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "monix", "web-results.sqlite3")
+)
+
+HOUR = 3600
+MINUTE = 60
+
+SECTION_TTLS = {
+    "ip_address": 6 * HOUR,
+    "ssl_certificate": 6 * HOUR,
+    "dns_records": 6 * HOUR,
+    "server_location": 24 * HOUR,
+    "port_scan": HOUR,
+    "security_txt": HOUR,
+    "http_headers": 10 * MINUTE,
+    "technologies": 10 * MINUTE,
+    "cookies": 10 * MINUTE,
+    "redirects": 10 * MINUTE,
+    "metadata": 10 * MINUTE,
+}
+ERROR_TTL = MINUTE
+# How long past its TTL a section may still be served while it is refreshed
+STALE_WINDOW = 24 * HOUR
+
+# Pseudo-section holding the page's ETag / Last-Modified
+VALIDATORS_SECTION = "_validators"
+
+REFRESH_WORKERS = 2
+
+# iter_web_analysis options that run_web_checks (and so analyze) does not take
+STREAM_ONLY_OPTIONS = ("start", "keepalive", "on_page")
+
+
+class WebResultCache:
+    """
+    SQLite-backed per-section cache in front of the web checks.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_window: float = STALE_WINDOW,
+        error_ttl: float = ERROR_TTL,
+        refresh_workers: int = REFRESH_WORKERS
+    ):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a process-local cache)
+            ttls: Per-section TTLs in seconds, overriding SECTION_TTLS
+            stale_window: Seconds past the TTL a section may be served stale
+            error_ttl: TTL in seconds for sections whose check failed
+            refresh_workers: Background refreshes running at once
+        """
+        self.ttls = dict(SECTION_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.stale_window = stale_window
+        self.error_ttl = error_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, refresh_workers), thread_name_prefix="monix-cache")
+        self._db = self._connect(path)
+        self.prune()
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+                db.execute("PRAGMA journal_mode=WAL")
+                return self._create(db)
+            except (OSError, sqlite3.Error):
+                pass  # Unwritable location; fall back to a process-local cache
+        return self._create(sqlite3.connect(":memory:", check_same_thread=False))
+
+    @staticmethod
+    def _create(db: sqlite3.Connection) -> sqlite3.Connection:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS web_sections ("
+            " url TEXT NOT NULL,"
+            " section TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (url, section))"
+        )
+        db.commit()
+        return db
+
+    def load(self, url: str) -> Dict[str, Tuple[Dict, float, float]]:
+        """
+        Load the cached sections of a URL.
+
+        Returns:
+            Dictionary mapping section to (value, stored_at, expires_at)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT section, value, stored_at, expires_at FROM web_sections WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchall()
+        return {section: (json.loads(value), stored, expires) for section, value, stored, expires in rows}
+
+    def store(self, url: str, sections: Dict[str, Dict], now: Optional[float] = None) -> None:
+        """Store section results of a URL, each with its own expiry."""
+        now = time.time() if now is None else now
+        rows = []
+        for section, value in sections.items():
+            if section == VALIDATORS_SECTION:
+                ttl = self.ttls["http_headers"]
+            elif isinstance(value, dict) and value.get("error"):
+                ttl = self.error_ttl
+            else:
+                ttl = self.ttls.get(section, self.error_ttl)
+            rows.append((normalize_url(url), section, json.dumps(value, default=str), now, now + ttl))
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO web_sections (url, section, value, stored_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+
+    def invalidate(self, url: str) -> None:
+        """Drop every cached section of a URL."""
+        with self._lock:
+            self._db.execute("DELETE FROM web_sections WHERE url = ?", (normalize_url(url),))
+            self._db.commit()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete sections past their stale window. Returns the number removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM web_sections WHERE expires_at < ?", (now - self.stale_window,)
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    def applicable_sections(self, url: str) -> Set[str]:
+        """Sections that an analysis of this URL produces."""
+        sections = set(WEB_SECTIONS)
+        if not url.startswith("https://"):
+            sections.discard("ssl_certificate")
+        return sections
+
+    def analyze(self, url: str, refresh: bool = False, cached_only: bool = False, **options) -> Optional[Dict]:
+        """
+        Get the analysis of a URL, from cache where possible.
+
+        Args:
+            url: URL to analyze
+            refresh: Ignore cached sections and analyze everything now
+            cached_only: Return None instead of running checks when any
+                section is missing (lets callers answer cache hits without
+                waiting for a scan worker)
+            **options: Keyword arguments of run_web_checks (deadline, timeouts, ...)
+
+        Returns:
+            analyze_web_security result with a "cache" entry giving the
+            cache status (hit, stale, partial, miss) and section ages
+        """
+        started = time.perf_counter()
+        url = normalize_url(url)
+        now = time.time()
+        applicable = self.applicable_sections(url)
+        cached = {} if refresh else self.load(url)
+
+        fresh, stale, missing = set(), set(), set()
+        for section in applicable:
+            entry = cached.get(section)
+            if entry is None or now > entry[2] + self.stale_window:
+                missing.add(section)
+            elif now > entry[2]:
+                stale.add(section)
+            else:
+                fresh.add(section)
+
+        if missing and cached_only:
+            return None
+
+        timings, incomplete = {}, []
+        if missing:
+            # Revalidate stale sections together with the missing ones
+            sections, timings, incomplete = self._run(url, cached, missing | stale, options)
+            status = "partial" if fresh else "miss"
+            with self._lock:
+                self.misses += 1
+        else:
+            sections = {name: cached[name][0] for name in applicable}
+            if stale:
+                self._refresh_in_background(url, cached, stale, options)
+                status = "stale"
+                with self._lock:
+                    self.stale_hits += 1
+            else:
+                status = "hit"
+                with self._lock:
+                    self.hits += 1
+
+        for name in fresh:
+            sections.setdefault(name, cached[name][0])
+
+        result = build_web_result(
+            url,
+            sections,
+            timings,
+            incomplete,
+            round((time.perf_counter() - started) * 1000, 1)
+        )
+        result["cache"] = {
+            "status": status,
+            "age": {
+                name: round(now - cached[name][1], 1)
+                for name in applicable if name in cached and name not in timings
+            },
+            "refreshing": sorted(stale) if status == "stale" else []
+        }
+        return result
+
+    def _run(
+        self,
+        url: str,
+        cached: Dict[str, Tuple[Dict, float, float]],
+        names: Iterable[str],
+        options: Dict
+    ) -> Tuple[Dict[str, Dict], Dict[str, float], list]:
+        """Run checks for the given sections, store and return their results."""
+        names = set(names)
+        page_names = names & set(PAGE_CHECKS)
+        # A 304 can only be used if every page section is still cached
+        validators = None
+        if page_names and VALIDATORS_SECTION in cached and all(name in cached for name in PAGE_CHECKS):
+            validators = cached[VALIDATORS_SECTION][0]
+
+        sections, timings, incomplete = run_web_checks(url, names, validators=validators, **options)
+        page = sections.pop("page", None)
+
+        if page is not None and page.get("not_modified"):
+            for name in page_names:
+                sections[name] = cached[name][0]
+        elif page is not None and not page.get("error"):
+            sections[VALIDATORS_SECTION] = {"etag": page.get("etag"), "last_modified": page.get("last_modified")}
+
+        self._record(url, sections, names, incomplete)
+        sections.pop(VALIDATORS_SECTION, None)
+        return sections, timings, incomplete
+
+    def _record(self, url: str, sections: Dict[str, Dict], names: Iterable[str], incomplete: Iterable[str]) -> None:
+        """Store finished sections; checks that did not apply are cached as such."""
+        incomplete = set(incomplete)
+        for name in names:
+            if name not in sections and name not in incomplete:
+                sections[name] = dict(SECTION_DEFAULTS.get(name, {}))
+        self.store(url, {name: value for name, value in sections.items() if name not in incomplete})
+
+    def iter_analyze(self, url: str, refresh: bool = False, **options) -> Iterator[Dict]:
+        """
+        Progressive variant of analyze, yielding iter_web_analysis events.
+
+        When every section is cached (fresh or within the stale window) the
+        cached sections are emitted at once, with the usual background
+        refresh of stale ones. Otherwise the full analysis is streamed live
+        and its sections are stored as it completes.
+
+        Args:
+            url: URL to analyze
+            refresh: Ignore cached sections and analyze everything now
+            **options: Keyword arguments of iter_web_analysis
+
+        Yields:
+            Event dictionaries; the final "result" carries a "cache" entry
+        """
+        url = normalize_url(url)
+        applicable = self.applicable_sections(url)
+        # Only a live analysis streams; analyze() takes run_web_checks options
+        check_options = {name: value for name, value in options.items() if name not in STREAM_ONLY_OPTIONS}
+
+        if not refresh:
+            cached = self.load(url)
+            now = time.time()
+            if all(name in cached and now <= cached[name][2] + self.stale_window for name in applicable):
+                result = self.analyze(url, **check_options)
+                for name in WEB_SECTIONS + ["security_headers_analysis"]:
+                    if name == "ip_address":
+                        data = {"ip": result["ip_address"], "error": None}
+                    else:
+                        data = result[name]
+                    yield {"event": "section", "section": name, "data": data, "ms": 0.0, "cached": True}
+                yield {"event": "result", "data": result}
+                return
+
+        with self._lock:
+            self.misses += 1
+        sections = {}
+
+        def on_page(page: Dict) -> None:
+            # Validators for later conditional revalidation, as in _run
+            if not page.get("error"):
+                sections[VALIDATORS_SECTION] = {"etag": page.get("etag"), "last_modified": page.get("last_modified")}
+
+        options["on_page"] = on_page
+        for event in iter_web_analysis(url, **options):
+            if event["event"] == "section" and event["section"] in applicable:
+                sections[event["section"]] = event["data"]
+            elif event["event"] == "result":
+                self._record(url, sections, applicable, event["data"]["incomplete"])
+                event["data"]["cache"] = {"status": "miss", "age": {}, "refreshing": []}
+            yield event
+
+    def _refresh_in_background(
+        self,
+        url: str,
+        cached: Dict[str, Tuple[Dict, float, float]],
+        names: Set[str],
+        options: Dict
+    ) -> None:
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh():
+            try:
+                self._run(url, cached, names, options)
+            except Exception:
+                pass  # Keep serving the stale sections; the next request retries
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        self._executor.submit(refresh)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(DISTINCT url) FROM web_sections").fetchone()[0]
+            return {
+                "urls": entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshing": len(self._refreshing)
+            }
+
+
+_cache: Optional[WebResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_web_cache() -> WebResultCache:
+    """Get the shared web result cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = WebResultCache()
+    return _cache
+
+
+def set_web_cache(cache: Optional[WebResultCache]) -> Optional[WebResultCache]:
+    """
+    Replace the shared web result cache.
+
+    Returns:
+        The previously installed cache
+    """
+    global _cache
+    with _cache_lock:
+        previous = _cache
+        _cache = cache
+    return previous
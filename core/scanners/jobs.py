@@ -0,0 +1,405 @@
+"""
+Persistent background job queue for web security scans.
+
+A scan job is accepted at once and given an ID; the scan runs later in the
+shared scan pool and its result is kept for a while so the client can poll
+for it:
+- Jobs start in priority order (high, normal, low), then oldest first
+- Submitting a URL that is already queued or running returns the existing
+  job instead of scanning it twice (and raises its priority if needed)
+- Finished results are kept for MONIX_SCAN_JOB_TTL seconds, then removed
+- Jobs live in a SQLite file: queued work survives a restart, and jobs that
+  were running when the process stopped are queued again
+
+At most as many jobs as the pool has workers are handed to it at a time,
+so queued jobs never take the pool's waiting slots from interactive scans.
+
+Configuration (environment variables):
+- MONIX_SCAN_JOBS_PATH: SQLite file (default ~/.cache/monix/scan-jobs.sqlite3)
+- MONIX_SCAN_JOB_TTL: Seconds a finished job's result is kept (default 3600)
+- MONIX_SCAN_JOBS_MAX: Jobs allowed to wait (default 1000)
+
+Technical Rationale:
+    A full analysis can outlast the timeout of the proxy in front of the
+    API, and a client that gives up leaves a scan running for nobody.
+    Returning a job ID right away and letting the client poll decouples
+    the scan's duration from any connection's lifetime, and storing the
+    queue on disk keeps accepted work from being lost on a deploy.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from core.scanners.pool import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    ScanPool,
+    ScanPoolFull,
+    get_scan_pool,
+)
+from core.scanners.web import normalize_url
+
+DEFAULT_JOBS_PATH = os.environ.get(
+    "MONIX_SCAN_JOBS_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "monix", "scan-jobs.sqlite3")
+)
+JOB_RESULT_TTL = int(os.environ.get("MONIX_SCAN_JOB_TTL", 3600))
+MAX_QUEUED_JOBS = int(os.environ.get("MONIX_SCAN_JOBS_MAX", 1000))
+
+# Seconds between dispatcher passes when nothing wakes it earlier
+DISPATCH_INTERVAL = 5
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+PRIORITIES = {
+    "high": PRIORITY_HIGH,
+    "normal": PRIORITY_NORMAL,
+    "low": PRIORITY_LOW,
+}
+
+
+class ScanQueueFull(Exception):
+    """Raised when MAX_QUEUED_JOBS jobs are already waiting."""
+    pass
+
+
+def parse_priority(value: Any) -> int:
+    """
+    Parse a job priority given as a name (high, normal, low) or a number.
+
+    Raises:
+        ValueError: If the priority is unknown or out of range
+    """
+    if value is None:
+        return PRIORITY_NORMAL
+    if isinstance(value, str) and value.lower() in PRIORITIES:
+        return PRIORITIES[value.lower()]
+    try:
+        priority = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown priority: {value!r} (use high, normal, low or {PRIORITY_HIGH}-{PRIORITY_LOW})")
+    if not PRIORITY_HIGH <= priority <= PRIORITY_LOW:
+        raise ValueError(f"Priority must be between {PRIORITY_HIGH} and {PRIORITY_LOW}")
+    return priority
+
+
+def _default_runner(url: str, refresh: bool) -> Dict:
+    from core.scanners.cache import get_web_cache
+    return get_web_cache().analyze(url, refresh=refresh)
+
+
+class ScanJobQueue:
+    """
+    SQLite-backed scan job queue feeding a ScanPool.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_JOBS_PATH,
+        pool: Optional[ScanPool] = None,
+        result_ttl: float = JOB_RESULT_TTL,
+        max_queued: int = MAX_QUEUED_JOBS,
+        runner: Optional[Callable[[str, bool], Dict]] = None
+    ):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a process-local queue)
+            pool: Pool to run scans in (default: the shared scan pool)
+            result_ttl: Seconds a finished job is kept
+            max_queued: Jobs allowed to wait before submissions are refused
+            runner: Function (url, refresh) -> result (default: the web result cache)
+        """
+        self.pool = pool or get_scan_pool()
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+        self.runner = runner or _default_runner
+        self.deduplicated = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dispatched: Set[str] = set()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+        self._db = self._connect(path)
+
+        with self._lock:
+            # Jobs cut off by a restart run again
+            self._db.execute(
+                "UPDATE scan_jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (STATUS_QUEUED, STATUS_RUNNING)
+            )
+            self._db.commit()
+        self.prune()
+        if self._count(STATUS_QUEUED):
+            self._start_dispatcher()
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+                db.execute("PRAGMA journal_mode=WAL")
+                return self._create(db)
+            except (OSError, sqlite3.Error):
+                pass  # Unwritable location; fall back to a process-local queue
+        return self._create(sqlite3.connect(":memory:", check_same_thread=False))
+
+    @staticmethod
+    def _create(db: sqlite3.Connection) -> sqlite3.Connection:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS scan_jobs ("
+            " id TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " priority INTEGER NOT NULL,"
+            " refresh INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL,"
+            " expires_at REAL,"
+            " result TEXT,"
+            " error TEXT)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS scan_jobs_queue ON scan_jobs (status, priority, created_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS scan_jobs_url ON scan_jobs (url, status)")
+        db.commit()
+        return db
+
+    def _count(self, status: str) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM scan_jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def submit(self, url: str, priority: int = PRIORITY_NORMAL, refresh: bool = False) -> Tuple[Dict, bool]:
+        """
+        Queue a scan of a URL.
+
+        Args:
+            url: URL to analyze
+            priority: PRIORITY_HIGH .. PRIORITY_LOW (see parse_priority)
+            refresh: Bypass the web result cache
+
+        Returns:
+            Tuple of (job, created); created is False when an identical
+            scan was already queued or running and that job is returned
+
+        Raises:
+            ScanQueueFull: If max_queued jobs are already waiting
+        """
+        url = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, priority FROM scan_jobs WHERE url = ? AND status IN (?, ?)"
+                " ORDER BY created_at LIMIT 1",
+                (url, STATUS_QUEUED, STATUS_RUNNING)
+            ).fetchone()
+            if row is not None:
+                job_id, current = row
+                if priority < current:
+                    self._db.execute("UPDATE scan_jobs SET priority = ? WHERE id = ?", (priority, job_id))
+                    self._db.commit()
+                self.deduplicated += 1
+                created = False
+            else:
+                queued = self._db.execute(
+                    "SELECT COUNT(*) FROM scan_jobs WHERE status = ?", (STATUS_QUEUED,)
+                ).fetchone()[0]
+                if queued >= self.max_queued:
+                    raise ScanQueueFull(f"{queued} scans are already queued; try again later")
+                job_id = uuid.uuid4().hex
+                self._db.execute(
+                    "INSERT INTO scan_jobs (id, url, priority, refresh, status, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, url, priority, int(refresh), STATUS_QUEUED, now)
+                )
+                self._db.commit()
+                created = True
+
+        self._start_dispatcher()
+        self._wake.set()
+        return self.get(job_id), created
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a job's status, and its result once finished.
+
+        Returns:
+            Job dictionary (id, url, status, priority, timestamps, position
+            while queued, result or error once finished), or None if the job
+            is unknown or its result has expired
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, url, priority, status, created_at, started_at, finished_at, expires_at, result, error"
+                " FROM scan_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, url, priority, status, created, started, finished, expires, result, error = row
+            if expires is not None and expires < time.time():
+                return None
+            position = None
+            if status == STATUS_QUEUED:
+                position = self._db.execute(
+                    "SELECT COUNT(*) FROM scan_jobs WHERE status = ?"
+                    " AND (priority < ? OR (priority = ? AND created_at < ?))",
+                    (STATUS_QUEUED, priority, priority, created)
+                ).fetchone()[0]
+
+        return {
+            "id": job_id,
+            "url": url,
+            "status": status,
+            "priority": priority,
+            "position": position,
+            "created_at": created,
+            "started_at": started,
+            "finished_at": finished,
+            "expires_at": expires,
+            "result": json.loads(result) if result is not None else None,
+            "error": error
+        }
+
+    def _start_dispatcher(self) -> None:
+        with self._lock:
+            if self._closed or (self._dispatcher is not None and self._dispatcher.is_alive()):
+                return
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="monix-scan-jobs", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while not self._closed:
+            self._wake.clear()
+            try:
+                self._dispatch()
+                self.prune()
+            except sqlite3.Error:
+                pass  # Retried on the next pass
+            self._wake.wait(DISPATCH_INTERVAL)
+
+    def _dispatch(self) -> None:
+        """Hand the next queued jobs to the pool, up to one per pool worker."""
+        with self._lock:
+            room = self.pool.workers - len(self._dispatched)
+            if room <= 0:
+                return
+            rows = self._db.execute(
+                "SELECT id, priority FROM scan_jobs WHERE status = ?"
+                " ORDER BY priority, created_at LIMIT ?",
+                (STATUS_QUEUED, room + len(self._dispatched))
+            ).fetchall()
+            rows = [row for row in rows if row[0] not in self._dispatched][:room]
+
+        for job_id, priority in rows:
+            with self._lock:
+                self._dispatched.add(job_id)
+            try:
+                self.pool.submit(self._execute, job_id, priority=priority)
+            except (ScanPoolFull, RuntimeError):
+                with self._lock:
+                    self._dispatched.discard(job_id)
+                return  # The pool is busy; the next pass or finished job retries
+
+    def _execute(self, job_id: str) -> None:
+        """Run one job in a pool worker and record its outcome."""
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT url, refresh FROM scan_jobs WHERE id = ? AND status = ?", (job_id, STATUS_QUEUED)
+                ).fetchone()
+                if row is None:
+                    return
+                self._db.execute(
+                    "UPDATE scan_jobs SET status = ?, started_at = ? WHERE id = ?",
+                    (STATUS_RUNNING, time.time(), job_id)
+                )
+                self._db.commit()
+
+            url, refresh = row
+            try:
+                result, error, status = self.runner(url, bool(refresh)), None, STATUS_DONE
+            except Exception as e:
+                result, error, status = None, str(e), STATUS_FAILED
+
+            now = time.time()
+            with self._lock:
+                self._db.execute(
+                    "UPDATE scan_jobs SET status = ?, finished_at = ?, expires_at = ?, result = ?, error = ?"
+                    " WHERE id = ?",
+                    (
+                        status,
+                        now,
+                        now + self.result_ttl,
+                        json.dumps(result, default=str) if result is not None else None,
+                        error,
+                        job_id
+                    )
+                )
+                self._db.commit()
+        finally:
+            with self._lock:
+                self._dispatched.discard(job_id)
+            self._wake.set()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete finished jobs past their TTL. Returns the number removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            removed = self._db.execute("DELETE FROM scan_jobs WHERE expires_at < ?", (now,)).rowcount
+            self._db.commit()
+        return removed
+
+    def close(self) -> None:
+        """Stop dispatching; queued jobs stay in the database for the next start."""
+        self._closed = True
+        self._wake.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status."""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM scan_jobs GROUP BY status").fetchall())
+            return {
+                STATUS_QUEUED: counts.get(STATUS_QUEUED, 0),
+                STATUS_RUNNING: counts.get(STATUS_RUNNING, 0),
+                STATUS_DONE: counts.get(STATUS_DONE, 0),
+                STATUS_FAILED: counts.get(STATUS_FAILED, 0),
+                "deduplicated": self.deduplicated
+            }
+
+
+_jobs: Optional[ScanJobQueue] = None
+_jobs_lock = threading.Lock()
+
+
+def get_scan_jobs() -> ScanJobQueue:
+    """Get the shared scan job queue, creating it on first use."""
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                _jobs = ScanJobQueue()
+    return _jobs
+
+
+def set_scan_jobs(jobs: Optional[ScanJobQueue]) -> Optional[ScanJobQueue]:
+    """
+    Replace the shared scan job queue.
+
+    Returns:
+        The previously installed queue
+    """
+    global _jobs
+    with _jobs_lock:
+        previous = _jobs
+        _jobs = jobs
+    return previous
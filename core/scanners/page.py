@@ -0,0 +1,214 @@
+"""
+Bounded, streaming page analysis for Monix.
+
+This module reads HTTP response bodies incrementally and analyzes them as
+they arrive:
+- read_capped: download at most a fixed number of bytes, chunk by chunk
+- TechMatcher: match every content fingerprint in one precompiled pattern,
+  across chunk boundaries, without decoding or lowercasing the page
+- HeadParser: extract the title and meta description with the stdlib
+  HTML parser, stopping at </head> (or the first body tag)
+- PageScanner: feed one body to both while it downloads
+
+Configuration (environment variables):
+- MONIX_MAX_PAGE_KB: Maximum page size read for analysis in KB (default 512)
+
+Technical Rationale:
+    Technology detection used to lowercase the whole decoded body and
+    metadata extraction built a full BeautifulSoup tree, so one huge page
+    could stall a worker and take hundreds of megabytes. Reading a bounded
+    prefix in chunks and scanning each chunk once keeps memory and CPU
+    proportional to the cap, and the metadata parser's work ends with the
+    document head, which is a few KB on almost every site.
+"""
+
+import codecs
+import os
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_PAGE_BYTES = int(os.environ.get("MONIX_MAX_PAGE_KB", 512)) * 1024
+PAGE_CHUNK_SIZE = 16 * 1024
+
+# Content fingerprints (case-insensitive byte patterns), in priority order
+TECH_FINGERPRINTS: List[Tuple[str, str, List[str]]] = [
+    ("cms", "WordPress", [r"wp-content", r"wordpress"]),
+    ("cms", "Joomla", [r"joomla"]),
+    ("cms", "Drupal", [r"drupal"]),
+]
+
+
+def read_capped(response, max_bytes: int = MAX_PAGE_BYTES, chunk_size: int = PAGE_CHUNK_SIZE,
+                consumers: Iterable = ()) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response body up to a size limit.
+
+    The response should have been requested with ``stream=True``. It is
+    closed when reading stops, so a truncated body does not keep its
+    connection busy.
+
+    Args:
+        response: requests.Response opened with stream=True
+        max_bytes: Maximum number of bytes to read
+        chunk_size: Bytes per read
+        consumers: Objects whose feed(chunk) is called with every chunk
+
+    Returns:
+        Tuple of (body, truncated)
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            if size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - size]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+            for consumer in consumers:
+                consumer.feed(chunk)
+            if truncated:
+                break
+    finally:
+        response.close()
+    return b"".join(chunks), truncated
+
+
+class TechMatcher:
+    """
+    Incremental multi-pattern matcher for content fingerprints.
+
+    All fingerprints are compiled into one alternation with a named group
+    per technology, so each chunk is scanned once regardless of the number
+    of fingerprints. The tail of every chunk is kept so that a fingerprint
+    split across two chunks still matches.
+    """
+
+    _compiled: Optional["re.Pattern"] = None
+    _groups: Dict[str, Tuple[str, str]] = {}
+    _overlap = 0
+
+    def __init__(self):
+        if TechMatcher._compiled is None:
+            TechMatcher._compile()
+        self.matches: Set[Tuple[str, str]] = set()
+        self._tail = b""
+
+    @classmethod
+    def _compile(cls) -> None:
+        alternatives = []
+        groups = {}
+        longest = 0
+        for index, (category, name, patterns) in enumerate(TECH_FINGERPRINTS):
+            group = f"t{index}"
+            groups[group] = (category, name)
+            alternatives.append(f"(?P<{group}>{'|'.join(patterns)})")
+            longest = max(longest, *(len(p) for p in patterns))
+        cls._groups = groups
+        cls._overlap = longest
+        cls._compiled = re.compile("|".join(alternatives).encode(), re.IGNORECASE)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every fingerprint has matched (nothing left to look for)."""
+        return len(self.matches) == len(self._groups)
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the body."""
+        if self.complete:
+            return
+        data = self._tail + chunk
+        for match in self._compiled.finditer(data):
+            self.matches.add(self._groups[match.lastgroup])
+        self._tail = data[-self._overlap:]
+
+    def first(self, category: str) -> str:
+        """Highest-priority technology matched in a category, or ""."""
+        for cat, name, _ in TECH_FINGERPRINTS:
+            if cat == category and (cat, name) in self.matches:
+                return name
+        return ""
+
+
+class HeadParser(HTMLParser):
+    """
+    Incremental parser for the document title and meta description.
+
+    Stops handling input at the end of the head: once ``done`` is set,
+    further feeds are ignored.
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.description = ""
+        self.done = False
+        self._in_title = False
+        self._title_parts: List[str] = []
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, data) -> None:
+        """Parse the next chunk (bytes are decoded incrementally)."""
+        if self.done:
+            return
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        super().feed(data)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "title" and not self.title:
+            self._in_title = True
+        elif tag == "meta" and not self.description:
+            values = dict(attrs)
+            if (values.get("name") or "").lower() == "description":
+                self.description = values.get("content") or ""
+        elif tag == "body":
+            self._finish()
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts).strip()
+        elif tag == "head":
+            self._finish()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def _finish(self) -> None:
+        if self._in_title:
+            self.title = "".join(self._title_parts).strip()
+            self._in_title = False
+        self.done = True
+
+    def close(self) -> None:
+        """Finish parsing, keeping a title that was never closed."""
+        if not self.done:
+            self._finish()
+
+
+class PageScanner:
+    """
+    Runs the technology matcher and head parser over a body as it downloads.
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self.tech = TechMatcher()
+        self.head = HeadParser(encoding)
+
+    def feed(self, chunk: bytes) -> None:
+        self.tech.feed(chunk)
+        self.head.feed(chunk)
+
+    def close(self) -> None:
+        self.head.close()
@@ -0,0 +1,212 @@
+"""
+Bounded scan pool for Monix.
+
+Web analyses take seconds to tens of seconds of network I/O. This module
+runs them on a fixed set of worker threads, separate from whatever serves
+requests:
+- At most ``workers`` scans run at once
+- At most ``max_pending`` scans wait; beyond that, submissions are refused
+  immediately (ScanPoolFull) instead of piling up
+- Background work (batch audits) may instead wait for room with
+  ``block=True``, but only fills half of the backlog, so interactive
+  scans are not turned away behind it
+- Waiting scans start in priority order (lower number first), then in
+  submission order
+
+Configuration (environment variables):
+- MONIX_SCAN_WORKERS: Scans run at once (default 4)
+- MONIX_SCAN_QUEUE: Scans allowed to wait (default 32)
+
+Technical Rationale:
+    When scans run on the request threads, a burst of slow targets takes
+    every thread and cheap endpoints (dashboard, connections, health)
+    queue behind them. Giving scans their own small pool bounds how much
+    of the server they can take, and refusing work past a fixed backlog
+    turns overload into a fast 503 instead of a proxy timeout.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCAN_WORKERS = int(os.environ.get("MONIX_SCAN_WORKERS", 4))
+SCAN_QUEUE = int(os.environ.get("MONIX_SCAN_QUEUE", 32))
+
+# Priorities (lower runs first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+class ScanPoolFull(Exception):
+    """Raised when the scan pool's backlog is full."""
+    pass
+
+
+class ScanPool:
+    """
+    Fixed-size priority worker pool with a bounded backlog.
+
+    Thread-safe; one instance is meant to be shared by the whole process
+    (see get_scan_pool).
+    """
+
+    def __init__(self, workers: int = SCAN_WORKERS, max_pending: int = SCAN_QUEUE):
+        """
+        Args:
+            workers: Scans run at once
+            max_pending: Scans allowed to wait for a worker
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+        self._heap: List[Tuple[int, int, Future, Callable, tuple, dict]] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+
+    def _start_workers(self) -> None:
+        # Started on first use so importing the module costs no threads
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"monix-scan-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def max_blocking_pending(self) -> int:
+        """Backlog that blocking submissions wait below (half of max_pending)."""
+        return self.max_pending // 2
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_NORMAL,
+               block: bool = False, **kwargs) -> Future:
+        """
+        Queue a scan.
+
+        Args:
+            fn: Function to run
+            *args: Positional arguments of fn
+            priority: Lower runs first (PRIORITY_HIGH .. PRIORITY_LOW)
+            block: Wait until the backlog is below max_blocking_pending
+                instead of failing when it is full (for background work)
+            **kwargs: Keyword arguments of fn
+
+        Returns:
+            Future of fn's result
+
+        Raises:
+            ScanPoolFull: If max_pending scans are already waiting (without block)
+        """
+        future: Future = Future()
+        with self._cond:
+            while (block and not self._shutdown and len(self._heap) >= self.max_blocking_pending
+                   and self.running >= self.workers):
+                self._cond.wait()
+            if self._shutdown:
+                raise RuntimeError("Scan pool is shut down")
+            if len(self._heap) >= self.max_pending and self.running >= self.workers:
+                self.rejected += 1
+                raise ScanPoolFull(
+                    f"{self.running} scans running and {len(self._heap)} waiting; try again later"
+                )
+            self._start_workers()
+            heapq.heappush(self._heap, (priority, next(self._order), future, fn, args, kwargs))
+            # Blocked submitters share the condition; make sure a worker wakes
+            self._cond.notify_all()
+        return future
+
+    def run(self, fn: Callable, *args, priority: int = PRIORITY_NORMAL,
+            timeout: Optional[float] = None, block: bool = False, **kwargs) -> Any:
+        """
+        Run a scan in the pool and wait for its result.
+
+        With block, waits for room in the backlog (see submit) instead of
+        failing; timeout then only limits the wait for the result.
+
+        Raises:
+            ScanPoolFull: If the backlog is full (without block)
+            concurrent.futures.TimeoutError: If the result takes longer than timeout
+        """
+        return self.submit(fn, *args, priority=priority, block=block, **kwargs).result(timeout=timeout)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown and not self._heap:
+                    return
+                _, _, future, fn, args, kwargs = heapq.heappop(self._heap)
+                self.running += 1
+                # Wake submitters blocked on a full backlog
+                self._cond.notify_all()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    self.running -= 1
+                    self.completed += 1
+                    self._cond.notify_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting scans; queued scans still run."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Pool statistics."""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "queued": len(self._heap),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+_pool: Optional[ScanPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_scan_pool() -> ScanPool:
+    """Get the shared scan pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ScanPool()
+    return _pool
+
+
+def set_scan_pool(pool: Optional[ScanPool]) -> Optional[ScanPool]:
+    """
+    Replace the shared scan pool.
+
+    Args:
+        pool: Pool to use from now on, or None to go back to the default
+
+    Returns:
+        The previously installed pool
+    """
+    global _pool
+    with _pool_lock:
+        previous = _pool
+        _pool = pool
+    return previous
@@ -0,0 +1,241 @@
+"""
+Asynchronous TCP port scanner for Monix.
+
+This module probes many ports of one host concurrently with asyncio:
+- Configurable number of probes in flight
+- Connect timeout adapted to the measured round-trip time
+- IPv4 and IPv6 targets (hostnames resolved once up front)
+- Optional banner grabbing on open ports
+
+Ports are classified as:
+- open: the TCP handshake completed
+- closed: the host answered with a reset (connection refused)
+- filtered: no answer before the timeout, or the host was unreachable
+
+Technical Rationale:
+    A sequential connect() with a fixed 1 s timeout costs up to one second
+    per port, so even the ten default ports could take ten seconds and
+    wider ranges were unusable. Connects are almost entirely waiting, so
+    running hundreds at once costs little. Refused and completed
+    handshakes both measure the RTT to the host; the timeout tracks that
+    estimate the way TCP's retransmission timer does (smoothed RTT plus
+    four deviations), so fast hosts are scanned with short timeouts and
+    slow links still get enough time.
+"""
+
+import asyncio
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Ports scanned when none are given
+DEFAULT_PORTS = [80, 443, 22, 21, 25, 53, 3306, 5432, 8080, 8443]
+
+DEFAULT_CONCURRENCY = 200
+# Connect timeout bounds in seconds; the adaptive timeout stays within them
+MIN_TIMEOUT = 0.2
+MAX_TIMEOUT = 2.0
+BANNER_TIMEOUT = 1.0
+BANNER_BYTES = 256
+
+
+def parse_ports(spec: str) -> List[int]:
+    """
+    Parse a port specification such as "22,80,8000-8100".
+
+    Args:
+        spec: Comma-separated ports and inclusive ranges
+
+    Returns:
+        Sorted list of unique ports
+
+    Raises:
+        ValueError: If a port is not a number or is out of range
+    """
+    ports = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            low, high = (int(p) for p in part.split("-", 1))
+        else:
+            low = high = int(part)
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"Invalid port range: {part}")
+        ports.update(range(low, high + 1))
+    return sorted(ports)
+
+
+class RttEstimator:
+    """
+    Smoothed round-trip time estimate used to derive the connect timeout.
+
+    Same smoothing as TCP's retransmission timer (RFC 6298):
+    timeout = srtt + 4 * rttvar, clamped to [min_timeout, max_timeout].
+    Until the first sample the maximum timeout is used.
+    """
+
+    def __init__(self, min_timeout: float = MIN_TIMEOUT, max_timeout: float = MAX_TIMEOUT):
+        self.min_timeout = min_timeout
+        self.max_timeout = max(min_timeout, max_timeout)
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+
+    def add(self, rtt: float) -> None:
+        """Add one measured round-trip time in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    @property
+    def timeout(self) -> float:
+        """Current connect timeout in seconds."""
+        if self.srtt is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+
+def resolve_target(host: str, family: int = socket.AF_UNSPEC) -> Tuple[str, int]:
+    """
+    Resolve a host to one address for scanning.
+
+    Args:
+        host: Hostname, IPv4 or IPv6 address
+        family: socket.AF_INET / AF_INET6 to force a family
+
+    Returns:
+        Tuple of (address, address family)
+
+    Raises:
+        socket.gaierror: If the host cannot be resolved
+    """
+    infos = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+    af, _, _, _, sockaddr = infos[0]
+    return sockaddr[0], af
+
+
+async def _grab_banner(reader: asyncio.StreamReader, timeout: float) -> str:
+    try:
+        data = await asyncio.wait_for(reader.read(BANNER_BYTES), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return ""
+    return data.decode("utf-8", errors="replace").strip()
+
+
+async def _probe(
+    address: str,
+    port: int,
+    rtt: RttEstimator,
+    slots: asyncio.Semaphore,
+    banners: bool,
+    banner_timeout: float
+) -> Tuple[int, str, str]:
+    async with slots:
+        timeout = rtt.timeout
+        start = time.monotonic()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+        except asyncio.TimeoutError:
+            return port, "filtered", ""
+        except ConnectionRefusedError:
+            rtt.add(time.monotonic() - start)
+            return port, "closed", ""
+        except OSError:
+            return port, "filtered", ""
+
+        rtt.add(time.monotonic() - start)
+        banner = await _grab_banner(reader, banner_timeout) if banners else ""
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return port, "open", banner
+
+
+async def scan_ports_async(
+    host: str,
+    ports: Optional[Iterable[int]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    min_timeout: float = MIN_TIMEOUT,
+    max_timeout: float = MAX_TIMEOUT,
+    banners: bool = False,
+    banner_timeout: float = BANNER_TIMEOUT,
+    family: int = socket.AF_UNSPEC
+) -> Dict:
+    """
+    Scan TCP ports of a host concurrently.
+
+    Args:
+        host: Hostname, IPv4 or IPv6 address
+        ports: Ports to scan (defaults to DEFAULT_PORTS)
+        concurrency: Maximum number of probes in flight
+        min_timeout: Lower bound of the adaptive connect timeout (seconds)
+        max_timeout: Upper bound, and the timeout before any RTT is measured
+        banners: Read the service banner from open ports
+        banner_timeout: Seconds to wait for a banner
+        family: socket.AF_INET / AF_INET6 to force a family
+
+    Returns:
+        Dictionary with open/closed/filtered ports, banners, the measured
+        RTT and the elapsed time
+    """
+    ports = sorted(set(DEFAULT_PORTS if ports is None else ports))
+    result = {
+        "host": host,
+        "address": None,
+        "open_ports": [],
+        "closed_ports": [],
+        "filtered_ports": [],
+        "banners": {},
+        "rtt_ms": None,
+        "timeout_ms": None,
+        "elapsed_ms": 0.0,
+        "error": None
+    }
+
+    start = time.monotonic()
+    loop = asyncio.get_running_loop()
+    try:
+        address, _ = await loop.run_in_executor(None, resolve_target, host, family)
+    except (socket.gaierror, socket.herror, UnicodeError):
+        result["error"] = "DNS resolution failed"
+        return result
+    result["address"] = address
+
+    rtt = RttEstimator(min_timeout, max_timeout)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    probes = [_probe(address, port, rtt, slots, banners, banner_timeout) for port in ports]
+
+    for port, status, banner in await asyncio.gather(*probes):
+        result[f"{status}_ports"].append(port)
+        if banner:
+            result["banners"][port] = banner
+
+    if rtt.srtt is not None:
+        result["rtt_ms"] = round(rtt.srtt * 1000, 2)
+    result["timeout_ms"] = round(rtt.timeout * 1000, 1)
+    result["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return result
+
+
+def scan_ports(host: str, ports: Optional[Iterable[int]] = None, **options) -> Dict:
+    """
+    Scan TCP ports of a host concurrently (blocking wrapper).
+
+    Must not be called from a thread that is already running an event
+    loop; use scan_ports_async there.
+
+    Args:
+        host: Hostname, IPv4 or IPv6 address
+        ports: Ports to scan (defaults to DEFAULT_PORTS)
+        **options: Keyword arguments of scan_ports_async
+
+    Returns:
+        Dictionary with scan results (see scan_ports_async)
+    """
+    return asyncio.run(scan_ports_async(host, ports, **options))
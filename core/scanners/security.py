@@ -1,20 +1,74 @@
 import os
-import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.analyzers.registry import Detector, INPUT_CONNECTIONS, run_detector
+
+DANGEROUS_PORTS = {
+    21: "FTP",
+    23: "Telnet",
+    135: "RPC",
+    139: "NetBIOS",
+    445: "SMB",
+    3389: "RDP",
+    5900: "VNC"
+}
+SENSITIVE_PORTS = frozenset([22, 3306, 5432, 6379, 27017, 9200])
+SUSPICIOUS_OUTBOUND_PORTS = frozenset([4444, 5555, 6666, 7777, 8888, 9999, 31337])
+LISTENING_COUNT_LIMIT = 50
+LOCAL_ADDRESSES = frozenset(["127.0.0.1", "0.0.0.0", "::1", "::"])
+
+
+class SecurityChecksDetector(Detector):
+    """Runs every host security check in one pass over the connections."""
+
+    name = "security_checks"
+    inputs = frozenset([INPUT_CONNECTIONS])
+
+    def begin(self, now):
+        self.ssh_on_22 = False
+        self.dangerous = []
+        self.listening = 0
+        self.external_sensitive = []
+        self.suspicious_outbound = []
+
+    def on_connection(self, conn):
+        state = conn["state"]
+        if state == "LISTEN":
+            local_port = conn["local_port"]
+            self.listening += 1
+            if local_port == 22:
+                self.ssh_on_22 = True
+            if local_port in DANGEROUS_PORTS:
+                self.dangerous.append(f"{DANGEROUS_PORTS[local_port]}:{local_port}")
+        elif state == "ESTABLISHED":
+            if conn["local_port"] in SENSITIVE_PORTS and conn["remote_ip"] not in LOCAL_ADDRESSES:
+                self.external_sensitive.append(f"{conn['remote_ip']}→{conn['local_port']}")
+            if conn["remote_port"] in SUSPICIOUS_OUTBOUND_PORTS:
+                self.suspicious_outbound.append(f"{conn['remote_ip']}:{conn['remote_port']}")
+
+    def finish(self):
+        return [
+            _ssh_port_result(self.ssh_on_22),
+            _dangerous_ports_result(self.dangerous),
+            _listening_count_result(self.listening),
+            _sensitive_external_result(self.external_sensitive),
+            _outbound_suspicious_result(self.suspicious_outbound),
+        ]
+
 
 def run_security_checks(connections):
-    checks = []
-    checks.append(check_ssh_port(connections))
-    checks.append(check_dangerous_ports(connections))
-    checks.append(check_listening_count(connections))
-    checks.append(check_sensitive_external(connections))
-    checks.append(check_outbound_suspicious(connections))
-    return checks
+    return run_detector(SecurityChecksDetector(), connections=connections)
 
 def check_ssh_port(connections):
     ssh_on_22 = any(
         c["local_port"] == 22 and c["state"] == "LISTEN"
         for c in connections
     )
+    return _ssh_port_result(ssh_on_22)
+
+def _ssh_port_result(ssh_on_22):
     return {
         "name": "SSH Port Check",
         "passed": not ssh_on_22,
@@ -22,19 +76,13 @@ def check_ssh_port(connections):
     }
 
 def check_dangerous_ports(connections):
-    dangerous_ports = {
-        21: "FTP",
-        23: "Telnet",
-        135: "RPC",
-        139: "NetBIOS",
-        445: "SMB",
-        3389: "RDP",
-        5900: "VNC"
-    }
     found = []
     for conn in connections:
-        if conn["state"] == "LISTEN" and conn["local_port"] in dangerous_ports:
-            found.append(f"{dangerous_ports[conn['local_port']]}:{conn['local_port']}")
+        if conn["state"] == "LISTEN" and conn["local_port"] in DANGEROUS_PORTS:
+            found.append(f"{DANGEROUS_PORTS[conn['local_port']]}:{conn['local_port']}")
+    return _dangerous_ports_result(found)
+
+def _dangerous_ports_result(found):
     return {
         "name": "Dangerous Ports",
         "passed": len(found) == 0,
@@ -43,21 +91,25 @@ def check_dangerous_ports(connections):
 
 def check_listening_count(connections):
     listening = [c for c in connections if c["state"] == "LISTEN"]
-    count = len(listening)
+    return _listening_count_result(len(listening))
+
+def _listening_count_result(count):
     return {
         "name": "Listening Ports Count",
-        "passed": count < 50,
-        "details": f"{count} ports listening" + (" (high)" if count >= 50 else "")
+        "passed": count < LISTENING_COUNT_LIMIT,
+        "details": f"{count} ports listening" + (" (high)" if count >= LISTENING_COUNT_LIMIT else "")
     }
 
 def check_sensitive_external(connections):
-    sensitive_ports = [22, 3306, 5432, 6379, 27017, 9200]
     external_sensitive = []
     for conn in connections:
-        if (conn["state"] == "ESTABLISHED" and 
-            conn["local_port"] in sensitive_ports and
-            conn["remote_ip"] not in ["127.0.0.1", "0.0.0.0", "::1", "::"]):
+        if (conn["state"] == "ESTABLISHED" and
+            conn["local_port"] in SENSITIVE_PORTS and
+            conn["remote_ip"] not in LOCAL_ADDRESSES):
             external_sensitive.append(f"{conn['remote_ip']}→{conn['local_port']}")
+    return _sensitive_external_result(external_sensitive)
+
+def _sensitive_external_result(external_sensitive):
     return {
         "name": "External DB/Service Access",
         "passed": len(external_sensitive) == 0,
@@ -65,12 +117,14 @@ def check_sensitive_external(connections):
     }
 
 def check_outbound_suspicious(connections):
-    suspicious_ports = [4444, 5555, 6666, 7777, 8888, 9999, 31337]
     suspicious = []
     for conn in connections:
-        if (conn["state"] == "ESTABLISHED" and 
-            conn["remote_port"] in suspicious_ports):
+        if (conn["state"] == "ESTABLISHED" and
+            conn["remote_port"] in SUSPICIOUS_OUTBOUND_PORTS):
             suspicious.append(f"{conn['remote_ip']}:{conn['remote_port']}")
+    return _outbound_suspicious_result(suspicious)
+
+def _outbound_suspicious_result(suspicious):
     return {
         "name": "Suspicious Outbound",
         "passed": len(suspicious) == 0,
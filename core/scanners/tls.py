@@ -0,0 +1,411 @@
+"""
+TLS inspection for Monix.
+
+This module probes a TLS endpoint with a single handshake and reports:
+- Negotiated protocol version, cipher suite and ALPN protocol
+- Leaf certificate subject, issuer, SANs, validity and SHA-256 fingerprint
+- The chain presented by the server and its depth to a trusted root
+- Whether the chain verifies against the system trust store
+
+Results are cached per (address, port, server name) for a short time and
+concurrent probes of the same endpoint share one handshake. Several SNI
+names served by one address can be probed in parallel.
+
+Technical Rationale:
+    The old certificate check opened its own socket just to call
+    getpeercert(), which only returns the leaf of a verified chain and
+    nothing about the negotiated session. Reading everything from one
+    handshake and caching it per endpoint lets the web analysis, batch
+    audits and cache refreshes share the work, and probing SNI names
+    concurrently makes auditing a shared host one round-trip instead of
+    one per name.
+"""
+
+import hashlib
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.resolver import get_resolver
+
+DEFAULT_TLS_TIMEOUT = float(os.environ.get("MONIX_TLS_TIMEOUT", 5.0))
+
+# Cache lifetimes in seconds
+TLS_CACHE_TTL = 300
+TLS_ERROR_TTL = 30
+MAX_TLS_CACHE_ENTRIES = 1024
+
+MAX_PARALLEL_PROBES = 8
+
+ALPN_PROTOCOLS = ["h2", "http/1.1"]
+
+CERT_TIME_FORMAT = "%b %d %H:%M:%S %Y %Z"
+
+# The certificate chain of a handshake is public API (SSLSocket.get_verified_chain
+# and get_unverified_chain) only from Python 3.13. On 3.10-3.12 the same
+# methods exist on the private SSLSocket._sslobj, which this module relies
+# on; before 3.10 the chain cannot be read and is reported as None.
+CHAIN_AVAILABLE = sys.version_info >= (3, 10)
+CHAIN_UNAVAILABLE = "Certificate chain requires Python 3.10+"
+
+
+def _parse_name(name_list) -> Dict[str, str]:
+    """Convert a getpeercert() name ((key, value),) sequence to a dictionary."""
+    result = {}
+    for item in name_list or []:
+        if isinstance(item, tuple) and item and isinstance(item[0], tuple) and len(item[0]) == 2:
+            key, value = item[0]
+            result[key] = value
+    return result
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, CERT_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _describe_certificate(info: Dict) -> Dict:
+    """Summarize a decoded certificate (getpeercert() / Certificate.get_info())."""
+    subject = _parse_name(info.get("subject"))
+    issuer = _parse_name(info.get("issuer"))
+    return {
+        "subject": subject,
+        "issuer": issuer,
+        "self_signed": bool(subject) and subject == issuer,
+    }
+
+
+def _chain_getter(ssock: ssl.SSLSocket, name: str):
+    """The chain accessor ``name`` of a handshake, or None if this Python has none."""
+    if not CHAIN_AVAILABLE:
+        return None
+    getter = getattr(ssock, name, None)
+    if getter is None:
+        # Python 3.10-3.12: only on the private low-level socket object
+        getter = getattr(getattr(ssock, "_sslobj", None), name, None)
+    return getter
+
+
+def _chain(ssock: ssl.SSLSocket, verified: bool) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """
+    Certificates of the handshake, leaf first.
+
+    Uses the verified chain (up to the trust anchor) when verification
+    succeeded, else the certificates the server sent.
+
+    Returns:
+        Tuple of (chain, None), or (None, reason) if it cannot be read
+    """
+    getter = _chain_getter(ssock, "get_verified_chain" if verified else "get_unverified_chain")
+    if getter is None:
+        return None, CHAIN_UNAVAILABLE
+    try:
+        return [_describe_certificate(cert.get_info()) for cert in getter() or []], None
+    except Exception as e:
+        return None, f"Could not read certificate chain: {e}"
+
+
+def _leaf_info(ssock: ssl.SSLSocket) -> Dict:
+    """Decoded leaf certificate, also when the chain did not verify."""
+    info = ssock.getpeercert()
+    if info:
+        return info
+    getter = _chain_getter(ssock, "get_unverified_chain")
+    if getter is not None:
+        try:
+            chain = getter()
+            if chain:
+                return chain[0].get_info()
+        except Exception:
+            pass
+    return {}
+
+
+def _handshake(address: str, port: int, server_name: str, timeout: float, verify: bool) -> Dict:
+    """Run one TLS handshake and read everything the probe reports from it."""
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    try:
+        context.set_alpn_protocols(ALPN_PROTOCOLS)
+    except NotImplementedError:
+        pass
+
+    with socket.create_connection((address, port), timeout=timeout) as sock:
+        with context.wrap_socket(sock, server_hostname=server_name) as ssock:
+            der = ssock.getpeercert(binary_form=True) or b""
+            info = _leaf_info(ssock)
+            cipher = ssock.cipher() or (None, None, None)
+            chain, chain_error = _chain(ssock, verified=verify)
+            return {
+                "protocol": ssock.version(),
+                "cipher": {"name": cipher[0], "protocol": cipher[1], "bits": cipher[2]},
+                "alpn": ssock.selected_alpn_protocol(),
+                "info": info,
+                "fingerprint": hashlib.sha256(der).hexdigest() if der else "",
+                "chain": chain,
+                "chain_error": chain_error,
+            }
+
+
+def probe_tls(
+    host: str,
+    port: int = 443,
+    server_name: Optional[str] = None,
+    address: Optional[str] = None,
+    timeout: float = DEFAULT_TLS_TIMEOUT
+) -> Dict:
+    """
+    Probe a TLS endpoint without caching.
+
+    The handshake verifies the chain and hostname against the system trust
+    store. Only when that fails is a second, unverified handshake made so
+    that the certificate can still be reported (with ``valid`` False and
+    the verification error).
+
+    Args:
+        host: Hostname or IP address
+        port: TCP port
+        server_name: SNI name to send (default: host)
+        address: IP address to connect to (default: resolve host)
+        timeout: Seconds for connecting and the handshake
+
+    Returns:
+        Dictionary with session, certificate and chain details; ``chain``
+        and ``chain_depth`` are None, with the reason in ``chain_error``,
+        where the chain cannot be read (Python < 3.10)
+    """
+    server_name = server_name or host
+    result = {
+        "host": server_name,
+        "port": port,
+        "address": address,
+        "valid": False,
+        "verify_error": None,
+        "protocol": None,
+        "cipher": None,
+        "alpn": None,
+        "subject": {},
+        "issuer": {},
+        "sans": [],
+        "expires": None,
+        "renewed": None,
+        "days_remaining": None,
+        "serial_number": "",
+        "fingerprint": "",
+        "chain": [],
+        "chain_depth": 0,
+        "chain_error": None,
+        "elapsed_ms": 0.0,
+        "error": None
+    }
+    started = time.perf_counter()
+
+    try:
+        if address is None:
+            address = get_resolver().resolve_address(host)
+            if address is None:
+                result["error"] = "DNS resolution failed"
+                return result
+            result["address"] = address
+
+        try:
+            session = _handshake(address, port, server_name, timeout, verify=True)
+            result["valid"] = True
+        except ssl.SSLCertVerificationError as e:
+            result["verify_error"] = e.verify_message or str(e)
+            session = _handshake(address, port, server_name, timeout, verify=False)
+
+        info = session["info"]
+        leaf = _describe_certificate(info)
+        not_after = _parse_time(info.get("notAfter", ""))
+        not_before = _parse_time(info.get("notBefore", ""))
+
+        result.update({
+            "protocol": session["protocol"],
+            "cipher": session["cipher"],
+            "alpn": session["alpn"],
+            "subject": leaf["subject"],
+            "issuer": leaf["issuer"],
+            "sans": [value for kind, value in info.get("subjectAltName", ()) if kind in ("DNS", "IP Address")],
+            "expires": not_after.replace(tzinfo=None).isoformat() if not_after else None,
+            "renewed": not_before.replace(tzinfo=None).isoformat() if not_before else None,
+            "days_remaining": (not_after - datetime.now(timezone.utc)).days if not_after else None,
+            "serial_number": info.get("serialNumber", ""),
+            "fingerprint": session["fingerprint"],
+            "chain": session["chain"],
+            "chain_depth": len(session["chain"]) if session["chain"] is not None else None,
+            "chain_error": session["chain_error"],
+        })
+    except socket.timeout:
+        result["error"] = "Connection timeout"
+    except socket.gaierror:
+        result["error"] = "DNS resolution failed"
+    except ssl.SSLError as e:
+        result["error"] = f"SSL error: {str(e)}"
+    except OSError as e:
+        result["error"] = f"Connection failed: {str(e)}"
+    finally:
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    return result
+
+
+class TlsProbe:
+    """
+    Caching TLS prober.
+
+    Thread-safe; one instance is meant to be shared by the whole process
+    (see get_tls_probe).
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TLS_TIMEOUT,
+        ttl: float = TLS_CACHE_TTL,
+        error_ttl: float = TLS_ERROR_TTL,
+        max_entries: int = MAX_TLS_CACHE_ENTRIES,
+        max_workers: int = MAX_PARALLEL_PROBES
+    ):
+        """
+        Args:
+            timeout: Seconds for connecting and the handshake
+            ttl: Seconds to cache a completed probe
+            error_ttl: Seconds to cache a failed probe
+            max_entries: Maximum number of cached probes
+            max_workers: Maximum number of handshakes run in parallel
+        """
+        self.timeout = timeout
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: "OrderedDict[Tuple[str, int, str], Tuple[float, Dict]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int, str], threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="monix-tls")
+
+    def probe(
+        self,
+        host: str,
+        port: int = 443,
+        server_name: Optional[str] = None,
+        address: Optional[str] = None
+    ) -> Dict:
+        """
+        Probe an endpoint, answering from the cache when possible.
+
+        Args:
+            host: Hostname or IP address
+            port: TCP port
+            server_name: SNI name to send (default: host)
+            address: IP address to connect to (default: resolve host)
+
+        Returns:
+            Result dictionary of probe_tls
+        """
+        server_name = (server_name or host).lower().rstrip(".")
+        if address is None:
+            address = get_resolver().resolve_address(host) or host
+        key = (address, port, server_name)
+
+        while True:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return dict(cached[1])
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Same endpoint already being probed in another thread
+            pending.wait(self.timeout * 2 + 1)
+
+        try:
+            result = probe_tls(host, port, server_name=server_name, address=address, timeout=self.timeout)
+            ttl = self.error_ttl if result["error"] else self.ttl
+            if ttl > 0:
+                with self._lock:
+                    self._cache[key] = (time.monotonic() + ttl, result)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+            return dict(result)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def probe_names(self, address: str, server_names: Iterable[str], port: int = 443) -> Dict[str, Dict]:
+        """
+        Probe several SNI names served by one address in parallel.
+
+        Args:
+            address: IP address (or hostname) to connect to
+            server_names: SNI names to send
+            port: TCP port
+
+        Returns:
+            Dictionary mapping each name to its probe result
+        """
+        names = list(dict.fromkeys(server_names))
+        address = get_resolver().resolve_address(address) or address
+        futures = [self._executor.submit(self.probe, name, port, name, address) for name in names]
+        return {name: future.result() for name, future in zip(names, futures)}
+
+    def clear(self) -> None:
+        """Drop every cached probe."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+_probe: Optional[TlsProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_tls_probe() -> TlsProbe:
+    """Get the shared TLS prober, creating it on first use."""
+    global _probe
+    if _probe is None:
+        with _probe_lock:
+            if _probe is None:
+                _probe = TlsProbe()
+    return _probe
+
+
+def set_tls_probe(probe: Optional[TlsProbe]) -> Optional[TlsProbe]:
+    """
+    Replace the shared TLS prober.
+
+    Args:
+        probe: Prober to use from now on, or None to go back to the default
+
+    Returns:
+        The previously installed prober
+    """
+    global _probe
+    with _probe_lock:
+        previous = _probe
+        _probe = probe
+    return previous
@@ -13,19 +13,29 @@ Technical Rationale:
     Web security analysis requires multiple layers of checks to assess
     the security posture of a website. This module consolidates various
     security checks while maintaining separation from UI concerns.
+    The checks are independent network round-trips, so they run
+    concurrently under an overall deadline; a slow host then costs one
+    timeout instead of the sum of all of them.
 """
 
-import socket
-import ssl
+import queue
+import threading
+import time
 import requests
-from urllib.parse import urlparse
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse, urlunparse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from core.analyzers.traffic import (
     is_suspicious_url,
     classify_threat_level
 )
+from core.scanners.page import MAX_PAGE_BYTES, PageScanner, read_capped
+from core.scanners.ports import scan_ports
+from core.scanners.tls import get_tls_probe
+from utils.geo import ipinfo_lookup
+from utils.http import get_client
+from utils.resolver import DNS_AVAILABLE, get_resolver
 
 # Global configuration for scanner requests
 DEFAULT_HEADERS = {
@@ -34,24 +44,184 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
-# DNS resolver - optional dependency
-try:
-    import dns.resolver
-    import dns.exception
-    DNS_AVAILABLE = True
-except ImportError:
-    DNS_AVAILABLE = False
+# Concurrency limits for analyze_web_security (seconds)
+ANALYSIS_DEADLINE = 20.0
+DEFAULT_CHECK_TIMEOUT = 10.0
+CHECK_TIMEOUTS = {
+    "ip_address": 5.0,
+    "ssl_certificate": 8.0,
+    "dns_records": 10.0,
+    "page": 12.0,
+    "http_headers": 2.0,
+    "security_txt": 12.0,
+    "server_location": 5.0,
+    "port_scan": 6.0,
+    "technologies": 2.0,
+    "cookies": 2.0,
+    "redirects": 2.0,
+    "metadata": 5.0,
+}
+MAX_CHECK_WORKERS = 8
+
+# Seconds between keepalive / queued events on a quiet analysis stream
+STREAM_KEEPALIVE = 5.0
+
+# Timeout for the single shared page fetch (seconds)
+PAGE_FETCH_TIMEOUT = 10.0
+
+# security.txt is a short text file; anything longer is cut off
+SECURITY_TXT_MAX_BYTES = 64 * 1024
+
+# Record types reported by check_dns_records
+DNS_RECORD_TYPES = ["A", "AAAA", "CNAME", "MX", "NS", "TXT"]
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a lookup key.
+    
+    Adds the https scheme when missing, lowercases scheme and host, drops
+    default ports, user info and fragments, and uses "/" for an empty path.
+    
+    Args:
+        url: URL as entered by the user
+        
+    Returns:
+        Normalized URL
+    """
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    netloc = f"[{host}]" if ":" in host else host
+    if parsed.port and parsed.port != {"http": 80, "https": 443}[scheme]:
+        netloc += f":{parsed.port}"
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, parsed.query, ""))
+
+
+class PageFetch:
+    """
+    A page fetched once and shared by every HTTP-based check.
+    
+    The first call to get() downloads the page (following redirects, which
+    stay available in ``response.history``); later calls return the same
+    response. A failed fetch is remembered and raised to every caller so
+    all checks report the same error.
+    
+    The body is streamed and read only up to ``max_bytes``; while it
+    downloads, technology fingerprints and the document head are scanned
+    (see ``scanner``), so the checks never hold or re-parse a whole page.
+    
+    With validators from an earlier fetch (``etag``, ``last_modified``) the
+    request is conditional; ``not_modified`` tells whether the server
+    answered 304 so earlier results can be reused.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        timeout: float = PAGE_FETCH_TIMEOUT,
+        validators: Optional[Dict[str, str]] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.validators = validators or {}
+        self.max_bytes = max_bytes
+        self.body = b""
+        self.truncated = False
+        self.scanner: Optional[PageScanner] = None
+        self._lock = threading.Lock()
+        self._fetched = False
+        self._response = None
+        self._error = None
+    
+    def get(self) -> requests.Response:
+        """
+        Get the fetched response, downloading it on first use.
+        
+        Raises:
+            requests.exceptions.RequestException: If the fetch failed
+        """
+        with self._lock:
+            if not self._fetched:
+                try:
+                    self._response = get_client().get(
+                        self.url,
+                        headers=self._request_headers(),
+                        timeout=self.timeout,
+                        allow_redirects=True,
+                        verify=True,
+                        stream=True
+                    )
+                    self._read_body(self._response)
+                except requests.exceptions.RequestException as e:
+                    self._error = e
+                self._fetched = True
+        if self._error is not None:
+            raise self._error
+        return self._response
+    
+    def _read_body(self, response: requests.Response) -> None:
+        content_type = response.headers.get("Content-Type", "")
+        encoding = content_type.split("charset=", 1)[1].split(";")[0].strip(' "') if "charset=" in content_type else None
+        self.scanner = PageScanner(encoding)
+        self.body, self.truncated = read_capped(response, self.max_bytes, consumers=[self.scanner])
+        self.scanner.close()
+    
+    def _request_headers(self) -> Dict[str, str]:
+        headers = dict(DEFAULT_HEADERS)
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+        return headers
+    
+    @property
+    def not_modified(self) -> bool:
+        """Whether a conditional fetch was answered with 304 Not Modified."""
+        return self._response is not None and self._response.status_code == 304
+
+
+def _fetch_page(page: PageFetch) -> Dict:
+    """Fetch a shared page and summarize the outcome."""
+    try:
+        response = page.get()
+        return {
+            "status_code": response.status_code,
+            "final_url": response.url,
+            "not_modified": page.not_modified,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "bytes_read": len(page.body),
+            "truncated": page.truncated,
+            "error": None
+        }
+    except requests.exceptions.RequestException as e:
+        return {"status_code": None, "final_url": page.url, "not_modified": False, "error": str(e)}
+
+
+def _resolve_ip(domain: str) -> Dict:
+    """Resolve a domain to one address through the caching resolver."""
+    ip = get_resolver().resolve_address(domain)
+    return {"ip": ip, "error": None if ip else "DNS resolution failed"}
 
 
 def check_ssl_certificate(url: str) -> Dict:
     """
     Check SSL/TLS certificate information for a URL.
     
+    The handshake is done by the shared TLS prober, so repeated checks of
+    one endpoint within a few minutes reuse it.
+    
     Args:
         url: URL to check (must be HTTPS)
         
     Returns:
-        Dictionary with certificate details
+        Dictionary with certificate details plus the negotiated protocol,
+        cipher, SANs and chain (see core.scanners.tls.probe_tls)
     """
     result = {
         "valid": False,
@@ -65,73 +235,20 @@ def check_ssl_certificate(url: str) -> Dict:
         "error": None
     }
     
+    parsed = urlparse(url)
+    if parsed.scheme != "https":
+        result["error"] = "URL must use HTTPS"
+        return result
+    
     try:
-        parsed = urlparse(url)
-        if parsed.scheme != "https":
-            result["error"] = "URL must use HTTPS"
-            return result
-        
-        hostname = parsed.netloc.split(":")[0]
-        port = parsed.port or 443
-        
-        # Create SSL context
-        context = ssl.create_default_context()
-        
-        with socket.create_connection((hostname, port), timeout=5) as sock:
-            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                cert = ssock.getpeercert()
-                
-                # Parse certificate
-                result["valid"] = True
-                # Subject and issuer format: [((key, value),), ...]
-                subject_list = cert.get("subject", [])
-                issuer_list = cert.get("issuer", [])
-                
-                # Convert to dict format - handle nested tuple structure
-                def parse_name(name_list):
-                    if not name_list:
-                        return {}
-                    result_dict = {}
-                    for item in name_list:
-                        if isinstance(item, tuple) and len(item) > 0:
-                            if isinstance(item[0], tuple) and len(item[0]) == 2:
-                                key, value = item[0]
-                                result_dict[key] = value
-                    return result_dict
-                
-                result["subject"] = parse_name(subject_list)
-                result["issuer"] = parse_name(issuer_list)
-                
-                # Dates
-                not_after = cert.get("notAfter", "")
-                not_before = cert.get("notBefore", "")
-                
-                if not_after:
-                    result["expires"] = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z").isoformat()
-                if not_before:
-                    result["renewed"] = datetime.strptime(not_before, "%b %d %H:%M:%S %Y %Z").isoformat()
-                
-                # Serial number
-                result["serial_number"] = cert.get("serialNumber", "")
-                
-                # Extended key usage
-                try:
-                    ext_key_usage = cert.get("extensions", [])
-                    for ext in ext_key_usage:
-                        if ext[0] == "extendedKeyUsage":
-                            result["extended_key_usage"] = ext[1]
-                except:
-                    pass
-                
-    except socket.timeout:
-        result["error"] = "Connection timeout"
-    except socket.gaierror:
-        result["error"] = "DNS resolution failed"
-    except ssl.SSLError as e:
-        result["error"] = f"SSL error: {str(e)}"
+        probe = get_tls_probe().probe(parsed.hostname or "", parsed.port or 443)
     except Exception as e:
         result["error"] = f"Error: {str(e)}"
+        return result
     
+    result.update(probe)
+    if not probe["error"] and not probe["valid"]:
+        result["error"] = f"Certificate verification failed: {probe['verify_error']}"
     return result
 
 
@@ -160,60 +277,25 @@ def check_dns_records(domain: str) -> Dict:
         return result
     
     try:
-        # A records
-        try:
-            answers = dns.resolver.resolve(domain, "A")
-            result["a"] = [str(rdata) for rdata in answers]
-        except:
-            pass
-        
-        # AAAA records
-        try:
-            answers = dns.resolver.resolve(domain, "AAAA")
-            result["aaaa"] = [str(rdata) for rdata in answers]
-        except:
-            pass
-        
-        # CNAME records
-        try:
-            answers = dns.resolver.resolve(domain, "CNAME")
-            result["cname"] = [str(rdata) for rdata in answers]
-        except:
-            pass
-        
-        # MX records
-        try:
-            answers = dns.resolver.resolve(domain, "MX")
-            result["mx"] = [str(rdata) for rdata in answers]
-        except:
-            pass
-        
-        # NS records
-        try:
-            answers = dns.resolver.resolve(domain, "NS")
-            result["ns"] = [str(rdata) for rdata in answers]
-        except:
-            pass
-        
-        # TXT records
-        try:
-            answers = dns.resolver.resolve(domain, "TXT")
-            result["txt"] = [str(rdata).strip('"') for rdata in answers]
-        except:
-            pass
-            
+        # All record types are queried in parallel and served from cache when fresh
+        records = get_resolver().resolve_many(domain, DNS_RECORD_TYPES)
+        for rdtype, values in records.items():
+            if rdtype == "TXT":
+                values = [value.strip('"') for value in values]
+            result[rdtype.lower()] = values
     except Exception as e:
         result["error"] = str(e)
     
     return result
 
 
-def check_http_headers(url: str) -> Dict:
+def check_http_headers(url: str, page: Optional[PageFetch] = None) -> Dict:
     """
     Check HTTP security headers.
     
     Args:
         url: URL to check
+        page: Shared page fetch to reuse instead of fetching again
         
     Returns:
         Dictionary with header information
@@ -225,7 +307,7 @@ def check_http_headers(url: str) -> Dict:
     }
     
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=10, allow_redirects=True, verify=True)
+        response = (page or PageFetch(url)).get()
         result["headers"] = dict(response.headers)
         
         # Check for security headers
@@ -275,23 +357,27 @@ def check_security_txt(url: str) -> Dict:
         # Check /.well-known/security.txt
         security_txt_url = f"{base_url}/.well-known/security.txt"
         try:
-            response = requests.get(security_txt_url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True)
+            response = get_client().get(security_txt_url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True, stream=True)
             if response.status_code == 200:
                 result["present"] = True
-                result["content"] = response.text
+                result["content"] = read_capped(response, SECURITY_TXT_MAX_BYTES)[0].decode("utf-8", "replace")
                 result["url"] = security_txt_url
                 return result
+            else:
+                response.close()
         except:
             pass
         
         # Check /security.txt as fallback
         security_txt_url = f"{base_url}/security.txt"
         try:
-            response = requests.get(security_txt_url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True)
+            response = get_client().get(security_txt_url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True, stream=True)
             if response.status_code == 200:
                 result["present"] = True
-                result["content"] = response.text
+                result["content"] = read_capped(response, SECURITY_TXT_MAX_BYTES)[0].decode("utf-8", "replace")
                 result["url"] = security_txt_url
+            else:
+                response.close()
         except:
             pass
             
@@ -324,8 +410,7 @@ def get_server_location(ip: str) -> Dict:
     }
     
     try:
-        response = requests.get(f"https://ipinfo.io/{ip}/json", timeout=3)
-        data = response.json()
+        data = ipinfo_lookup(ip, timeout=3)
         
         result["city"] = data.get("city", "")
         result["country"] = data.get("country", "")
@@ -349,53 +434,13 @@ def get_server_location(ip: str) -> Dict:
     return result
 
 
-def scan_ports(host: str, ports: List[int] = None) -> Dict:
-    """
-    Scan common ports on a host.
-    
-    Args:
-        host: Hostname or IP address
-        ports: List of ports to scan (defaults to common web ports)
-        
-    Returns:
-        Dictionary with open ports information
-    """
-    if ports is None:
-        ports = [80, 443, 22, 21, 25, 53, 3306, 5432, 8080, 8443]
-    
-    result = {
-        "open_ports": [],
-        "closed_ports": [],
-        "filtered_ports": [],
-        "error": None
-    }
-    
-    for port in ports:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result_code = sock.connect_ex((host, port))
-            sock.close()
-            
-            if result_code == 0:
-                result["open_ports"].append(port)
-            else:
-                result["closed_ports"].append(port)
-        except socket.gaierror:
-            result["error"] = "DNS resolution failed"
-            break
-        except Exception as e:
-            result["filtered_ports"].append(port)
-    
-    return result
-
-
-def detect_technologies(url: str) -> Dict:
+def detect_technologies(url: str, page: Optional[PageFetch] = None) -> Dict:
     """
     Detect technologies used by the website.
     
     Args:
         url: URL to analyze
+        page: Shared page fetch to reuse instead of fetching again
         
     Returns:
         Dictionary with detected technologies
@@ -410,7 +455,8 @@ def detect_technologies(url: str) -> Dict:
     }
     
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True, verify=True)
+        page = page or PageFetch(url)
+        response = page.get()
         headers = response.headers
         
         # Detect server
@@ -428,14 +474,8 @@ def detect_technologies(url: str) -> Dict:
         else:
             result["server"] = server or "Unknown"
         
-        # Detect CMS from headers and content
-        content = response.text.lower()
-        if "wp-content" in content or "wordpress" in content:
-            result["cms"] = "WordPress"
-        elif "joomla" in content:
-            result["cms"] = "Joomla"
-        elif "drupal" in content:
-            result["cms"] = "Drupal"
+        # Detect CMS from the content fingerprints matched while downloading
+        result["cms"] = page.scanner.tech.first("cms")
         
         # Detect framework from headers
         powered_by = headers.get("x-powered-by", "").lower()
@@ -501,11 +541,11 @@ def analyze_security_headers(headers: Dict) -> Dict:
     }
 
 
-def check_cookies(url: str) -> Dict:
+def check_cookies(url: str, page: Optional[PageFetch] = None) -> Dict:
     """Analyze cookies and their security attributes."""
     result = {"cookies": [], "error": None}
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True)
+        response = (page or PageFetch(url)).get()
         for cookie in response.cookies:
             result["cookies"].append({
                 "name": cookie.name,
@@ -521,11 +561,11 @@ def check_cookies(url: str) -> Dict:
     return result
 
 
-def check_redirects(url: str) -> Dict:
+def check_redirects(url: str, page: Optional[PageFetch] = None) -> Dict:
     """Track the redirect chain."""
     result = {"chain": [], "final_url": url, "error": None}
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=5, allow_redirects=True)
+        response = (page or PageFetch(url)).get()
         result["final_url"] = response.url
         for resp in response.history:
             result["chain"].append({
@@ -537,69 +577,278 @@ def check_redirects(url: str) -> Dict:
     return result
 
 
-def check_page_metadata(url: str) -> Dict:
-    """Extract basic page metadata."""
+def check_page_metadata(url: str, page: Optional[PageFetch] = None) -> Dict:
+    """Extract basic page metadata (from the document head only)."""
     result = {"title": "", "description": "", "error": None}
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=5)
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        result["title"] = soup.title.string if soup.title else ""
-        desc = soup.find("meta", attrs={"name": "description"})
-        result["description"] = desc["content"] if desc else ""
-    except ImportError:
-        result["error"] = "BeautifulSoup4 not installed"
+        page = page or PageFetch(url)
+        page.get()
+        result["title"] = page.scanner.head.title
+        result["description"] = page.scanner.head.description
     except Exception as e:
         result["error"] = str(e)
     return result
 
 
-def analyze_web_security(url: str) -> Dict:
+# Sections of the analysis result produced by run_web_checks
+WEB_SECTIONS = [
+    "ip_address",
+    "ssl_certificate",
+    "dns_records",
+    "http_headers",
+    "security_txt",
+    "server_location",
+    "port_scan",
+    "technologies",
+    "cookies",
+    "redirects",
+    "metadata",
+]
+
+# Section values used when a check did not apply (e.g. plain HTTP has no certificate)
+SECTION_DEFAULTS = {
+    "ssl_certificate": {"error": "Not HTTPS"},
+    "dns_records": {"error": "No domain"},
+    "server_location": {"error": "No IP address"},
+    "port_scan": {"error": "No IP address"},
+}
+
+# Checks that analyze the shared page fetch instead of making their own request
+PAGE_CHECKS = {
+    "http_headers": check_http_headers,
+    "technologies": detect_technologies,
+    "cookies": check_cookies,
+    "redirects": check_redirects,
+    "metadata": check_page_metadata,
+}
+
+
+# on_result callback of the check runner: (name, result, elapsed ms)
+ResultCallback = Callable[[str, Dict, float], None]
+
+
+def _timed_check(func: Callable, *args) -> Tuple[Dict, float]:
+    """Run a check and return its result with the elapsed time in ms."""
+    start = time.perf_counter()
+    try:
+        value = func(*args)
+    except Exception as e:
+        value = {"error": str(e)}
+    return value, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _run_checks(
+    checks: Dict[str, Tuple[Callable, tuple]],
+    dependents: Dict[str, Callable[[Dict], Dict[str, Tuple[Callable, tuple]]]],
+    deadline: float,
+    timeouts: Dict[str, float],
+    max_workers: int,
+    on_result: Optional[ResultCallback] = None
+) -> Tuple[Dict[str, Dict], Dict[str, float], List[str]]:
     """
-    Perform comprehensive web security analysis.
+    Run checks concurrently with per-check timeouts and an overall deadline.
     
     Args:
-        url: URL to analyze
+        checks: Mapping of check name to (function, args) to start immediately
+        dependents: Mapping of check name to a factory that receives the
+            finished check's result and returns further checks to start
+        deadline: Overall deadline in seconds
+        timeouts: Per-check timeouts in seconds
+        max_workers: Maximum number of checks running at once
+        on_result: Called with (name, result, ms) as each check finishes or
+            is given up on
         
     Returns:
-        Dictionary with complete security analysis
+        Tuple of (results, timings in ms, names of checks that did not finish)
     """
-    # Ensure URL has scheme
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
+    results = {}
+    timings = {}
+    incomplete = []
+    started = time.monotonic()
+    deadline_at = started + deadline
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="monix-web")
+    pending = {}
+    
+    def submit(batch):
+        now = time.monotonic()
+        for name, (func, args) in batch.items():
+            future = executor.submit(_timed_check, func, *args)
+            expires = min(now + timeouts.get(name, DEFAULT_CHECK_TIMEOUT), deadline_at)
+            pending[future] = (name, now, expires)
+    
+    def give_up(future, reason):
+        name, submitted, _ = pending.pop(future)
+        future.cancel()
+        results[name] = {"error": reason, "timed_out": True}
+        timings[name] = round((time.monotonic() - submitted) * 1000, 1)
+        incomplete.append(name)
+        if on_result is not None:
+            on_result(name, results[name], timings[name])
+    
+    try:
+        submit(checks)
+        while pending:
+            now = time.monotonic()
+            next_expiry = min(expires for _, _, expires in pending.values())
+            done, _ = wait(list(pending), timeout=max(0.0, next_expiry - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                name, _, _ = pending.pop(future)
+                results[name], timings[name] = future.result()
+                if on_result is not None:
+                    on_result(name, results[name], timings[name])
+                if name in dependents:
+                    submit(dependents[name](results[name]))
+            
+            now = time.monotonic()
+            for future, (name, _, expires) in list(pending.items()):
+                if future.done() or now < expires:
+                    continue
+                if now >= deadline_at:
+                    give_up(future, f"Analysis deadline of {deadline:g}s exceeded")
+                else:
+                    give_up(future, f"Timed out after {timeouts.get(name, DEFAULT_CHECK_TIMEOUT):g}s")
+    finally:
+        # Do not wait for checks that were abandoned; their sockets time out on their own
+        executor.shutdown(wait=False)
+    
+    return results, timings, incomplete
 
+
+def run_web_checks(
+    url: str,
+    sections: Optional[Iterable[str]] = None,
+    deadline: float = ANALYSIS_DEADLINE,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: int = MAX_CHECK_WORKERS,
+    validators: Optional[Dict[str, str]] = None,
+    on_result: Optional[ResultCallback] = None
+) -> Tuple[Dict[str, Dict], Dict[str, float], List[str]]:
+    """
+    Run the selected web checks concurrently.
+    
+    Args:
+        url: URL to analyze (with scheme)
+        sections: Names from WEB_SECTIONS to run (default: all)
+        deadline: Overall deadline in seconds
+        timeouts: Per-check timeouts in seconds, overriding CHECK_TIMEOUTS
+        max_workers: Maximum number of checks running at once
+        validators: ETag / Last-Modified of a previous page fetch; when the
+            server answers 304 the page checks are not run
+        on_result: Called with (section, result, ms) as each check finishes
+        
+    Returns:
+        Tuple of (results by section, timings in ms, incomplete sections).
+        Results also contain "page", a summary of the shared page fetch,
+        when a page check was requested.
+    """
+    wanted = set(WEB_SECTIONS if sections is None else sections)
     parsed = urlparse(url)
     domain = parsed.netloc.split(":")[0] if parsed.netloc else ""
-    path = parsed.path or "/"
     
-    # Get IP address
-    ip_address = None
-    try:
-        ip_address = socket.gethostbyname(domain)
-    except:
-        pass
+    check_timeouts = dict(CHECK_TIMEOUTS)
+    if timeouts:
+        check_timeouts.update(timeouts)
+    
+    # One download of the page is shared by every HTTP-based check
+    page = PageFetch(url, validators=validators)
+    page_checks = {name: check for name, check in PAGE_CHECKS.items() if name in wanted}
+    
+    checks = {}
+    if page_checks:
+        checks["page"] = (_fetch_page, (page,))
+    if "security_txt" in wanted:
+        checks["security_txt"] = (check_security_txt, (url,))
+    if "ssl_certificate" in wanted and parsed.scheme == "https":
+        checks["ssl_certificate"] = (check_ssl_certificate, (url,))
+    if domain:
+        if "dns_records" in wanted:
+            checks["dns_records"] = (check_dns_records, (domain,))
+        if wanted & {"ip_address", "server_location", "port_scan"}:
+            checks["ip_address"] = (_resolve_ip, (domain,))
     
-    # Get HTTP headers first
-    http_headers_result = check_http_headers(url)
+    def after_fetch(_):
+        if page.not_modified:
+            return {}
+        return {name: (check, (url, page)) for name, check in page_checks.items()}
+    
+    # Location and port scan need the resolved address
+    def after_resolve(resolved):
+        ip = resolved.get("ip")
+        if not ip:
+            return {}
+        dependents = {}
+        if "server_location" in wanted:
+            dependents["server_location"] = (get_server_location, (ip,))
+        if "port_scan" in wanted:
+            dependents["port_scan"] = (scan_ports, (ip,))
+        return dependents
+    
+    results, timings, incomplete = _run_checks(
+        checks,
+        {"page": after_fetch, "ip_address": after_resolve},
+        deadline,
+        check_timeouts,
+        max_workers,
+        on_result
+    )
+    
+    page_result = results.get("page")
+    if page_result is not None and not page_result.get("not_modified"):
+        for name in page_checks:
+            if name not in results:
+                results[name] = {"error": page_result["error"], "timed_out": True}
+                incomplete.append(name)
+                if on_result is not None:
+                    on_result(name, results[name], 0.0)
+    
+    return results, timings, incomplete
+
+
+def build_web_result(
+    url: str,
+    sections: Dict[str, Dict],
+    timings: Optional[Dict[str, float]] = None,
+    incomplete: Optional[List[str]] = None,
+    elapsed_ms: float = 0.0
+) -> Dict:
+    """
+    Assemble the analysis result and threat score from section results.
+    
+    Args:
+        url: Analyzed URL (with scheme)
+        sections: Results by section name (see WEB_SECTIONS)
+        timings: Per-check timings in ms
+        incomplete: Sections that did not finish
+        elapsed_ms: Total analysis time
+        
+    Returns:
+        Dictionary with complete security analysis
+    """
+    parsed = urlparse(url)
+    domain = parsed.netloc.split(":")[0] if parsed.netloc else ""
+    path = parsed.path or "/"
+    
+    http_headers_result = sections.get("http_headers", {})
     # Normalize headers to lowercase for analysis
     headers_dict = {k.lower(): v for k, v in http_headers_result.get("headers", {}).items()}
     
-    # Perform all checks
     results = {
         "url": url,
         "domain": domain,
-        "ip_address": ip_address,
-        "ssl_certificate": check_ssl_certificate(url) if parsed.scheme == "https" else {"error": "Not HTTPS"},
-        "dns_records": check_dns_records(domain) if domain else {"error": "No domain"},
+        "ip_address": sections.get("ip_address", {}).get("ip"),
+        "ssl_certificate": sections.get("ssl_certificate", SECTION_DEFAULTS["ssl_certificate"]),
+        "dns_records": sections.get("dns_records", SECTION_DEFAULTS["dns_records"]),
         "http_headers": http_headers_result,
         "security_headers_analysis": analyze_security_headers(headers_dict),
-        "security_txt": check_security_txt(url),
-        "server_location": get_server_location(ip_address) if ip_address else {"error": "No IP address"},
-        "port_scan": scan_ports(ip_address) if ip_address else {"error": "No IP address"},
-        "technologies": detect_technologies(url),
-        "cookies": check_cookies(url),
-        "redirects": check_redirects(url),
-        "metadata": check_page_metadata(url),
+        "security_txt": sections.get("security_txt", {}),
+        "server_location": sections.get("server_location", SECTION_DEFAULTS["server_location"]),
+        "port_scan": sections.get("port_scan", SECTION_DEFAULTS["port_scan"]),
+        "technologies": sections.get("technologies", {}),
+        "cookies": sections.get("cookies", {}),
+        "redirects": sections.get("redirects", {}),
+        "metadata": sections.get("metadata", {}),
     }
 
     # Add threat analysis using Monix core
@@ -651,7 +900,182 @@ def analyze_web_security(url: str) -> Dict:
         "threat_score": threat_score,
         "threat_level": level_name,
         "threat_color": level_color,
-        "threats": threats
+        "threats": threats,
+        "timings": timings or {},
+        "incomplete": incomplete or [],
+        "elapsed_ms": elapsed_ms
     })
     
     return results
+
+
+def analyze_web_security(
+    url: str,
+    deadline: float = ANALYSIS_DEADLINE,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: int = MAX_CHECK_WORKERS
+) -> Dict:
+    """
+    Perform comprehensive web security analysis.
+    
+    Independent checks run concurrently. Checks that exceed their own
+    timeout or the overall deadline are reported with an error and a
+    ``timed_out`` flag while every finished check is still returned.
+    
+    Args:
+        url: URL to analyze
+        deadline: Overall deadline for the analysis in seconds
+        timeouts: Per-check timeouts in seconds, overriding CHECK_TIMEOUTS
+        max_workers: Maximum number of checks running at once
+        
+    Returns:
+        Dictionary with complete security analysis, per-check timings in
+        milliseconds and the list of checks that did not finish
+    """
+    started = time.perf_counter()
+    
+    # Ensure URL has scheme
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    
+    sections, timings, incomplete = run_web_checks(url, None, deadline, timeouts, max_workers)
+    sections.pop("page", None)
+    return build_web_result(
+        url,
+        sections,
+        timings,
+        incomplete,
+        round((time.perf_counter() - started) * 1000, 1)
+    )
+
+
+# Queued by an analysis when it begins running
+_STARTED = object()
+
+
+def iter_web_analysis(
+    url: str,
+    deadline: float = ANALYSIS_DEADLINE,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: int = MAX_CHECK_WORKERS,
+    start: Optional[Callable[[Callable[[], None]], Any]] = None,
+    keepalive: float = STREAM_KEEPALIVE,
+    on_page: Optional[Callable[[Dict], None]] = None
+) -> Iterator[Dict]:
+    """
+    Perform web security analysis, yielding each section as it completes.
+    
+    Events:
+        {"event": "queued", "waited": seconds}
+            every STREAM_KEEPALIVE seconds while the analysis waits for
+            ``start`` to run it
+        {"event": "keepalive"}
+            every STREAM_KEEPALIVE seconds without a finished section
+        {"event": "section", "section": name, "data": {...}, "ms": elapsed}
+            once per finished (or timed out) section, in completion order;
+            security_headers_analysis follows http_headers directly
+        {"event": "result", "data": {...}}
+            last, the complete analyze_web_security result with the threat score
+    
+    Args:
+        url: URL to analyze
+        deadline: Overall deadline for the analysis in seconds; also the
+            longest wait for ``start`` to begin it
+        timeouts: Per-check timeouts in seconds, overriding CHECK_TIMEOUTS
+        max_workers: Maximum number of checks running at once
+        start: Function that runs the analysis in the background, e.g. a
+            ScanPool's submit (default: a new daemon thread)
+        keepalive: Seconds between queued / keepalive events
+        on_page: Called with the summary of the shared page fetch (status,
+            ETag, Last-Modified, ...), which is not streamed as a section
+        
+    Yields:
+        Event dictionaries
+    
+    Raises:
+        TimeoutError: If the analysis did not start within ``deadline``, or
+            did not finish within ``deadline`` (plus one keepalive interval)
+            of starting
+    """
+    started = time.perf_counter()
+    
+    # Ensure URL has scheme
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    
+    events = queue.Queue()
+    outcome = {}
+    abandoned = threading.Event()
+    
+    def run():
+        if abandoned.is_set():
+            return  # The stream gave up while this waited in the pool
+        events.put(_STARTED)
+        try:
+            outcome["checks"] = run_web_checks(
+                url, None, deadline, timeouts, max_workers,
+                on_result=lambda name, value, ms: events.put((name, value, ms))
+            )
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            events.put(None)
+    
+    if start is None:
+        threading.Thread(target=run, name="monix-web-stream", daemon=True).start()
+    else:
+        start(run)
+    
+    queued_at = time.monotonic()
+    give_up_at = queued_at + deadline
+    running = False
+    while True:
+        try:
+            item = events.get(timeout=max(0.0, min(keepalive, give_up_at - time.monotonic())))
+        except queue.Empty:
+            if time.monotonic() >= give_up_at:
+                abandoned.set()
+                state = "finish" if running else "start"
+                raise TimeoutError(f"Analysis did not {state} within {deadline:g}s")
+            if running:
+                yield {"event": "keepalive"}
+            else:
+                yield {"event": "queued", "waited": round(time.monotonic() - queued_at, 1)}
+            continue
+        if item is _STARTED:
+            running = True
+            give_up_at = time.monotonic() + deadline + keepalive
+            continue
+        if item is None:
+            break
+        name, value, ms = item
+        if name == "page":
+            # Internal; its results arrive as the page sections
+            if on_page is not None:
+                on_page(value)
+            continue
+        yield {"event": "section", "section": name, "data": value, "ms": ms}
+        if name == "http_headers":
+            headers_dict = {k.lower(): v for k, v in value.get("headers", {}).items()}
+            yield {
+                "event": "section",
+                "section": "security_headers_analysis",
+                "data": analyze_security_headers(headers_dict),
+                "ms": 0.0
+            }
+    
+    if "error" in outcome:
+        raise outcome["error"]
+    
+    sections, timings, incomplete = outcome["checks"]
+    sections.pop("page", None)
+    yield {
+        "event": "result",
+        "data": build_web_result(
+            url,
+            sections,
+            timings,
+            incomplete,
+            round((time.perf_counter() - started) * 1000, 1)
+        )
+    }
@@ -5,15 +5,21 @@ This package contains all utility functions including:
 - logger: Logging utilities with colors
 - display: Display formatting utilities
 - geo: Geolocation and IP utilities
+- http: Shared pooled HTTP client
+- resolver: Caching, TTL-respecting DNS resolver
 - network: Network utilities (TCP states, hex conversions)
 - processes: Process mapping utilities
+- procfs: Direct /proc process reader (MONIX_PROCESS_BACKEND)
 """
 
 from utils.logger import log_info, log_warn, log_error, log_success, log_debug, Colors as C
 from utils.display import get_status_emoji, get_threat_level, format_bytes, truncate, colorize_state
 from utils.network import TCP_STATES, hex_ip, hex_port
 from utils.geo import geo_lookup, reverse_dns, get_my_location, get_ip_info
-from utils.processes import get_process_map
+from utils.http import HttpClient, get_client, set_client
+from utils.resolver import Resolver, get_resolver, set_resolver
+from utils.processes import get_process_map, process_name, process_cmdline
+from utils.procfs import ProcReader, get_proc_reader, resolve_backend, selected_backend
 
 __all__ = [
     # Logger
@@ -24,6 +30,11 @@ __all__ = [
     'TCP_STATES', 'hex_ip', 'hex_port',
     # Geo
     'geo_lookup', 'reverse_dns', 'get_my_location', 'get_ip_info',
+    # HTTP
+    'HttpClient', 'get_client', 'set_client',
+    # DNS
+    'Resolver', 'get_resolver', 'set_resolver',
     # Processes
-    'get_process_map'
+    'get_process_map', 'process_name', 'process_cmdline',
+    'ProcReader', 'get_proc_reader', 'resolve_backend', 'selected_backend'
 ]
@@ -1,9 +1,17 @@
+import os
 import socket
-import requests
+import threading
+
+from utils.http import get_client
+
+# Overridable to point lookups at a local stand-in server
+IPINFO_URL = os.environ.get("MONIX_IPINFO_URL", "https://ipinfo.io").rstrip("/")
 
 _geo_cache = {}
 _dns_cache = {}
 _location_cache = {}
+_ipinfo_cache = {}
+_ipinfo_lock = threading.Lock()
 
 def reverse_dns(ip):
     if ip in ["127.0.0.1", "0.0.0.0", "::1", "::"]:
@@ -20,6 +28,25 @@ def reverse_dns(ip):
         _dns_cache[ip] = ""
         return ""
 
+def ipinfo_lookup(ip, timeout=3):
+    """
+    Fetch the raw ipinfo.io record for an IP, cached for the process lifetime.
+    
+    Shared by the connection geolocation and the web scanner so a host is
+    looked up once however many times it is seen.
+    
+    Raises:
+        Exception: If the lookup fails (failures are not cached)
+    """
+    with _ipinfo_lock:
+        if ip in _ipinfo_cache:
+            return _ipinfo_cache[ip]
+    
+    data = get_client().get(f"{IPINFO_URL}/{ip}/json", timeout=timeout, retry_status=True).json()
+    with _ipinfo_lock:
+        _ipinfo_cache[ip] = data
+    return data
+
 def geo_lookup(ip):
     if not ip or ip.startswith("127.") or ip in ["0.0.0.0", "::1", "::"]:
         return ""
@@ -28,8 +55,7 @@ def geo_lookup(ip):
         return _geo_cache[ip]
     
     try:
-        url = f"https://ipinfo.io/{ip}/json"
-        res = requests.get(url, timeout=1).json()
+        res = ipinfo_lookup(ip, timeout=1)
         
         city = res.get('city', '')
         country = res.get('country', '')
@@ -50,7 +76,7 @@ def get_my_location():
         return _location_cache["self"]
     
     try:
-        res = requests.get("https://ipinfo.io/json", timeout=2).json()
+        res = get_client().get(f"{IPINFO_URL}/json", timeout=2, retry_status=True).json()
         location = f"{res.get('city', 'Unknown')}, {res.get('country', '')}"
         _location_cache["self"] = location
         return location
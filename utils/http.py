@@ -0,0 +1,203 @@
+"""
+Shared HTTP client for Monix.
+
+All outbound HTTP requests (web scanner, ipinfo.io lookups) go through one
+pooled requests.Session so connections are kept alive per host and reused.
+
+Configuration (environment variables):
+- MONIX_HTTP_POOL_HOSTS: Number of hosts to keep connection pools for (default 32)
+- MONIX_HTTP_POOL_SIZE: Keep-alive connections per host (default 10)
+- MONIX_HTTP_RETRIES: Retries for connection errors, and for 429/5xx responses
+  of requests sent with retry_status=True (default 2)
+- MONIX_HTTP_BACKOFF: Backoff factor in seconds between retries (default 0.3)
+- MONIX_HTTP_MAX_RETRY_AFTER: Longest Retry-After honoured, in seconds (default 5)
+- MONIX_HTTP_MAX_CONCURRENCY: Requests in flight across all threads (default 16)
+
+The session shares connections only: it never stores cookies, so what one
+scanned site sets is not sent to it (or anyone) on a later scan. Scanned
+pages are fetched without status retries; only our own API lookups
+(ipinfo.io) retry 429/5xx, with Retry-After capped and waited out without
+holding a concurrency slot.
+
+Technical Rationale:
+    Module-level requests.get opens a new TCP connection and TLS handshake
+    for every call, including repeated lookups against the same host.
+    A shared session keeps those connections open. The global concurrency
+    limit bounds outbound load when many checks or lookups run in
+    parallel. Tests inject their own client with set_client() to point
+    the code at a local stand-in server.
+"""
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_HOSTS = int(os.environ.get("MONIX_HTTP_POOL_HOSTS", 32))
+DEFAULT_POOL_SIZE = int(os.environ.get("MONIX_HTTP_POOL_SIZE", 10))
+DEFAULT_RETRIES = int(os.environ.get("MONIX_HTTP_RETRIES", 2))
+DEFAULT_BACKOFF = float(os.environ.get("MONIX_HTTP_BACKOFF", 0.3))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("MONIX_HTTP_MAX_CONCURRENCY", 16))
+MAX_RETRY_AFTER = float(os.environ.get("MONIX_HTTP_MAX_RETRY_AFTER", 5))
+
+# Responses retried for requests sent with retry_status=True
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _retry_policy(retries: int, backoff: float) -> Retry:
+    # Connection-level retries only: a status retry would sleep inside
+    # urllib3 (for as long as the server's Retry-After says) while the
+    # caller holds a concurrency slot
+    options = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=0,
+        backoff_factor=backoff,
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    try:
+        return Retry(allowed_methods=frozenset(["GET", "HEAD"]), **options)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=frozenset(["GET", "HEAD"]), **options)
+
+
+def _retry_delay(response: requests.Response, attempt: int, backoff: float, max_delay: float) -> float:
+    """Seconds to wait before retrying a response: its Retry-After, else exponential backoff; capped."""
+    retry_after = response.headers.get("Retry-After")
+    delay = backoff * (2 ** attempt)
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    return min(max(0.0, delay), max_delay)
+
+
+class HttpClient:
+    """
+    Pooled HTTP client with retries and a global concurrency limit.
+
+    Thin wrapper over requests.Session; ``get`` and ``head`` accept the
+    same keyword arguments as requests, plus ``retry_status``.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_hosts: int = DEFAULT_POOL_HOSTS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retry_after: float = MAX_RETRY_AFTER
+    ):
+        """
+        Args:
+            session: Pre-configured session to use as-is (adapters are not
+                replaced), e.g. one pointed at a test server
+            pool_hosts: Number of hosts to keep connection pools for
+            pool_size: Keep-alive connections per host
+            retries: Retries for connection errors, and for 429/5xx
+                responses of requests sent with retry_status=True
+            backoff: Backoff factor in seconds between retries
+            max_concurrency: Requests in flight across all threads
+            max_retry_after: Longest wait between status retries, in seconds
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_hosts,
+                pool_maxsize=pool_size,
+                max_retries=_retry_policy(retries, backoff)
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # Pool connections, not state: reject every cookie so no scan
+            # sees another's cookies and the jar cannot grow
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session = session
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def request(self, method: str, url: str, retry_status: bool = False, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for a free slot under the concurrency limit.
+
+        Args:
+            method: HTTP method
+            url: URL to request
+            retry_status: Retry 429/5xx responses (for our own API lookups,
+                never for scanned targets); the wait between attempts is
+                capped at max_retry_after and spent without holding a slot
+            **kwargs: Passed to requests.Session.request
+        """
+        attempt = 0
+        while True:
+            with self._slots:
+                response = self.session.request(method, url, **kwargs)
+            if not retry_status or response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                return response
+            delay = _retry_delay(response, attempt, self.backoff, self.max_retry_after)
+            response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """Send a HEAD request."""
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def set_client(client: Optional[HttpClient]) -> Optional[HttpClient]:
+    """
+    Replace the shared HTTP client.
+
+    Args:
+        client: Client to use from now on, or None to go back to the default
+
+    Returns:
+        The previously installed client
+    """
+    global _client
+    with _client_lock:
+        previous = _client
+        _client = client
+    return previous
@@ -0,0 +1,24 @@
+"""
+Benchmark of the /proc process reader against psutil.
+
+Usage:
+    python -m utils.procbench
+
+Kept out of utils.procfs, which the utils package imports, so that running
+it with -m does not execute an already imported module a second time.
+"""
+
+from utils.procfs import PROC_ROOT, PROCFS_AVAILABLE, benchmark
+
+
+def main() -> None:
+    if not PROCFS_AVAILABLE:
+        raise SystemExit(f"{PROC_ROOT} is not available on this system")
+    result = benchmark()
+    print(f"{result['processes']} processes, best of 20 passes:")
+    print(f"  psutil  {result['psutil_ms']:>9.3f} ms")
+    print(f"  procfs  {result['procfs_ms']:>9.3f} ms  ({result['speedup']}x)")
+
+
+if __name__ == "__main__":
+    main()
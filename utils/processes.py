@@ -1,29 +1,55 @@
 import psutil
 
+from utils.procfs import get_proc_reader, selected_backend
+
+SCRIPT_HOSTS = ["node", "python", "python3", "php", "ruby"]
+
+def process_name(pid, backend=None):
+    """Name of a process via the selected backend, or None if it is gone or hidden."""
+    if (backend or selected_backend()) == "procfs":
+        return get_proc_reader().name(pid)
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+def process_cmdline(pid, backend=None):
+    """Command line of a process via the selected backend, or None if unavailable."""
+    if (backend or selected_backend()) == "procfs":
+        return get_proc_reader().cmdline(pid)
+    try:
+        return psutil.Process(pid).cmdline()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
 def get_process_map():
     process_map = {}
+    # Many sockets share a process; describe each pid once per call
+    names = {}
+    backend = selected_backend()
     try:
         for c in psutil.net_connections(kind="tcp"):
             if c.laddr and c.pid:
-                try:
-                    p = psutil.Process(c.pid)
-                    pname = p.name()
-                    
-                    if pname.lower() in ["node", "python", "python3", "php", "ruby"]:
-                        try:
-                            cmdline = p.cmdline()
-                            if cmdline and len(cmdline) > 1:
-                                for arg in cmdline[1:]:
-                                    if "/" in arg or arg.endswith((".js", ".py", ".php", ".rb")):
-                                        script_name = arg.split("/")[-1]
-                                        pname = f"{pname}:{script_name}"
-                                        break
-                        except (psutil.AccessDenied, psutil.NoSuchProcess):
-                            pass
-                    
-                    process_map[(c.laddr.ip, c.laddr.port)] = (c.pid, pname)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+                pname = names.get(c.pid)
+                if pname is None:
+                    pname = process_name(c.pid, backend)
+                    if pname is None:
+                        continue
+
+                    if pname.lower() in SCRIPT_HOSTS:
+                        cmdline = process_cmdline(c.pid, backend)
+                        if cmdline and len(cmdline) > 1:
+                            for arg in cmdline[1:]:
+                                if "/" in arg or arg.endswith((".js", ".py", ".php", ".rb")):
+                                    script_name = arg.split("/")[-1]
+                                    pname = f"{pname}:{script_name}"
+                                    break
+                    names[c.pid] = pname
+
+                process_map[(c.laddr.ip, c.laddr.port)] = (c.pid, pname)
     except Exception:
         pass
+    if backend == "procfs":
+        # Names are cached per pid; forget processes that have exited
+        get_proc_reader().prune()
     return process_map
@@ -0,0 +1,256 @@
+"""
+Caching DNS resolver for Monix.
+
+Lookups go through one resolver that caches answers for their TTL, caches
+negative answers (NXDOMAIN / no records) briefly, coalesces identical
+queries that are already in flight, and runs several record types of one
+name in parallel.
+
+Configuration (environment variables):
+- MONIX_DNS_NAMESERVERS: Comma-separated nameserver IPs (default: system resolv.conf)
+- MONIX_DNS_TIMEOUT: Seconds to wait for one nameserver (default 2)
+- MONIX_DNS_LIFETIME: Seconds to spend on one query across retries (default 4)
+
+dnspython is optional; without it only A/AAAA lookups are available,
+through the system resolver (getaddrinfo) with a fixed cache TTL.
+
+Technical Rationale:
+    Web analysis used to resolve the same name seven times in a row (six
+    record types plus gethostbyname), each blocking on a full round-trip,
+    and repeated analyses of one host repeated all of them. Caching by
+    the answer's own TTL keeps results correct while letting batch and
+    repeated scans skip the network, and parallel queries make the cost
+    of a full record sweep one round-trip instead of six.
+"""
+
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# dnspython - optional dependency
+try:
+    import dns.exception
+    import dns.resolver
+    DNS_AVAILABLE = True
+except ImportError:
+    DNS_AVAILABLE = False
+
+DEFAULT_TIMEOUT = float(os.environ.get("MONIX_DNS_TIMEOUT", 2.0))
+DEFAULT_LIFETIME = float(os.environ.get("MONIX_DNS_LIFETIME", 4.0))
+DEFAULT_NAMESERVERS = [
+    ns.strip() for ns in os.environ.get("MONIX_DNS_NAMESERVERS", "").split(",") if ns.strip()
+]
+
+# Cache lifetimes in seconds
+NEGATIVE_TTL = 30
+FALLBACK_TTL = 60
+MAX_TTL = 3600
+MAX_CACHE_ENTRIES = 4096
+
+MAX_PARALLEL_QUERIES = 8
+
+
+class Resolver:
+    """
+    TTL-respecting caching resolver.
+
+    Thread-safe; one instance is meant to be shared by the whole process
+    (see get_resolver).
+    """
+
+    def __init__(
+        self,
+        nameservers: Optional[List[str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        lifetime: float = DEFAULT_LIFETIME,
+        max_entries: int = MAX_CACHE_ENTRIES,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_workers: int = MAX_PARALLEL_QUERIES
+    ):
+        """
+        Args:
+            nameservers: Nameserver IPs to query (default: system configuration)
+            timeout: Seconds to wait for one nameserver
+            lifetime: Seconds to spend on one query across retries
+            max_entries: Maximum number of cached answers
+            negative_ttl: Seconds to cache NXDOMAIN / empty answers
+            max_workers: Maximum number of queries run in parallel
+        """
+        self.nameservers = list(nameservers or DEFAULT_NAMESERVERS)
+        self.timeout = timeout
+        self.lifetime = lifetime
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, List[str]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="monix-dns")
+
+        self._resolver = None
+        if DNS_AVAILABLE:
+            self._resolver = dns.resolver.Resolver(configure=not self.nameservers)
+            if self.nameservers:
+                self._resolver.nameservers = self.nameservers
+            self._resolver.timeout = timeout
+            self._resolver.lifetime = lifetime
+
+    def resolve(self, name: str, rdtype: str = "A") -> List[str]:
+        """
+        Resolve one record type of a name.
+
+        Args:
+            name: Domain name
+            rdtype: Record type (A, AAAA, CNAME, MX, NS, TXT, ...)
+
+        Returns:
+            Records in presentation format; empty if the name has none or
+            the query failed
+        """
+        key = (name.lower().rstrip("."), rdtype.upper())
+
+        while True:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return list(cached[1])
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Same query already running in another thread; wait for its answer
+            pending.wait(self.lifetime + 1)
+
+        try:
+            records, ttl = self._query(*key)
+            if ttl > 0:
+                with self._lock:
+                    self._cache[key] = (time.monotonic() + ttl, records)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+            return list(records)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def resolve_many(self, name: str, rdtypes: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Resolve several record types of a name in parallel.
+
+        Args:
+            name: Domain name
+            rdtypes: Record types to resolve
+
+        Returns:
+            Dictionary mapping record type to its records
+        """
+        rdtypes = list(rdtypes)
+        futures = [self._executor.submit(self.resolve, name, rdtype) for rdtype in rdtypes]
+        return {rdtype: future.result() for rdtype, future in zip(rdtypes, futures)}
+
+    def resolve_address(self, name: str) -> Optional[str]:
+        """
+        Resolve a name to one address, preferring IPv4.
+
+        Args:
+            name: Domain name or IP address
+
+        Returns:
+            The first A (else AAAA) record, or None if the name does not resolve
+        """
+        try:
+            socket.inet_pton(socket.AF_INET6 if ":" in name else socket.AF_INET, name)
+            return name
+        except (OSError, ValueError):
+            pass
+        for rdtype in ("A", "AAAA"):
+            records = self.resolve(name, rdtype)
+            if records:
+                return records[0]
+        if self._resolver is not None:
+            # Names only known locally (/etc/hosts) are invisible to dnspython
+            records, _ = self._query_system(name, "A")
+            if records:
+                return records[0]
+        return None
+
+    def _query(self, name: str, rdtype: str) -> Tuple[List[str], float]:
+        """Query the network. Returns (records, seconds to cache them)."""
+        if self._resolver is None:
+            return self._query_system(name, rdtype)
+
+        try:
+            answer = self._resolver.resolve(name, rdtype)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return [], self.negative_ttl
+        except dns.exception.DNSException:
+            # Timeouts and server failures are not cached
+            return [], 0
+
+        ttl = min(answer.rrset.ttl, MAX_TTL) if answer.rrset is not None else self.negative_ttl
+        return [rdata.to_text() for rdata in answer], ttl
+
+    def _query_system(self, name: str, rdtype: str) -> Tuple[List[str], float]:
+        families = {"A": socket.AF_INET, "AAAA": socket.AF_INET6}
+        if rdtype not in families:
+            return [], 0
+        try:
+            infos = socket.getaddrinfo(name, None, families[rdtype], socket.SOCK_STREAM)
+        except socket.gaierror:
+            return [], self.negative_ttl
+        records = []
+        for info in infos:
+            if info[4][0] not in records:
+                records.append(info[4][0])
+        return records, FALLBACK_TTL
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+_resolver: Optional[Resolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> Resolver:
+    """Get the shared resolver, creating it on first use."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = Resolver()
+    return _resolver
+
+
+def set_resolver(resolver: Optional[Resolver]) -> Optional[Resolver]:
+    """
+    Replace the shared resolver.
+
+    Args:
+        resolver: Resolver to use from now on, or None to go back to the default
+
+    Returns:
+        The previously installed resolver
+    """
+    global _resolver
+    with _resolver_lock:
+        previous = _resolver
+        _resolver = resolver
+    return previous
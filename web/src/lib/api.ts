@@ -106,8 +106,20 @@ export interface SystemStats {
   process_count: number;
 }
 
+export interface ConnectionStats {
+  total: number;
+  by_state: Record<string, number>;
+  top_remote_ips: Array<{
+    ip: string;
+    count: number;
+  }>;
+}
+
 export interface DashboardData {
   connections: Connection[];
+  connection_stats: ConnectionStats;
+  updated_at: number | null;
+  age: number | null;
   alerts: string[];
   system_stats: SystemStats;
   traffic_summary: {
@@ -230,3 +242,57 @@ export async function checkHealth(): Promise<{ status: string; service: string }
 
   return response.json();
 }
+
+export interface LiveSnapshot {
+  version: number;
+  connections: Connection[];
+  connection_stats: ConnectionStats;
+  alerts: string[];
+  traffic_summary: DashboardData["traffic_summary"];
+  updated_at: number | null;
+}
+
+export interface ConnectionsDelta {
+  opened: Connection[];
+  changed: Connection[];
+  closed: Array<[string, number, string, number]>;
+  connection_stats: ConnectionStats;
+}
+
+export interface LiveHandlers {
+  onSnapshot: (snapshot: LiveSnapshot) => void;
+  onConnections?: (delta: ConnectionsDelta) => void;
+  onAlert?: (alert: string) => void;
+  onTraffic?: (traffic: Record<string, unknown>) => void;
+  onError?: (event: Event) => void;
+}
+
+/**
+ * Follow live monitoring changes over Server-Sent Events.
+ *
+ * The browser reconnects on its own and resumes from the last event it
+ * received; a snapshot is sent whenever the client must start over.
+ *
+ * @returns A function that closes the stream.
+ */
+export function subscribeLive(handlers: LiveHandlers): () => void {
+  const source = new EventSource(`${API_BASE_URL}/api/stream`);
+
+  source.addEventListener("snapshot", (e) =>
+    handlers.onSnapshot(JSON.parse((e as MessageEvent).data))
+  );
+  source.addEventListener("connections", (e) =>
+    handlers.onConnections?.(JSON.parse((e as MessageEvent).data))
+  );
+  source.addEventListener("alert", (e) =>
+    handlers.onAlert?.(JSON.parse((e as MessageEvent).data).alert)
+  );
+  source.addEventListener("traffic", (e) =>
+    handlers.onTraffic?.(JSON.parse((e as MessageEvent).data))
+  );
+  if (handlers.onError) {
+    source.onerror = handlers.onError;
+  }
+
+  return () => source.close();
+}